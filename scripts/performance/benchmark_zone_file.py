@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark the parsing of large DNS zone files, as done by `az network dns zone import`.
+
+    python scripts/performance/benchmark_zone_file.py --records 10000 100000 --loop 3
+
+Generates a synthetic zone file for each number of records, with a mix of record types, comments, records spanning
+several lines and records without a name, and prints the median time to parse it. Use --save to keep the generated
+zone files, e.g. to import them with `az network dns zone import`.
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import sys
+import time
+
+
+def generate_zone_file(zone_name, records, seed=0):
+    rnd = random.Random(seed)
+    lines = [
+        '; synthetic zone file with {} records'.format(records),
+        '$ORIGIN {}.'.format(zone_name),
+        '$TTL 1h',
+        '@ 3600 IN SOA ns1.{0}. hostmaster.{0}. ('.format(zone_name),
+        '    2019010101 ; serial',
+        '    12h ; refresh',
+        '    15m ; retry',
+        '    3w ; expire',
+        '    2h ) ; minimum',
+        '@ 172800 IN NS ns1.{}.'.format(zone_name),
+    ]
+    for i in range(records):
+        name = 'host{}'.format(i)
+        kind = rnd.randint(0, 9)
+        if kind < 4:
+            lines.append('{} 300 IN A 10.{}.{}.{}'.format(name, i % 256, (i // 256) % 256, rnd.randint(1, 254)))
+            lines.append('    300 IN A 10.{}.{}.{} ; same name as the previous record'.format(
+                (i + 1) % 256, (i // 256) % 256, rnd.randint(1, 254)))
+        elif kind < 5:
+            lines.append('{} IN AAAA 2001:db8::{:x}'.format(name, i))
+        elif kind < 6:
+            lines.append('{} 3600 CNAME target{}.example.org.'.format(name, i))
+        elif kind < 7:
+            lines.append('{} MX {} mail{}'.format(name, rnd.randint(1, 50), i))
+        elif kind < 8:
+            lines.append('{} 600 IN TXT "v=spf1 include:spf{}.example.org ~all" "second; string"'.format(name, i))
+        elif kind < 9:
+            lines.append('_sip._tcp.{} 86400 IN SRV ( 10 60 5060'.format(name))
+            lines.append('    sip{}.{}. )'.format(i, zone_name))
+        else:
+            lines.append('{} 1d CAA 0 issue "ca{}.example.net"'.format(name, i))
+    return '\n'.join(lines) + '\n'
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def benchmark(zone_name, records, loop, save=False):
+    from azure.cli.command_modules.network.zone_file import parse_zone_file
+    text = generate_zone_file(zone_name, records)
+    if save:
+        file_name = '{}.{}.txt'.format(zone_name, records)
+        with open(file_name, 'w') as f:
+            f.write(text)
+        print('Saved {}'.format(file_name))
+    durations = []
+    for _ in range(loop):
+        start = time.time()
+        zone = parse_zone_file(text, zone_name)
+        durations.append(time.time() - start)
+    record_sets = sum(len(types) for types in zone.values())
+    duration = median(durations)
+    print('{:>8} records ({} lines, {} record sets): {:>8.3f} s, {:>9.0f} lines/s'.format(
+        records, text.count('\n'), record_sets, duration, text.count('\n') / max(duration, 1e-9)))
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the parsing of large DNS zone files.')
+    parser.add_argument('--records', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='The numbers of records of the zone files to parse.')
+    parser.add_argument('--loop', type=int, default=3, help='Number of runs per zone file.')
+    parser.add_argument('--zone-name', default='example.com', help='The name of the zone.')
+    parser.add_argument('--save', action='store_true', help='Save the generated zone files.')
+    parser.add_argument('--budget', type=float,
+                        help='Maximum median time to parse the largest zone file, in seconds.')
+    args = parser.parse_args()
+
+    durations = [benchmark(args.zone_name, records, args.loop, args.save) for records in args.records]
+    if args.budget and durations[-1] > args.budget:
+        print('Parsing {} records exceeds the budget: {:.3f} s > {:.3f} s'.format(
+            args.records[-1], durations[-1], args.budget), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Run az commands with the start-up profiler enabled and summarize where the start-up time goes.
+
+    python scripts/performance/profile_startup.py "az cloud list" "az vm list -h" --loop 10 --budget 800
+
+For every command, prints the median time of each phase (e.g. loading each command module) and the imports with the
+highest median cost. Exits with 1 if the median total time of a command exceeds --budget (in milliseconds), so the
+script can be used to catch start-up regressions in a pipeline.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+
+def profile_command(command, loop):
+    fd, report_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    env = dict(os.environ, AZURE_CLI_PROFILE_STARTUP=report_path, AZURE_CLI_PROFILE_STARTUP_FORMAT='json')
+    reports = []
+    try:
+        for _ in range(loop):
+            with open(os.devnull, 'w') as devnull:
+                subprocess.call(shlex.split(command), env=env, stdout=devnull, stderr=devnull)
+            with open(report_path, 'r') as f:
+                reports.append(json.load(f))
+    finally:
+        os.remove(report_path)
+
+    phases = {}
+    imports = {}
+    for report in reports:
+        # phases which happen several times in a run, like building the parser of each command, are summed
+        durations = {}
+        for phase in report['phases']:
+            durations[phase['name']] = durations.get(phase['name'], 0) + phase['duration']
+        for name, duration in durations.items():
+            phases.setdefault(name, []).append(duration)
+        for imported in report['imports']:
+            imports.setdefault(imported['module'], []).append(imported['self'])
+    return {
+        'command': command,
+        'total': median([r['totalTime'] for r in reports]),
+        'phases': {name: median(durations) for name, durations in phases.items()},
+        'imports': {name: median(durations) for name, durations in imports.items()}
+    }
+
+
+def print_summary(summary, top):
+    print('{}: {:.1f} ms'.format(summary['command'], summary['total']))
+    for name, duration in sorted(summary['phases'].items(), key=lambda p: p[1], reverse=True):
+        print('  {:>9.1f} ms  {}'.format(duration, name))
+    print('  top imports (self time):')
+    for name, duration in sorted(summary['imports'].items(), key=lambda i: i[1], reverse=True)[:top]:
+        print('  {:>9.1f} ms  {}'.format(duration, name))
+    print('')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the start-up of az commands.')
+    parser.add_argument('commands', nargs='+', help='The commands to profile, e.g. "az cloud list".')
+    parser.add_argument('--loop', type=int, default=5, help='Number of runs per command.')
+    parser.add_argument('--top', type=int, default=15, help='Number of imports to show.')
+    parser.add_argument('--budget', type=float, help='Maximum median total time of each command, in milliseconds.')
+    parser.add_argument('--output', help='Write the summaries to this JSON file.')
+    args = parser.parse_args()
+
+    summaries = [profile_command(command, args.loop) for command in args.commands]
+    for summary in summaries:
+        print_summary(summary, args.top)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+
+    over_budget = [s for s in summaries if args.budget and s['total'] > args.budget]
+    for summary in over_budget:
+        print('{} exceeds the start-up budget: {:.1f} ms > {:.1f} ms'.format(
+            summary['command'], summary['total'], args.budget), file=sys.stderr)
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,7 +9,12 @@ __version__ = "2.0.58"
 import os
 import sys
 import timeit
+import traceback
 
+# imported first, so that the start-up profiler can time the imports of the CLI
+from azure.cli.core._startup_profiler import startup_profiler
+
+# pylint: disable=wrong-import-order
 import six
 
 from knack.cli import CLI
@@ -19,6 +24,7 @@ from knack.introspection import extract_args_from_signature, extract_full_summar
 from knack.log import get_logger
 from knack.util import CLIError
 from knack.arguments import ArgumentsContext  # pylint: disable=unused-import
+# pylint: enable=wrong-import-order
 
 
 logger = get_logger(__name__)
@@ -37,7 +43,8 @@ class AzCli(CLI):
             register_ids_argument, register_global_subscription_argument)
         from azure.cli.core.cloud import get_active_cloud
         from azure.cli.core.commands.transform import register_global_transforms
-        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, INDEX
+        from azure.cli.core._startup_profiler import register_global_profile_startup_argument
 
         from knack.util import ensure_dir
 
@@ -49,15 +56,19 @@ class AzCli(CLI):
 
         azure_folder = self.config.config_dir
         ensure_dir(azure_folder)
-        ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
-        CONFIG.load(os.path.join(azure_folder, 'az.json'))
-        SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
-        self.cloud = get_active_cloud(self)
+        with startup_profiler.phase('load sessions'):
+            ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
+            CONFIG.load(os.path.join(azure_folder, 'az.json'))
+            SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+            INDEX.load(os.path.join(azure_folder, 'commandIndex.json'))
+        with startup_profiler.phase('load cloud'):
+            self.cloud = get_active_cloud(self)
         logger.debug('Current cloud config:\n%s', str(self.cloud.name))
 
         register_global_transforms(self)
         register_global_subscription_argument(self)
         register_ids_argument(self)  # global subscription must be registered first!
+        register_global_profile_startup_argument(self)
 
         self.progress_controller = None
 
@@ -103,6 +114,8 @@ class MainCommandsLoader(CLICommandsLoader):
         super(MainCommandsLoader, self).__init__(cli_ctx)
         self.cmd_to_loader_map = {}
         self.loaders = []
+        # whether the command table only has the commands of the top-level command looked up in the command index
+        self.partial_command_table = False
 
     def _update_command_definitions(self):
         for cmd_name in self.command_table:
@@ -115,31 +128,34 @@ class MainCommandsLoader(CLICommandsLoader):
     def load_command_table(self, args):
         from importlib import import_module
         import pkgutil
-        import traceback
         from azure.cli.core.commands import (
             _load_module_command_loader, _load_extension_command_loader, BLACKLISTED_MODS, ExtensionCommandSource)
         from azure.cli.core.extension import (
             get_extensions, get_extension_path, get_extension_modname)
 
-        def _update_command_table_from_modules(args):
+        def _update_command_table_from_modules(args, command_modules=None):
             '''Loads command table(s)
-            When `module_name` is specified, only commands from that module will be loaded.
-            If the module is not found, all commands are loaded.
+            When `command_modules` is specified, only commands from those modules will be loaded.
+            Otherwise, commands from all installed modules are loaded.
             '''
             installed_command_modules = []
-            try:
-                mods_ns_pkg = import_module('azure.cli.command_modules')
-                installed_command_modules = [modname for _, modname, _ in
-                                             pkgutil.iter_modules(mods_ns_pkg.__path__)
-                                             if modname not in BLACKLISTED_MODS]
-            except ImportError:
-                pass
+            if command_modules is not None:
+                installed_command_modules = command_modules
+            else:
+                try:
+                    mods_ns_pkg = import_module('azure.cli.command_modules')
+                    installed_command_modules = [modname for _, modname, _ in
+                                                 pkgutil.iter_modules(mods_ns_pkg.__path__)
+                                                 if modname not in BLACKLISTED_MODS]
+                except ImportError:
+                    pass
             logger.debug('Installed command modules %s', installed_command_modules)
             cumulative_elapsed_time = 0
             for mod in [m for m in installed_command_modules if m not in BLACKLISTED_MODS]:
                 try:
                     start_time = timeit.default_timer()
-                    module_command_table, module_group_table = _load_module_command_loader(self, args, mod)
+                    with startup_profiler.phase('load module {}'.format(mod), module=mod):
+                        module_command_table, module_group_table = _load_module_command_loader(self, args, mod)
                     for cmd in module_command_table.values():
                         cmd.command_source = mod
                     self.command_table.update(module_command_table)
@@ -159,7 +175,10 @@ class MainCommandsLoader(CLICommandsLoader):
                          "(note: there's always an overhead with the first module loaded)",
                          cumulative_elapsed_time)
 
-        def _update_command_table_from_extensions(ext_suppressions):
+        def _update_command_table_from_extensions(ext_suppressions, extensions, extension_names=None):
+            '''Loads command table(s) of the given extensions
+            When `extension_names` is specified, only commands from those extensions will be loaded.
+            '''
 
             def _handle_extension_suppressions(extensions):
                 filtered_extensions = []
@@ -172,7 +191,8 @@ class MainCommandsLoader(CLICommandsLoader):
                         filtered_extensions.append(ext)
                 return filtered_extensions
 
-            extensions = get_extensions()
+            if extension_names is not None:
+                extensions = [ext for ext in extensions if ext.name in extension_names]
             if extensions:
                 logger.debug("Found %s extensions: %s", len(extensions), [e.name for e in extensions])
                 allowed_extensions = _handle_extension_suppressions(extensions)
@@ -187,8 +207,9 @@ class MainCommandsLoader(CLICommandsLoader):
                         # from an extension requires this map to be up-to-date.
                         # self._mod_to_ext_map[ext_mod] = ext_name
                         start_time = timeit.default_timer()
-                        extension_command_table, extension_group_table = \
-                            _load_extension_command_loader(self, args, ext_mod)
+                        with startup_profiler.phase('load extension {}'.format(ext_name), extension=ext_name):
+                            extension_command_table, extension_group_table = \
+                                _load_extension_command_loader(self, args, ext_mod)
 
                         for cmd_name, cmd in extension_command_table.items():
                             cmd.command_source = ExtensionCommandSource(
@@ -231,16 +252,49 @@ class MainCommandsLoader(CLICommandsLoader):
                     res.append(sup)
             return res
 
-        _update_command_table_from_modules(args)
+        def _load_extensions(extension_names=None):
+            try:
+                ext_suppressions = _get_extension_suppressions(self.loaders)
+                # We always load extensions even if the appropriate module has been loaded
+                # as an extension could override the commands already loaded.
+                _update_command_table_from_extensions(ext_suppressions, extensions, extension_names)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to load extensions. Use --debug for more information.")
+                logger.debug(traceback.format_exc())
+
         try:
-            ext_suppressions = _get_extension_suppressions(self.loaders)
-            # We always load extensions even if the appropriate module has been loaded
-            # as an extension could override the commands already loaded.
-            _update_command_table_from_extensions(ext_suppressions)
+            extensions = get_extensions()
         except Exception:  # pylint: disable=broad-except
+            extensions = []
             logger.warning("Unable to load extensions. Use --debug for more information.")
             logger.debug(traceback.format_exc())
 
+        command_index = None
+        if args and self.cli_ctx.config.getboolean('core', 'use_command_index', fallback=True):
+            command_index = CommandIndex(self.cli_ctx)
+            index_result = command_index.get(args, extensions)
+            if index_result:
+                index_modules, index_extensions = index_result
+                _update_command_table_from_modules(args, index_modules)
+                _load_extensions(index_extensions)
+                if self.command_table:
+                    self.partial_command_table = True
+                    return self.command_table
+                # The index pointed at modules which no longer provide commands. Fall back to a full load.
+                logger.debug("No commands loaded from the command index. Rebuilding it.")
+                command_index.invalidate()
+                self.cmd_to_loader_map = {}
+                self.loaders = []
+
+        self.partial_command_table = False
+        _update_command_table_from_modules(args)
+        # Extensions may override module commands, so keep track of what the modules provided for the index.
+        module_command_table = dict(self.command_table)
+        _load_extensions()
+
+        if command_index:
+            command_index.update([module_command_table, self.command_table], extensions)
+
         return self.command_table
 
     def load_arguments(self, command):
@@ -250,6 +304,15 @@ class MainCommandsLoader(CLICommandsLoader):
         command_loaders = self.cmd_to_loader_map.get(command, None)
 
         if command_loaders:
+            argument_cache = None
+            if len(command_loaders) == 1 and not self.cli_ctx.data['completer_active'] and \
+                    self.cli_ctx.config.getboolean('core', 'use_argument_cache', fallback=True):
+                from azure.cli.core._argument_cache import ArgumentCache
+                argument_cache = ArgumentCache(self.cli_ctx)
+                command_loaders[0].command_name = command
+                if argument_cache.load(self.command_table[command], command_loaders[0]):
+                    return
+
             for loader in command_loaders:
                 # register global args
                 with loader.argument_context('') as c:
@@ -263,8 +326,120 @@ class MainCommandsLoader(CLICommandsLoader):
                 loader.load_arguments(command)  # this adds entries to the argument registries
                 self.argument_registry.arguments.update(loader.argument_registry.arguments)
                 self.extra_argument_registry.update(loader.extra_argument_registry)
+                if argument_cache:
+                    self._save_argument_cache(argument_cache, command, loader)
                 loader._update_command_definitions()  # pylint: disable=protected-access
 
+    def _save_argument_cache(self, argument_cache, command_name, loader):
+        # Capture the arguments before the registered overrides are applied, so that configured defaults
+        # are resolved again when the arguments are restored from the cache.
+        command = self.command_table[command_name]
+        arguments = dict(command.arguments)
+        arguments.update(self.extra_argument_registry[command_name])
+        argument_cache.save(
+            command, loader,
+            arguments=[(name, arg.type.settings,
+                        self.argument_registry.get_cli_argument(command_name, name).settings)
+                       for name, arg in arguments.items()],
+            registrations={name: arg.settings
+                           for name, arg in loader.argument_registry.arguments[command_name].items()})
+
+
+class CommandIndex(object):
+    """Persistent mapping of top-level command names to the command modules and extensions providing them.
+
+    The index lets `MainCommandsLoader` import only the modules that own the invoked command. It is stored in
+    `commandIndex.json` under the config directory and is only used while the CLI version, the cloud profile and
+    the set of installed extensions match the ones it was built with. Otherwise it is rebuilt on the next full load.
+    """
+
+    _COMMAND_INDEX = 'commandIndex'
+    _COMMAND_INDEX_VERSION = 'version'
+    _COMMAND_INDEX_CLOUD_PROFILE = 'cloudProfile'
+    _COMMAND_INDEX_EXTENSIONS = 'extensions'
+
+    def __init__(self, cli_ctx=None):
+        from azure.cli.core._session import INDEX
+        self.INDEX = INDEX  # pylint: disable=invalid-name
+        self.version = __version__
+        self.cloud_profile = cli_ctx.cloud.profile if cli_ctx else None
+
+    @staticmethod
+    def _get_extensions_key(extensions):
+        return sorted('{}=={}'.format(ext.name, getattr(ext, 'version', None)) for ext in extensions)
+
+    @staticmethod
+    def _get_top_level_command(args):
+        if not args or args[0].startswith('-'):
+            return None
+        return args[0]
+
+    def _is_valid(self, extensions):
+        return self.INDEX.get(self._COMMAND_INDEX_VERSION) == self.version and \
+            self.INDEX.get(self._COMMAND_INDEX_CLOUD_PROFILE) == self.cloud_profile and \
+            self.INDEX.get(self._COMMAND_INDEX_EXTENSIONS) == self._get_extensions_key(extensions)
+
+    def get(self, args, extensions):
+        """Get the command modules and extensions that provide the top-level command in `args`.
+
+        :param args: The command line arguments.
+        :param extensions: The installed extensions.
+        :return: A tuple of (command module names, extension names), or None if the index cannot be used.
+        """
+        top_command = self._get_top_level_command(args)
+        if not top_command:
+            return None
+        if not self._is_valid(extensions):
+            logger.debug("Command index is missing or out of date.")
+            return None
+        index = self.INDEX.get(self._COMMAND_INDEX) or {}
+        entry = index.get(top_command)
+        if not entry:
+            logger.debug("Command index has no entry for '%s'.", top_command)
+            return None
+        logger.debug("Command index entry for '%s': %s", top_command, entry)
+        return entry.get('modules', []), entry.get('extensions', [])
+
+    def update(self, command_tables, extensions):
+        """Rebuild the index from fully loaded command tables.
+
+        :param command_tables: The command tables containing commands from all modules and extensions.
+        :param extensions: The installed extensions.
+        """
+        from itertools import chain
+        from azure.cli.core.commands import ExtensionCommandSource
+
+        index = {}
+        for command_name, command in chain.from_iterable(t.items() for t in command_tables):
+            top_command = command_name.split()[0]
+            entry = index.setdefault(top_command, {'modules': [], 'extensions': []})
+            source = command.command_source
+            if isinstance(source, ExtensionCommandSource):
+                if source.extension_name not in entry['extensions']:
+                    entry['extensions'].append(source.extension_name)
+            elif source and source not in entry['modules']:
+                entry['modules'].append(source)
+
+        self.INDEX.data = {
+            self._COMMAND_INDEX_VERSION: self.version,
+            self._COMMAND_INDEX_CLOUD_PROFILE: self.cloud_profile,
+            self._COMMAND_INDEX_EXTENSIONS: self._get_extensions_key(extensions),
+            self._COMMAND_INDEX: index
+        }
+        try:
+            self.INDEX.save_with_retry()
+            logger.debug("Updated command index with %s top-level commands.", len(index))
+        except (OSError, IOError):
+            logger.debug("Unable to save command index. %s", traceback.format_exc())
+
+    def invalidate(self):
+        """Discard the index so that the next invocation rebuilds it."""
+        self.INDEX.data = {}
+        try:
+            self.INDEX.save_with_retry()
+        except (OSError, IOError):
+            logger.debug("Unable to save command index. %s", traceback.format_exc())
+
 
 class ModExtensionSuppress(object):  # pylint: disable=too-few-public-methods
 
@@ -511,12 +686,13 @@ def get_default_cli():
     from azure.cli.core._help import AzCliHelp
     from azure.cli.core._output import AzOutputProducer
 
-    return AzCli(cli_name='az',
-                 config_dir=GLOBAL_CONFIG_DIR,
-                 config_env_var_prefix=ENV_VAR_PREFIX,
-                 commands_loader_cls=MainCommandsLoader,
-                 invocation_cls=AzCliCommandInvoker,
-                 parser_cls=AzCliCommandParser,
-                 logging_cls=AzCliLogging,
-                 output_cls=AzOutputProducer,
-                 help_cls=AzCliHelp)
+    with startup_profiler.phase('AzCli.__init__'):
+        return AzCli(cli_name='az',
+                     config_dir=GLOBAL_CONFIG_DIR,
+                     config_env_var_prefix=ENV_VAR_PREFIX,
+                     commands_loader_cls=MainCommandsLoader,
+                     invocation_cls=AzCliCommandInvoker,
+                     parser_cls=AzCliCommandParser,
+                     logging_cls=AzCliLogging,
+                     output_cls=AzOutputProducer,
+                     help_cls=AzCliHelp)
@@ -0,0 +1,268 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+On-disk cache of the fully resolved argument metadata of a command.
+
+Loading the arguments of a command requires reflecting over the SDK operation and running the `argument_context`
+registrations of the command module, both of which import SDK operation classes and models. The argument cache stores
+the reflected arguments and the registered overrides of a command so that later invocations can build the parser
+without doing either. Values which cannot be reconstructed without running the command module (e.g. closures created
+inside `load_arguments`) make the command uncacheable, in which case arguments are always loaded the regular way.
+
+This module is imported at start-up, so it should not import anything beyond the Python Standard Library at the
+module level.
+"""
+
+import json
+import os
+import sys
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+ARGUMENT_CACHE_DIR_NAME = 'commandArgumentCache'
+
+_FACTORY_ATTR = '_argument_cache_factory'
+
+
+class ArgumentNotCacheableError(Exception):
+    pass
+
+
+def track_argument_factory(value, factory, args=None, kwargs=None, setting=None):
+    """
+    Record how a value registered as argument setting was created so that the argument cache can recreate it.
+
+    :param value: A closure or locally defined class, such as an argparse action or completer.
+    :param factory: The module-level function which created `value`.
+    :param args: The positional arguments `factory` was called with.
+    :param kwargs: The keyword arguments `factory` was called with.
+    :param setting: When `factory` returns a CLIArgumentType, the name of the setting holding `value`.
+    :return: The value.
+    """
+    setattr(value, _FACTORY_ATTR, (factory, list(args or []), dict(kwargs or {}), setting))
+    return value
+
+
+def _get_ref_name(value):
+    from azure.cli.core.decorators import Completer
+    from importlib import import_module
+
+    target = value.func if isinstance(value, Completer) else value
+    module_name = getattr(target, '__module__', None)
+    qualname = getattr(target, '__qualname__', None) or getattr(target, '__name__', None)
+    if not module_name or not qualname or '<' in qualname:
+        return None
+    try:
+        resolved = import_module(module_name)
+        for part in qualname.split('.'):
+            resolved = getattr(resolved, part)
+    except (ImportError, AttributeError):
+        return None
+    return '{}#{}'.format(module_name, qualname) if resolved is value else None
+
+
+def _resolve_ref_name(name):
+    from importlib import import_module
+
+    module_name, qualname = name.split('#', 1)
+    resolved = import_module(module_name)
+    for part in qualname.split('.'):
+        resolved = getattr(resolved, part)
+    return resolved
+
+
+class ArgumentCache(object):
+    """
+    Stores the reflected arguments, registered overrides and argument registrations of single commands on disk.
+
+    Entries are stored per command and cloud profile, and are only used while the CLI version and the command module
+    or extension which registered the command are unchanged.
+    """
+
+    _VERSION = 'version'
+    _SOURCE_STAMP = 'sourceStamp'
+    _ARGUMENTS = 'arguments'
+    _REGISTRATIONS = 'registrations'
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core import __version__
+        self.cli_ctx = cli_ctx
+        self.version = __version__
+        self.cache_dir = os.path.join(cli_ctx.config.config_dir, ARGUMENT_CACHE_DIR_NAME, cli_ctx.cloud.profile)
+
+    def _get_cache_path(self, command_name):
+        return os.path.join(self.cache_dir, '{}.json'.format('.'.join(command_name.split())))
+
+    @staticmethod
+    def _get_source_stamp(command_loader):
+        """ Identify the code which registered the command, so that the cache is invalidated when it changes. """
+        module_name = command_loader.__class__.__module__
+        module = sys.modules.get(module_name)
+        module_dir = os.path.dirname(getattr(module, '__file__', '') or '')
+        stamp = 0
+        if module_dir and os.path.isdir(module_dir):
+            stamp = max([os.path.getmtime(os.path.join(module_dir, f)) for f in os.listdir(module_dir)
+                         if f.endswith('.py')] or [0])
+        return '{}@{}'.format(module_name, stamp)
+
+    # pylint: disable=too-many-return-statements
+    def _serialize(self, value):
+        from enum import Enum
+        import six
+        from knack.arguments import CaseInsensitiveList, CLIArgumentType
+        from knack.cli import CLI
+        from azure.cli.core.commands import CliCommandType
+
+        # exact type checks, so that subclasses such as DefaultStr or enum members are not flattened
+        if value is None or type(value) in (bool, int, float, str, six.text_type):  # pylint: disable=unidiomatic-typecheck
+            return value
+        if isinstance(value, CLI):
+            return {'_type': 'cli_ctx'}
+        if isinstance(value, CaseInsensitiveList):
+            return {'_type': 'ci_list', 'value': [self._serialize(x) for x in value]}
+        if type(value) in (list, tuple):  # pylint: disable=unidiomatic-typecheck
+            return {'_type': type(value).__name__, 'value': [self._serialize(x) for x in value]}
+        if type(value) is dict and all(isinstance(k, str) for k in value):  # pylint: disable=unidiomatic-typecheck
+            return {'_type': 'dict', 'value': {k: self._serialize(v) for k, v in value.items()}}
+        if isinstance(value, Enum):
+            enum_name = _get_ref_name(type(value))
+            if enum_name:
+                return {'_type': 'enum', 'name': enum_name, 'value': value.name}
+        if isinstance(value, (CLIArgumentType, CliCommandType)):
+            # types which are created from (and fully described by) their settings
+            return {'_type': 'settings', 'name': _get_ref_name(type(value)),
+                    'value': self._serialize_settings(value.settings)}
+        factory_info = getattr(value, _FACTORY_ATTR, None)
+        if factory_info:
+            factory, args, kwargs, setting = factory_info
+            factory_name = _get_ref_name(factory)
+            if factory_name:
+                return {'_type': 'factory', 'name': factory_name, 'setting': setting,
+                        'args': [self._serialize(x) for x in args],
+                        'kwargs': {k: self._serialize(v) for k, v in kwargs.items()}}
+        ref_name = _get_ref_name(value)
+        if ref_name:
+            return {'_type': 'ref', 'name': ref_name}
+        raise ArgumentNotCacheableError(repr(value))
+
+    def _deserialize(self, value):
+        from knack.arguments import CaseInsensitiveList
+
+        if not isinstance(value, dict):
+            return value
+        value_type = value['_type']
+        if value_type == 'cli_ctx':
+            return self.cli_ctx
+        if value_type == 'ci_list':
+            return CaseInsensitiveList([self._deserialize(x) for x in value['value']])
+        if value_type == 'list':
+            return [self._deserialize(x) for x in value['value']]
+        if value_type == 'tuple':
+            return tuple(self._deserialize(x) for x in value['value'])
+        if value_type == 'dict':
+            return {k: self._deserialize(v) for k, v in value['value'].items()}
+        if value_type == 'ref':
+            return _resolve_ref_name(value['name'])
+        if value_type == 'enum':
+            return getattr(_resolve_ref_name(value['name']), value['value'])
+        if value_type == 'settings':
+            return _resolve_ref_name(value['name'])(**self._deserialize_settings(value['value']))
+        if value_type == 'factory':
+            factory = _resolve_ref_name(value['name'])
+            result = factory(*[self._deserialize(x) for x in value['args']],
+                             **{k: self._deserialize(v) for k, v in value['kwargs'].items()})
+            return result.settings[value['setting']] if value['setting'] else result
+        raise ValueError("Unknown argument cache value type '{}'".format(value_type))
+
+    def _serialize_settings(self, settings):
+        result = {}
+        for key, value in settings.items():
+            try:
+                result[key] = self._serialize(value)
+            except ArgumentNotCacheableError as ex:
+                if key == 'completer':
+                    # completers are only used for tab completion, which never restores arguments from the cache
+                    result[key] = None
+                    continue
+                raise ArgumentNotCacheableError("'{}': {}".format(key, ex))
+        return result
+
+    def _deserialize_settings(self, settings):
+        return {k: self._deserialize(v) for k, v in settings.items()}
+
+    def save(self, command, command_loader, arguments, registrations):
+        """
+        Store the arguments of a command.
+
+        :param command: The command the arguments belong to.
+        :type command: azure.cli.core.commands.AzCliCommand
+        :param command_loader: The command loader which registered the command.
+        :param arguments: List of (name, settings, override settings) of the arguments, where settings are the
+                          argument settings before the overrides registered through `argument_context` are applied.
+        :param registrations: Dictionary of argument name to the settings registered for the exact command scope.
+        """
+        try:
+            data = {
+                self._VERSION: self.version,
+                self._SOURCE_STAMP: self._get_source_stamp(command_loader),
+                self._ARGUMENTS: [[name, self._serialize_settings(settings), self._serialize_settings(overrides)]
+                                  for name, settings, overrides in arguments],
+                self._REGISTRATIONS: {name: self._serialize_settings(settings)
+                                      for name, settings in registrations.items()}
+            }
+        except ArgumentNotCacheableError as ex:
+            logger.debug("Arguments of '%s' cannot be cached: %s", command.name, ex)
+            return
+        try:
+            from knack.util import ensure_dir
+            ensure_dir(self.cache_dir)
+            with open(self._get_cache_path(command.name), 'w') as f:
+                json.dump(data, f)
+        except (OSError, IOError) as ex:
+            logger.debug("Unable to save argument cache for '%s': %s", command.name, ex)
+
+    def load(self, command, command_loader):
+        """
+        Populate the arguments of a command from the cache.
+
+        :param command: The command to load the arguments for.
+        :type command: azure.cli.core.commands.AzCliCommand
+        :param command_loader: The command loader which registered the command.
+        :return: True if the arguments were loaded from the cache.
+        """
+        from knack.arguments import CLIArgumentType, CLICommandArgument
+
+        try:
+            with open(self._get_cache_path(command.name), 'r') as f:
+                data = json.load(f)
+        except (OSError, IOError, ValueError):
+            return False
+        if data.get(self._VERSION) != self.version or \
+                data.get(self._SOURCE_STAMP) != self._get_source_stamp(command_loader):
+            logger.debug("Argument cache for '%s' is out of date.", command.name)
+            return False
+
+        try:
+            arguments = [(name, self._deserialize_settings(settings), self._deserialize_settings(overrides))
+                         for name, settings, overrides in data[self._ARGUMENTS]]
+            registrations = {name: self._deserialize_settings(settings)
+                             for name, settings in data[self._REGISTRATIONS].items()}
+        except Exception:  # pylint: disable=broad-except
+            import traceback
+            logger.debug("Unable to restore argument cache for '%s': %s", command.name, traceback.format_exc())
+            return False
+
+        command.arguments = {}
+        for name, settings, _ in arguments:
+            command.arguments[name] = CLICommandArgument(**settings)
+        for name, _, overrides in arguments:
+            command.update_argument(name, CLIArgumentType(**overrides))
+        for name, settings in registrations.items():
+            command_loader.argument_registry.arguments[command.name][name] = CLIArgumentType(**settings)
+        logger.debug("Loaded arguments of '%s' from the argument cache.", command.name)
+        return True
@@ -0,0 +1,307 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Fast path for tab completion.
+
+Completing a command line normally goes through a whole invocation: the command modules are imported, the parser is
+built and argcomplete walks it. While doing so, the names of the commands and the options of the groups and commands
+which are completed are recorded in `commandTree.json` under the config directory. Later completions of command
+names, option names and the values of options with a fixed set of choices are answered from that tree without
+importing any command module. Anything the tree can't answer exactly, like the values of options with a completer,
+goes through the regular completion, which adds what it learns to the tree.
+
+The tree is discarded when the CLI version, the configuration, the clouds or the installed extensions change.
+"""
+
+import json
+import os
+
+COMMAND_TREE_FILE_NAME = 'commandTree.json'
+
+_CLOUDS_CONFIG_FILE_NAME = 'clouds.config'
+_ARGCOMPLETE_SPECIAL_CHARS = '\\();<>|&!`$* \t\n"\''
+_CONTINUATION_CHARS = '=/:'
+
+
+def _is_expired(deprecate_info):
+    return bool(deprecate_info and deprecate_info.expired())
+
+
+def _is_hidden(action):
+    from argparse import SUPPRESS
+    suppress = getattr(getattr(action, 'completer', None), 'suppress', None)
+    return action.help == SUPPRESS or bool(callable(suppress) and suppress())
+
+
+def _get_group_parser(parser, path):
+    if not path:
+        return parser
+    subparsers = parser.subparsers.get(tuple(path[:-1]))
+    return subparsers.choices.get(path[-1]) if subparsers else None
+
+
+class CommandTree(object):
+    """
+    The names of the commands and the options of the groups and commands, as seen by argcomplete.
+
+    The tree has the top-level command names once all the command modules have been loaded, the names of the
+    commands under each top-level command loaded so far, the options of the groups and, for each command which has
+    been completed, its options along with their number of values and choices.
+
+    :param config_dir: The directory the tree is stored in.
+    """
+
+    def __init__(self, config_dir):
+        self.path = os.path.join(config_dir, COMMAND_TREE_FILE_NAME)
+        self.stamp = self._get_stamp(config_dir)
+        self.data = None
+
+    @staticmethod
+    def _get_stamp(config_dir):
+        from azure.cli.core import __version__
+        from azure.cli.core._config import CONFIG_FILE_NAME
+        from azure.cli.core.extension import EXTENSIONS_DIR, DEV_EXTENSION_SOURCES
+
+        paths = [os.path.join(config_dir, CONFIG_FILE_NAME), os.path.join(config_dir, _CLOUDS_CONFIG_FILE_NAME),
+                 EXTENSIONS_DIR] + DEV_EXTENSION_SOURCES
+        return [__version__, os.environ.get('AZURE_CLOUD_NAME')] + \
+            [os.path.getmtime(p) if os.path.exists(p) else None for p in paths]
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get('stamp') != self.stamp:
+            data = {'stamp': self.stamp, 'tops': None, 'commands': {}, 'groups': {}, 'parsers': {}}
+        self.data = data
+        return self
+
+    def save(self):
+        from knack.log import get_logger
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self.data, f, separators=(',', ':'))
+        except (IOError, OSError) as ex:
+            get_logger(__name__).debug("Failed to save the command tree '%s': %s", self.path, ex)
+
+    def add_commands(self, command_table, group_table, top_command=None):
+        """
+        Record the names of the commands of a command table.
+
+        :param command_table: The loaded command table.
+        :param group_table: The loaded command group table.
+        :param top_command: The top-level command whose commands are all in the command table, when it doesn't hold
+                            the commands of all the command modules.
+        """
+        commands = {}
+        for name, command in command_table.items():
+            words = name.split()
+            if _is_expired(command.deprecate_info) or any(
+                    _is_expired(getattr(group_table.get(' '.join(words[:i])), 'group_kwargs', {}).get('deprecate_info'))
+                    for i in range(1, len(words))):
+                continue
+            commands.setdefault(words[0], []).append(name)
+        if top_command is None:
+            self.data['tops'] = list(commands)
+            self.data['commands'] = commands
+        elif top_command in commands:
+            self.data['commands'][top_command] = commands[top_command]
+
+    # pylint: disable=protected-access
+    def add_parser(self, parser, command):
+        """
+        Record the options of the groups of a parser and, if the parser has its arguments, of the command.
+
+        :param parser: The root parser, with the command table loaded.
+        :param command: The command whose arguments are loaded in the parser.
+        """
+        from argparse import _SubParsersAction
+        for path in parser.subparsers:
+            group_parser = _get_group_parser(parser, path)
+            if group_parser is not None:
+                self.data['groups'][' '.join(path)] = [
+                    o for a in group_parser._actions if not _is_hidden(a) for o in a.option_strings]
+
+        command_parser = _get_group_parser(parser, command.split()) if command else None
+        if command_parser is None or command_parser.get_default('command') != command:
+            return
+        actions = [a for a in command_parser._actions if not isinstance(a, _SubParsersAction)]
+        self.data['parsers'][command] = {
+            'positionals': any(not a.option_strings for a in actions),
+            'exclusive': bool(command_parser._mutually_exclusive_groups),
+            'actions': [{
+                'options': a.option_strings,
+                'nargs': a.nargs,
+                'choices': [str(c) for c in a.choices] if a.choices is not None else None,
+                'completer': getattr(a, 'completer', None) is not None,
+                'hidden': _is_hidden(a)
+            } for a in actions]
+        }
+
+    def _get_children(self, path):
+        if not path:
+            return self.data['tops']
+        names = self.data['commands'].get(path[0])
+        if names is None:
+            return None
+        children = []
+        depth = len(path)
+        for name in names:
+            words = name.split()
+            if words[:depth] == path and len(words) > depth and words[depth] not in children:
+                children.append(words[depth])
+        return children
+
+    def _complete_command(self, command, args, prefix):  # pylint: disable=too-many-return-statements
+        entry = self.data['parsers'].get(command)
+        if not entry or entry['positionals'] or entry['exclusive']:
+            return None
+        actions = {o: a for a in entry['actions'] for o in a['options']}
+        pending = None
+        for arg in args:
+            if pending:
+                if arg.startswith('-'):
+                    return None
+                pending = None
+                continue
+            action = actions.get(arg)
+            if action is None:
+                return None
+            if action['nargs'] is None:
+                pending = action
+            elif action['nargs'] != 0:
+                return None
+        if pending and not prefix.startswith('-'):
+            if pending['completer']:
+                return None
+            return [c for c in pending['choices'] or [] if c.lower().startswith(prefix.lower())]
+        return [o for a in entry['actions'] if not a['hidden'] for o in a['options'] if o.startswith(prefix)]
+
+    def complete(self, words, prefix):
+        """
+        The completions of a command line, as argcomplete would return them.
+
+        :param words: The words of the command line before the word being completed, without the program name.
+        :param prefix: The beginning of the word being completed.
+        :return: The completions, or None if the tree can't tell them.
+        """
+        path = []
+        # without the top-level commands, the ones under which commands are known can still be walked into
+        children = self._get_children(path)
+        if children is None:
+            children = list(self.data['commands'])
+        for i, word in enumerate(words):
+            if children is None or word not in children:
+                return None
+            path.append(word)
+            name = ' '.join(path)
+            if name in self.data['commands'].get(path[0], []):
+                return self._complete_command(name, words[i + 1:], prefix)
+            children = self._get_children(path)
+        options = self.data['groups'].get(' '.join(path))
+        if not path:
+            children = self.data['tops']
+        if children is None or options is None:
+            return None
+        return [o for o in options if o.startswith(prefix)] + [c for c in children if c.startswith(prefix)]
+
+
+def _is_enabled(config):
+    return config.getboolean('core', 'use_command_tree', fallback=True)
+
+
+def record_commands(cli_ctx, commands_loader, args):
+    """
+    Record the names of the loaded commands in the command tree while completing a command line.
+
+    :param cli_ctx: The CLI context.
+    :param commands_loader: The commands loader, with the command table loaded for the command line.
+    :param args: The arguments of the command line.
+    """
+    if not _is_enabled(cli_ctx.config):
+        return
+    tree = CommandTree(cli_ctx.config.config_dir).load()
+    top_command = args[0] if getattr(commands_loader, 'partial_command_table', False) else None
+    tree.add_commands(commands_loader.command_table, commands_loader.command_group_table, top_command)
+    cli_ctx.data['command_tree'] = tree
+
+
+def record_parser(parser, command, external_completions):
+    """
+    Record the options of the parser built to complete a command line in the command tree and save it.
+
+    :param parser: The root parser.
+    :param command: The command whose arguments are loaded in the parser.
+    :param external_completions: Whether handlers add completions of their own, which the tree can't tell.
+    """
+    tree = parser.cli_ctx.data.pop('command_tree', None)
+    if tree is None:
+        return
+    tree.add_parser(parser, command)
+    tree.data['externalCompletions'] = external_completions
+    tree.save()
+
+
+def _split_line(comp_line, comp_point, start):
+    """ The words and the prefix of the word being completed, or None if the line isn't made of plain words. """
+    line = comp_line[:comp_point]
+    wordbreaks = os.environ.get('_ARGCOMPLETE_COMP_WORDBREAKS', '')
+    if any(c in line for c in '\'"\\=') or any(c in line for c in wordbreaks if not c.isspace()):
+        return None
+    words = line.split()
+    prefix = '' if not line or line[-1].isspace() else words.pop()
+    words = words[start:]
+    if not words or '--' in words:
+        return None
+    return words[1:], prefix
+
+
+def complete_from_command_tree():  # pylint: disable=too-many-return-statements
+    """
+    Answer a tab completion request of the shell from the command tree.
+
+    :return: True if the completions were written, False if the regular completion needs to run.
+    """
+    from azure.cli.core._config import GLOBAL_CONFIG_DIR
+    from azure.cli.core.extension import az_config
+
+    env = os.environ
+    if env.get('_ARGCOMPLETE_SHELL', 'bash') != 'bash' or env.get('_ARGCOMPLETE_DFS') or \
+            env.get('_ARGCOMPLETE_STDOUT_FILENAME') or len(env.get('_ARGCOMPLETE_IFS', '\013')) != 1 or \
+            not _is_enabled(az_config):
+        return False
+    try:
+        split = _split_line(env['COMP_LINE'], int(env['COMP_POINT']), int(env['_ARGCOMPLETE']) - 1)
+    except (KeyError, ValueError):
+        return False
+    if split is None:
+        return False
+
+    tree = CommandTree(GLOBAL_CONFIG_DIR).load()
+    if tree.data.get('externalCompletions') is not False:
+        return False
+    completions = tree.complete(*split)
+    if completions is None:
+        return False
+
+    unique_completions = []
+    for completion in completions:
+        if completion not in unique_completions:
+            unique_completions.append(completion)
+    for c in _ARGCOMPLETE_SPECIAL_CHARS:
+        unique_completions = [completion.replace(c, '\\' + c) for completion in unique_completions]
+    if len(unique_completions) == 1 and unique_completions[0][-1:] not in _CONTINUATION_CHARS and \
+            env.get('_ARGCOMPLETE_SUPPRESS_SPACE') != '1':
+        unique_completions[0] += ' '
+    try:
+        output_stream = os.fdopen(8, 'w')
+    except (IOError, OSError):
+        return False
+    output_stream.write(env.get('_ARGCOMPLETE_IFS', '\013').join(unique_completions))
+    output_stream.flush()
+    return True
@@ -0,0 +1,185 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Cache of the values of the completers which list resources from ARM.
+
+Completing resource group names, locations or resource names used to call ARM on every press of the tab key. The
+values are now kept in a file per list under `completionCache/<cloud>_<subscription>` in the config directory. Lists
+which expired are still used for a while and refreshed by a background process, so that completion doesn't wait for
+ARM unless a list was never fetched or is very old.
+
+The background process runs this module: `python -m azure.cli.core._completion_cache '<lists as JSON>'`.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 300
+# how long expired values are still used while they are refreshed in the background
+MAX_STALENESS = 86400
+# how long a started background refresh prevents starting another one
+_REFRESH_TIMEOUT = 120
+_CACHE_DIR_NAME = 'completionCache'
+_REFRESH_LOCK_FILE_NAME = 'refresh.lock'
+
+
+def _list_locations(cli_ctx):
+    from azure.cli.core.commands.parameters import get_subscription_locations
+    return [loc.name for loc in get_subscription_locations(cli_ctx)]
+
+
+def _list_resource_groups(cli_ctx):
+    from azure.cli.core.commands.parameters import get_resource_groups
+    return [g.name for g in get_resource_groups(cli_ctx)]
+
+
+def _list_resources(cli_ctx, resource_group_name, resource_type):
+    from azure.cli.core.commands.parameters import get_resources_in_resource_group, get_resources_in_subscription
+    if resource_group_name:
+        return [r.name for r in get_resources_in_resource_group(cli_ctx, resource_group_name, resource_type)]
+    return [r.name for r in get_resources_in_subscription(cli_ctx, resource_type)]
+
+
+_LISTS = {
+    'locations': _list_locations,
+    'resourceGroups': _list_resource_groups,
+    'resources': _list_resources
+}
+# the lists fetched in the background the first time completion needs a list of the subscription
+_PREFETCHED_LISTS = [['resourceGroups', []], ['locations', []]]
+
+
+class CompletionCache(object):
+    """
+    On-disk cache of the values of the ARM completers, per cloud and subscription.
+
+    The values are fetched again after `completion_cache_ttl` in the [core] section of the configuration, in seconds.
+    Setting it to 0 disables the cache.
+    """
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        self.ttl = cli_ctx.config.getint('core', 'completion_cache_ttl', fallback=DEFAULT_TTL)
+        self.enabled = self.ttl > 0
+        self._dir = None
+        if self.enabled:
+            from azure.cli.core.commands.client_factory import get_subscription_id
+            try:
+                subscription_id = get_subscription_id(cli_ctx)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.debug("Completion cache disabled: %s", ex)
+                self.enabled = False
+            else:
+                self._dir = os.path.join(cli_ctx.config.config_dir, _CACHE_DIR_NAME,
+                                         '{}_{}'.format(cli_ctx.cloud.name, subscription_id))
+
+    @staticmethod
+    def _get_file_name(name, args):
+        return re.sub(r'[^\w.-]', '_', '-'.join([name] + [(a or '').lower() for a in args])) + '.json'
+
+    def _read(self, name, args):
+        try:
+            with open(os.path.join(self._dir, self._get_file_name(name, args)), 'r') as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('name') != name or entry.get('args') != args:
+            return None
+        return entry
+
+    def _write(self, name, args, values):
+        try:
+            if not os.path.isdir(self._dir):
+                os.makedirs(self._dir)
+            with open(os.path.join(self._dir, self._get_file_name(name, args)), 'w') as f:
+                json.dump({'name': name, 'args': args, 'values': values, 'fetched_on': time.time()}, f)
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to save the completion cache '%s': %s", self._dir, ex)
+
+    def _refresh_in_background(self, lists):
+        import subprocess
+        lock_path = os.path.join(self._dir, _REFRESH_LOCK_FILE_NAME)
+        try:
+            if time.time() - os.path.getmtime(lock_path) < _REFRESH_TIMEOUT:
+                return
+        except (IOError, OSError):
+            pass
+        try:
+            if not os.path.isdir(self._dir):
+                os.makedirs(self._dir)
+            with open(lock_path, 'w') as f:
+                f.write(str(os.getpid()))
+            kwargs = {'args': [sys.executable, '-m', __name__, json.dumps(lists)]}
+            if os.name == 'nt':
+                kwargs['creationflags'] = 0x00000008  # DETACHED_PROCESS
+            else:
+                # the shell reads the completions until all the processes holding its pipe exit
+                kwargs['close_fds'] = True
+            with open(os.devnull, 'r+') as devnull:
+                subprocess.Popen(stdin=devnull, stdout=devnull, stderr=devnull, **kwargs)
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to refresh the completion cache in the background: %s", ex)
+
+    def refresh(self, name, *args):
+        """ Fetch a list from ARM and save it in the cache. """
+        args = list(args)
+        values = _LISTS[name](self.cli_ctx, *args)
+        if self.enabled:
+            self._write(name, args, values)
+        return values
+
+    def get(self, name, *args):
+        """
+        The values of a list, from the cache if possible.
+
+        :param name: The name of the list: 'locations', 'resourceGroups' or 'resources'.
+        :param args: The arguments of the list, e.g. the resource group and the resource type of 'resources'.
+        """
+        if not self.enabled:
+            return self.refresh(name, *args)
+        args = list(args)
+        entry = self._read(name, args)
+        age = time.time() - entry['fetched_on'] if entry else None
+        if entry and age < self.ttl:
+            return entry['values']
+        if entry and age < self.ttl + MAX_STALENESS:
+            self._refresh_in_background([[name, args]])
+            return entry['values']
+        values = self.refresh(name, *args)
+        missing = [[n, a] for n, a in _PREFETCHED_LISTS if [n, a] != [name, args] and not self._read(n, a)]
+        if missing:
+            self._refresh_in_background(missing)
+        return values
+
+
+def main(args):
+    from azure.cli.core import get_default_cli
+    cache = CompletionCache(get_default_cli())
+    if not cache.enabled:
+        return 0
+    try:
+        for name, list_args in json.loads(args[0]):
+            try:
+                cache.refresh(name, *list_args)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to refresh the completion cache of '%s'.", name, exc_info=True)
+    finally:
+        try:
+            os.remove(os.path.join(cache._dir, _REFRESH_LOCK_FILE_NAME))  # pylint: disable=protected-access
+        except (IOError, OSError):
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -7,6 +7,7 @@ from __future__ import print_function
 
 from knack.help import (HelpExample,
                         HelpFile as KnackHelpFile,
+                        GroupHelpFile as KnackGroupHelpFile,
                         CommandHelpFile as KnackCommandHelpFile,
                         CLIHelp,
                         ArgumentGroupRegistry as KnackArgumentGroupRegistry)
@@ -51,8 +52,10 @@ class AzCliHelp(CLIHelp):
         super(AzCliHelp, self).__init__(cli_ctx,
                                         privacy_statement=PRIVACY_STATEMENT,
                                         welcome_message=WELCOME_MESSAGE,
+                                        group_help_cls=CliGroupHelpFile,
                                         command_help_cls=CliCommandHelpFile,
                                         help_cls=CliHelpFile)
+        self._help_index = None
         from knack.help import HelpObject
 
         # TODO: This workaround is used to avoid a bizarre bug in Python 2.7. It
@@ -83,6 +86,23 @@ class AzCliHelp(CLIHelp):
         AzCliHelp._print_extensions_msg(help_file)
         super(AzCliHelp, self)._print_detailed_help(cli_name, help_file)
 
+    def get_help_text(self, name):
+        """
+        The YAML help of a command or group.
+
+        Help registered in `knack.help_files.helps`, e.g. by extensions, takes precedence over the help of the command
+        modules, which is read from the help index.
+
+        :param name: The name of the command or group, e.g. 'vm create'.
+        """
+        from knack.help_files import helps
+        if name in helps:
+            return helps[name]
+        if self._help_index is None:
+            from azure.cli.core._help_index import HelpIndex
+            self._help_index = HelpIndex(self.cli_ctx)
+        return self._help_index.get(name)
+
 
 class CliHelpFile(KnackHelpFile):
 
@@ -98,6 +118,16 @@ class CliHelpFile(KnackHelpFile):
                                          min_api=min_profile, max_api=max_profile)
         return True
 
+    def _load_from_file(self):
+        import yaml
+        get_help_text = getattr(self.help_ctx, 'get_help_text', None)
+        if not get_help_text:
+            super(CliHelpFile, self)._load_from_file()
+            return
+        text = get_help_text(self.delimiters)
+        if text:
+            self._load_from_data(yaml.load(text))
+
     # Needs to override base implementation
     def _load_from_data(self, data):
         super(CliHelpFile, self)._load_from_data(data)
@@ -109,6 +139,10 @@ class CliHelpFile(KnackHelpFile):
                     self.examples.append(HelpExample(d))
 
 
+class CliGroupHelpFile(KnackGroupHelpFile, CliHelpFile):
+    pass
+
+
 class CliCommandHelpFile(KnackCommandHelpFile, CliHelpFile):
 
     def __init__(self, help_ctx, delimiters, parser):
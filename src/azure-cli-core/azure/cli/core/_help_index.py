@@ -0,0 +1,179 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Precompiled index of the YAML help of the command modules.
+
+The `_help.py` files of the command modules register the help of thousands of commands and groups in
+`knack.help_files.helps`. Rather than importing all of them on every invocation, they are compiled into a single
+file the first time help is requested, and only the entries which are shown are read from it afterwards.
+
+The file starts with a line of JSON holding the version stamp of the index and the offset and length of the help of
+each command or group, followed by the UTF-8 encoded help texts. The index is compiled again when the CLI version
+changes or a `_help.py` file is added, removed or modified.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+HELP_INDEX_FILE_NAME = 'helpIndex.dat'
+
+_COMMAND_MODULES_PACKAGE = 'azure.cli.command_modules'
+
+
+def _get_help_modules():
+    """ The names and `_help.py` paths of the installed command modules which have one. """
+    from importlib import import_module
+    import pkgutil
+    from azure.cli.core.commands import BLACKLISTED_MODS
+
+    try:
+        mods_ns_pkg = import_module(_COMMAND_MODULES_PACKAGE)
+    except ImportError:
+        return []
+    help_modules = []
+    for finder, modname, _ in pkgutil.iter_modules(mods_ns_pkg.__path__):
+        help_path = os.path.join(getattr(finder, 'path', ''), modname, '_help.py')
+        if modname not in BLACKLISTED_MODS and os.path.isfile(help_path):
+            help_modules.append((modname, help_path))
+    return sorted(help_modules)
+
+
+def _compile_help(modules):
+    """ Import the `_help.py` files of the command modules and collect the help they register. """
+    from importlib import import_module
+    from six.moves import reload_module  # pylint: disable=import-error
+    from knack.help_files import helps
+
+    registered = dict(helps)
+    helps.clear()
+    try:
+        for modname in modules:
+            name = '{}.{}._help'.format(_COMMAND_MODULES_PACKAGE, modname)
+            try:
+                if name in sys.modules:
+                    reload_module(sys.modules[name])
+                else:
+                    import_module(name)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Failed to load the help of command module '%s'.", modname, exc_info=True)
+        return dict(helps)
+    finally:
+        helps.clear()
+        helps.update(registered)
+
+
+class HelpIndex(object):
+    """
+    Reads the help of single commands and groups from the compiled help of the command modules.
+
+    The index is stored in `helpIndex.dat` under the config directory. Setting `use_help_index` in the [core] section
+    of the configuration to false compiles the help in memory when it's requested instead.
+    """
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core import __version__
+        self.version = __version__
+        self.enabled = cli_ctx.config.getboolean('core', 'use_help_index', fallback=True)
+        self.path = os.path.join(cli_ctx.config.config_dir, HELP_INDEX_FILE_NAME)
+        self._entries = None
+        self._data_offset = None
+        self._texts = None
+
+    def _get_stamp(self, help_modules):
+        return [self.version] + ['{}@{}'.format(modname, os.path.getmtime(path)) for modname, path in help_modules]
+
+    def _read_header(self, stamp):
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline().decode('utf-8'))
+                data_offset = f.tell()
+        except (IOError, OSError, ValueError):
+            return False
+        if not isinstance(header, dict) or header.get('stamp') != stamp:
+            return False
+        self._entries = header.get('entries') or {}
+        self._data_offset = data_offset
+        return True
+
+    def _write(self, stamp, texts):
+        entries = {}
+        chunks = []
+        offset = 0
+        for name in sorted(texts):
+            chunk = texts[name].encode('utf-8')
+            entries[name] = [offset, len(chunk)]
+            chunks.append(chunk)
+            offset += len(chunk)
+        header = json.dumps({'stamp': stamp, 'entries': entries}, separators=(',', ':'))
+        # write a temporary file and replace the index with it, so that other processes never read a partial index
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=HELP_INDEX_FILE_NAME + '.', dir=os.path.dirname(self.path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header.encode('utf-8') + b'\n')
+                for chunk in chunks:
+                    f.write(chunk)
+            getattr(os, 'replace', os.rename)(temp_path, self.path)
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to save the help index '%s': %s", self.path, ex)
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _load(self):
+        if self._entries is not None or self._texts is not None:
+            return
+        help_modules = _get_help_modules()
+        stamp = self._get_stamp(help_modules)
+        if self.enabled and self._read_header(stamp):
+            return
+        logger.debug("Help index is missing or out of date. Compiling the help of %s command modules.",
+                     len(help_modules))
+        self._texts = _compile_help([modname for modname, _ in help_modules])
+        if self.enabled:
+            self._write(stamp, self._texts)
+
+    def get(self, name):
+        """
+        The YAML help of a command or group.
+
+        :param name: The name of the command or group, e.g. 'vm create'.
+        :return: The help text, or None if the command modules don't provide help for it.
+        """
+        self._load()
+        if self._texts is not None:
+            return self._texts.get(name)
+        entry = self._entries.get(name)
+        if not entry:
+            return None
+        offset, length = entry
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._data_offset + offset)
+                return f.read(length).decode('utf-8')
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to read the help index '%s': %s", self.path, ex)
+            return None
+
+    def get_all(self):
+        """ The YAML help of all the commands and groups of the command modules, by name. """
+        self._load()
+        if self._texts is not None:
+            return dict(self._texts)
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._data_offset)
+                data = f.read()
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to read the help index '%s': %s", self.path, ex)
+            return {}
+        return {name: data[offset:offset + length].decode('utf-8')
+                for name, (offset, length) in self._entries.items()}
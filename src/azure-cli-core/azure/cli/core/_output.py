@@ -5,6 +5,8 @@
 
 import knack.output
 
+from azure.cli.core._startup_profiler import startup_profiler
+
 
 class AzOutputProducer(knack.output.OutputProducer):
     def __init__(self, cli_ctx=None):
@@ -24,6 +26,10 @@ class AzOutputProducer(knack.output.OutputProducer):
     def format_none(_):
         return ""
 
+    def out(self, obj, formatter=None, out_file=None):
+        with startup_profiler.phase('format output'):
+            super(AzOutputProducer, self).out(obj, formatter=formatter, out_file=out_file)
+
     def check_valid_format_type(self, format_type):
         return format_type in self._FORMAT_DICT
 
@@ -6,11 +6,13 @@
 from __future__ import print_function
 
 import collections
+import datetime
 import errno
 import json
 import os
 import os.path
 import re
+import threading
 from copy import deepcopy
 from enum import Enum
 from six.moves import BaseHTTPServer
@@ -50,6 +52,7 @@ _SERVICE_PRINCIPAL_CERT_THUMBPRINT = 'thumbprint'
 _SERVICE_PRINCIPAL_CERT_SN_ISSUER_AUTH = 'useCertSNIssuerAuth'
 _TOKEN_ENTRY_USER_ID = 'userId'
 _TOKEN_ENTRY_TOKEN_TYPE = 'tokenType'
+_TOKEN_ENTRY_EXPIRES_ON = 'expiresOn'
 # This could mean either real access token, or client secret of a service principal
 # This naming is no good, but can't change because xplat-cli does so.
 _ACCESS_TOKEN = 'accessToken'
@@ -65,6 +68,10 @@ _COMMON_TENANT = 'common'
 
 _TENANT_LEVEL_ACCOUNT_NAME = 'N/A(tenant level account)'
 
+# Tokens are served from memory until they are this close to expiring, in line with the expiration buffer ADAL uses
+# to refresh cached tokens.
+_TOKEN_REFRESH_BUFFER = datetime.timedelta(minutes=5)
+
 _SYSTEM_ASSIGNED_IDENTITY = 'systemAssignedIdentity'
 _USER_ASSIGNED_IDENTITY = 'userAssignedIdentity'
 _ASSIGNED_IDENTITY_INFO = 'assignedIdentityInfo'
@@ -852,6 +859,9 @@ class CredsCache(object):
         self._should_flush_to_disk = False
         self._async_persist = async_persist
         self._ctx = cli_ctx
+        # (user or service principal, tenant, resource) => token retrieved earlier in this process
+        self._token_memory_cache = {}
+        self._token_memory_cache_lock = threading.RLock()
         if async_persist:
             import atexit
             atexit.register(self.flush_to_disk)
@@ -877,7 +887,30 @@ class CredsCache(object):
                 all_creds.extend(self._service_principal_creds)
                 cred_file.write(json.dumps(all_creds))
 
+    def _retrieve_token_from_memory(self, key, retrieve_func):
+        """
+        Serve a token retrieved earlier in this process while it is valid, or retrieve (and remember) a new one.
+
+        Tokens are retrieved under a lock, so that concurrent requests, e.g. when running a command for multiple
+        --ids, retrieve each token once instead of all refreshing it at the same time.
+        """
+        with self._token_memory_cache_lock:
+            creds = self._token_memory_cache.get(key)
+            if creds and _is_token_fresh(creds[2]):
+                return creds
+            creds = retrieve_func()
+            self._token_memory_cache[key] = creds
+            return creds
+
+    def _clear_token_memory_cache(self):
+        with self._token_memory_cache_lock:
+            self._token_memory_cache.clear()
+
     def retrieve_token_for_user(self, username, tenant, resource):
+        return self._retrieve_token_from_memory((_USER, username, tenant, resource),
+                                                lambda: self._retrieve_token_for_user(username, tenant, resource))
+
+    def _retrieve_token_for_user(self, username, tenant, resource):
         context = self._auth_ctx_factory(self._ctx, tenant, cache=self.adal_token_cache)
         token_entry = context.acquire_token(resource, username, _CLIENT_ID)
         if not token_entry:
@@ -889,6 +922,11 @@ class CredsCache(object):
         return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
 
     def retrieve_token_for_service_principal(self, sp_id, resource, tenant, use_cert_sn_issuer=False):
+        return self._retrieve_token_from_memory(
+            (_SERVICE_PRINCIPAL, sp_id, tenant, resource, bool(use_cert_sn_issuer)),
+            lambda: self._retrieve_token_for_service_principal(sp_id, resource, tenant, use_cert_sn_issuer))
+
+    def _retrieve_token_for_service_principal(self, sp_id, resource, tenant, use_cert_sn_issuer=False):
         self.load_adal_token_cache()
         matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID] and
                    tenant == x[_SERVICE_PRINCIPAL_TENANT]]
@@ -941,6 +979,7 @@ class CredsCache(object):
             state_changed = True
 
         if state_changed:
+            self._clear_token_memory_cache()
             self.persist_cached_creds()
 
     def _load_service_principal_creds(self, creds):
@@ -950,6 +989,7 @@ class CredsCache(object):
         return self._service_principal_creds
 
     def remove_cached_creds(self, user_or_sp):
+        self._clear_token_memory_cache()
         state_changed = False
         # clear AAD tokens
         tokens = self.adal_token_cache.find({_TOKEN_ENTRY_USER_ID: user_or_sp})
@@ -969,10 +1009,28 @@ class CredsCache(object):
             self.persist_cached_creds()
 
     def remove_all_cached_creds(self):
+        self._clear_token_memory_cache()
         # we can clear file contents, but deleting it is simpler
         _delete_file(self._token_file)
 
 
+def _is_token_fresh(token_entry):
+    """ Whether a token entry is valid for longer than the refresh buffer. """
+    expires_on = (token_entry or {}).get(_TOKEN_ENTRY_EXPIRES_ON)
+    if not isinstance(expires_on, datetime.datetime):
+        expires_on = str(expires_on)
+        for date_format in ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S'):
+            try:
+                expires_on = datetime.datetime.strptime(expires_on, date_format)
+                break
+            except ValueError:
+                pass
+        else:
+            return False
+    # ADAL reports the expiration time as local time
+    return expires_on - _TOKEN_REFRESH_BUFFER > datetime.datetime.now()
+
+
 class ServicePrincipalAuth(object):
 
     def __init__(self, password_arg_value, use_cert_sn_issuer=None):
@@ -1103,7 +1161,6 @@ def _get_authorization_code_worker(authority_url, resource, results):
 
 
 def _get_authorization_code(resource, authority_url):
-    import threading
     import time
     results = {}
     t = threading.Thread(target=_get_authorization_code_worker,
@@ -104,3 +104,6 @@ CONFIG = Session()
 
 # SESSION provides read-write session variables
 SESSION = Session()
+
+# INDEX contains {top-level command: [command_modules and extensions]} mapping index
+INDEX = Session()
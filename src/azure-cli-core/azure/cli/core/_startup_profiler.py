@@ -0,0 +1,215 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Start-up profiler of the CLI.
+
+When enabled with `--profile-startup` or the AZURE_CLI_PROFILE_STARTUP environment variable, the profiler records a
+timeline of the phases of an invocation (loading the command modules, loading arguments, building the parser, running
+the command, ...) together with the time spent importing each module, and writes it as JSON or in the Chrome trace
+event format (chrome://tracing) when the process exits.
+
+AZURE_CLI_PROFILE_STARTUP can be set to `true` to write the report to stderr or to the path of the file to write it to.
+AZURE_CLI_PROFILE_STARTUP_FORMAT selects the format of the report: `json` (default) or `chrome`.
+
+This module is imported before anything else by `azure.cli.core` so that the imports of the CLI can be timed, so it
+must not import anything beyond the Python Standard Library.
+"""
+
+from __future__ import print_function
+
+from contextlib import contextmanager
+import os
+import sys
+import threading
+import timeit
+
+PROFILE_STARTUP_FLAG = '--profile-startup'
+PROFILE_STARTUP_ENV_VAR = 'AZURE_CLI_PROFILE_STARTUP'
+PROFILE_STARTUP_FORMAT_ENV_VAR = 'AZURE_CLI_PROFILE_STARTUP_FORMAT'
+REPORT_FORMATS = ['json', 'chrome']
+
+_TRUE_VALUES = ['1', 'true', 'yes', 'on']
+_FALSE_VALUES = ['', '0', 'false', 'no', 'off']
+_TOP_IMPORTS = 50
+
+
+def _get_process_age():
+    """ Seconds since the process was started, which includes the start-up of the interpreter. Linux only. """
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            # the fields following the executable name, starting with the 3rd field; starttime is the 22nd
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return max(uptime - float(start_ticks) / os.sysconf('SC_CLK_TCK'), 0.0)
+    except (OSError, IOError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfiler(object):  # pylint: disable=too-many-instance-attributes
+    """ Records the phases and imports of an invocation. Disabled profilers record nothing. """
+
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self.output_format = 'json'
+        self.metadata = {}
+        self.phases = []
+        self.imports = []
+        self._origin = None
+        self._process_age = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self, output=None, output_format='json'):
+        """
+        Start recording and write the report when the process exits.
+
+        :param output: The path of the file to write the report to. None for stderr.
+        :param output_format: 'json' or 'chrome'.
+        """
+        import atexit
+
+        if self.enabled:
+            return
+        self.enabled = True
+        self.output = output
+        self.output_format = output_format if output_format in REPORT_FORMATS else 'json'
+        self._origin = timeit.default_timer()
+        self._process_age = _get_process_age()
+        self._install_import_hooks()
+        atexit.register(self.write)
+
+    def _install_import_hooks(self):
+        import importlib
+        try:
+            import builtins
+        except ImportError:
+            import __builtin__ as builtins  # pylint: disable=import-error
+
+        original_import = builtins.__import__
+        original_import_module = importlib.import_module
+
+        # pylint: disable=redefined-builtin
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            module_name = name
+            if level and globals:
+                package = (globals.get('__package__') or '').split('.')
+                base = '.'.join(package[:len(package) - level + 1])
+                module_name = '{}.{}'.format(base, name) if name else base
+            return self._time_import(module_name, original_import, name, globals, locals, fromlist, level)
+
+        def _timed_import_module(name, package=None):
+            return self._time_import(name, original_import_module, name, package)
+
+        builtins.__import__ = _timed_import
+        importlib.import_module = _timed_import_module
+
+    def _time_import(self, name, import_func, *args):
+        stack = self._local.__dict__.setdefault('stack', [])
+        modules_before = len(sys.modules)
+        stack.append(0.0)
+        start = timeit.default_timer()
+        try:
+            return import_func(*args)
+        finally:
+            duration = timeit.default_timer() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += duration
+            if len(sys.modules) > modules_before:
+                with self._lock:
+                    self.imports.append((name, start - self._origin, duration, duration - nested,
+                                         threading.current_thread().name))
+
+    @contextmanager
+    def phase(self, name, **kwargs):
+        """ Record the time spent in the body of the `with` statement as a phase of the invocation. """
+        if not self.enabled:
+            yield
+            return
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            duration = timeit.default_timer() - start
+            with self._lock:
+                self.phases.append((name, start - self._origin, duration, kwargs, threading.current_thread().name))
+
+    def annotate(self, **kwargs):
+        """ Add information about the invocation, such as the command name, to the report. """
+        if self.enabled:
+            self.metadata.update(kwargs)
+
+    def get_report(self):
+        """ The phases and the most expensive imports, with times in milliseconds relative to the profiler start. """
+        def _ms(seconds):
+            return round(seconds * 1000, 3)
+
+        phases = []
+        process_age = self._process_age
+        if process_age is not None:
+            phases.append({'name': 'interpreter start', 'start': -_ms(process_age), 'duration': _ms(process_age)})
+        phases.extend({'name': name, 'start': _ms(start), 'duration': _ms(duration), 'args': args}
+                      for name, start, duration, args, _ in sorted(self.phases, key=lambda p: p[1]))
+        imports = sorted(self.imports, key=lambda i: i[3], reverse=True)[:_TOP_IMPORTS]
+        return {
+            'metadata': self.metadata,
+            'totalTime': _ms(timeit.default_timer() - self._origin + (process_age or 0)),
+            'phases': phases,
+            'imports': [{'module': name, 'start': _ms(start), 'cumulative': _ms(duration), 'self': _ms(self_time)}
+                        for name, start, duration, self_time, _ in imports]
+        }
+
+    def get_chrome_trace(self):
+        """ All phases and imports in the trace event format of chrome://tracing. """
+        pid = os.getpid()
+        offset = self._process_age or 0
+
+        def _event(name, category, start, duration, thread, args=None):
+            return {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': '{} ({})'.format(thread, category),
+                    'ts': round((start + offset) * 1e6), 'dur': round(duration * 1e6), 'args': args or {}}
+
+        events = []
+        if self._process_age is not None:
+            events.append(_event('interpreter start', 'phase', -offset, offset, 'MainThread'))
+        events.extend(_event(name, 'phase', start, duration, thread, args)
+                      for name, start, duration, args, thread in self.phases)
+        events.extend(_event(name, 'import', start, duration, thread, {'self': round(self_time * 1e6)})
+                      for name, start, duration, self_time, thread in self.imports)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms', 'otherData': self.metadata}
+
+    def write(self):
+        import json
+
+        if not self.enabled:
+            return
+        report = self.get_chrome_trace() if self.output_format == 'chrome' else self.get_report()
+        if self.output:
+            with open(self.output, 'w') as f:
+                json.dump(report, f, indent=2)
+        else:
+            sys.stderr.write(json.dumps(report, indent=2) + '\n')
+
+
+def register_global_profile_startup_argument(cli_ctx):
+    """ Accept `--profile-startup` on every command. It is handled before the arguments are parsed. """
+    import argparse
+    import knack.events as events
+
+    def add_profile_startup_parameter(_, **kwargs):
+        kwargs['arg_group'].add_argument(PROFILE_STARTUP_FLAG, dest='_profile_startup', action='store_true',
+                                         help=argparse.SUPPRESS)
+
+    cli_ctx.register_event(events.EVENT_PARSER_GLOBAL_CREATE, add_profile_startup_parameter)
+
+
+startup_profiler = StartupProfiler()
+
+_env_value = os.environ.get(PROFILE_STARTUP_ENV_VAR, '')
+if PROFILE_STARTUP_FLAG in sys.argv[1:] or _env_value.lower() not in _FALSE_VALUES:
+    startup_profiler.start(output=None if _env_value.lower() in _TRUE_VALUES + _FALSE_VALUES else _env_value,
+                           output_format=os.environ.get(PROFILE_STARTUP_FORMAT_ENV_VAR, 'json').lower())
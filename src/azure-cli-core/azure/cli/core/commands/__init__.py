@@ -3,13 +3,17 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+# pylint: disable=too-many-lines
+
 from __future__ import print_function
 
 import datetime
 import json
 import logging as logs
 import os
+import random
 import sys
+import threading
 import time
 import copy
 from importlib import import_module
@@ -30,11 +34,56 @@ from azure.cli.core.commands.constants import (
 from azure.cli.core.commands.parameters import (
     AzArgumentContext, patch_arg_make_required, patch_arg_make_optional)
 from azure.cli.core.extension import get_extension
+from azure.cli.core._startup_profiler import startup_profiler
 from azure.cli.core.util import get_command_type_kwarg, read_file_content, get_arg_list, poller_classes
 import azure.cli.core.telemetry as telemetry
 
 logger = get_logger(__name__)
 
+DEFAULT_MAX_CONCURRENCY = 10
+
+_THROTTLING_MAX_RETRIES = 5
+_THROTTLING_BASE_DELAY = 2
+_THROTTLING_MAX_DELAY = 60
+
+
+def _get_throttling_retry_after(ex):
+    """ Seconds to wait before retrying a request rejected with 429 (Too Many Requests), 0 if the response
+    doesn't say, or None if the exception isn't caused by throttling. """
+    response = getattr(ex, 'response', None)
+    if getattr(response, 'status_code', None) != 429:
+        return None
+    try:
+        return max(float(response.headers.get('Retry-After')), 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+class _ThrottlingBackoff(object):
+    """ Shared by the jobs of an invocation, so that all of them hold off once ARM starts throttling requests. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._not_before = 0
+
+    def wait(self):
+        delay = self._not_before - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, attempt, retry_after=0):
+        """
+        Hold off all jobs and return the number of seconds to wait before the next attempt.
+
+        :param attempt: The number of the retry, starting at 1.
+        :param retry_after: The delay requested by the service. 0 for an exponential backoff.
+        """
+        delay = retry_after or \
+            min(_THROTTLING_BASE_DELAY * 2 ** (attempt - 1), _THROTTLING_MAX_DELAY) * random.uniform(1, 1.5)
+        with self._lock:
+            self._not_before = max(self._not_before, time.time() + delay)
+        return delay
+
 
 def _explode_list_args(args):
     '''Iterate through each attribute member of args and create a copy with
@@ -205,12 +254,17 @@ class AzCliCommandInvoker(CommandInvoker):
         args = _pre_command_table_create(self.cli_ctx, args)
 
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_CREATE, args=args)
-        self.commands_loader.load_command_table(args)
+        with startup_profiler.phase('load command table'):
+            self.commands_loader.load_command_table(args)
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE,
                                  load_cmd_tbl_func=self.commands_loader.load_command_table, args=args)
+        if self.cli_ctx.data['completer_active']:
+            from azure.cli.core._completion import record_commands
+            record_commands(self.cli_ctx, self.commands_loader, args)
         command = self._rudimentary_get_command(args)
         self.cli_ctx.invocation.data['command_string'] = command
         telemetry.set_raw_command_name(command)
+        startup_profiler.annotate(command=command)
 
         try:
             self.commands_loader.command_table = {command: self.commands_loader.command_table[command]}
@@ -248,10 +302,12 @@ class AzCliCommandInvoker(CommandInvoker):
 
         self.commands_loader.command_table = self.commands_loader.command_table  # update with the truncated table
         self.commands_loader.command_name = command
-        self.commands_loader.load_arguments(command)
-        self.cli_ctx.raise_event(EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=self.commands_loader)
-        self.parser.cli_ctx = self.cli_ctx
-        self.parser.load_command_table(self.commands_loader)
+        with startup_profiler.phase('load arguments', command=command):
+            self.commands_loader.load_arguments(command)
+            self.cli_ctx.raise_event(EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=self.commands_loader)
+        with startup_profiler.phase('build parser'):
+            self.parser.cli_ctx = self.cli_ctx
+            self.parser.load_command_table(self.commands_loader)
 
         self.cli_ctx.raise_event(EVENT_INVOKER_CMD_TBL_LOADED, cmd_tbl=self.commands_loader.command_table,
                                  parser=self.parser)
@@ -272,9 +328,10 @@ class AzCliCommandInvoker(CommandInvoker):
 
         self.parser.enable_autocomplete()
 
-        self.cli_ctx.raise_event(EVENT_INVOKER_PRE_PARSE_ARGS, args=args)
-        parsed_args = self.parser.parse_args(args)
-        self.cli_ctx.raise_event(EVENT_INVOKER_POST_PARSE_ARGS, command=parsed_args.command, args=parsed_args)
+        with startup_profiler.phase('parse arguments'):
+            self.cli_ctx.raise_event(EVENT_INVOKER_PRE_PARSE_ARGS, args=args)
+            parsed_args = self.parser.parse_args(args)
+            self.cli_ctx.raise_event(EVENT_INVOKER_POST_PARSE_ARGS, command=parsed_args.command, args=parsed_args)
 
         # TODO: This fundamentally alters the way Knack.invocation works here. Cannot be customized
         # with an event. Would need to be customized via inheritance.
@@ -307,7 +364,8 @@ class AzCliCommandInvoker(CommandInvoker):
         for expanded_arg in _explode_list_args(parsed_args):
             cmd_copy = copy.copy(cmd)
             cmd_copy.cli_ctx = copy.copy(cmd.cli_ctx)
-            cmd_copy.cli_ctx.data = copy.deepcopy(cmd.cli_ctx.data)
+            # jobs only set top-level entries, such as the subscription, so a shallow copy keeps them apart
+            cmd_copy.cli_ctx.data = dict(cmd.cli_ctx.data)
             expanded_arg.cmd = expanded_arg._cmd = cmd_copy
 
             if hasattr(expanded_arg, '_subscription'):
@@ -317,10 +375,23 @@ class AzCliCommandInvoker(CommandInvoker):
             jobs.append((expanded_arg, cmd_copy))
 
         ids = getattr(parsed_args, '_ids', None) or [None] * len(jobs)
-        if self.cli_ctx.config.getboolean('core', 'disable_concurrent_ids', False) or len(ids) < 2:
-            results, exceptions = self._run_jobs_serially(jobs, ids)
-        else:
-            results, exceptions = self._run_jobs_concurrently(jobs, ids)
+        max_parallel = getattr(parsed_args, '_max_parallel', None) or \
+            self.cli_ctx.config.getint('core', 'max_concurrency', fallback=DEFAULT_MAX_CONCURRENCY)
+        if max_parallel < 1:
+            raise CLIError('The maximum number of parallel operations must be a positive integer.')
+        table_transformer = self.commands_loader.command_table[parsed_args.command].table_transformer
+        stream_results = getattr(parsed_args, '_stream_results', False) and len(jobs) > 1
+
+        def _output_result(result):
+            self._output_result(result, table_transformer)
+
+        on_result = _output_result if stream_results else None
+        with startup_profiler.phase('run command', jobs=len(jobs)):
+            if self.cli_ctx.config.getboolean('core', 'disable_concurrent_ids', False) or len(ids) < 2 or \
+                    max_parallel < 2:
+                results, exceptions = self._run_jobs_serially(jobs, ids, on_result)
+            else:
+                results, exceptions = self._run_jobs_concurrently(jobs, ids, max_parallel, on_result)
 
         # handle exceptions
         if len(exceptions) == 1 and not results:
@@ -333,6 +404,10 @@ class AzCliCommandInvoker(CommandInvoker):
                 return CommandResultItem(None, exit_code=1, error=CLIError('Encountered more than one exception.'))
             logger.warning('Encountered more than one exception.')
 
+        if stream_results:
+            # the results have been written as they completed
+            return CommandResultItem(None, exit_code=1 if exceptions else 0)
+
         if results and len(results) == 1:
             results = results[0]
 
@@ -341,19 +416,32 @@ class AzCliCommandInvoker(CommandInvoker):
 
         return CommandResultItem(
             event_data['result'],
-            table_transformer=self.commands_loader.command_table[parsed_args.command].table_transformer,
+            table_transformer=table_transformer,
             is_query_active=self.data['query_active'])
 
+    def _output_result(self, result, table_transformer):
+        """ Write the result of a single job, used to stream the results of commands run against multiple IDs. """
+        from knack.events import EVENT_INVOKER_FILTER_RESULT
+        event_data = {'result': result}
+        self.cli_ctx.raise_event(EVENT_INVOKER_FILTER_RESULT, event_data=event_data)
+        if event_data['result'] is None:
+            return
+        output = self.cli_ctx.output
+        output.out(CommandResultItem(event_data['result'], table_transformer=table_transformer,
+                                     is_query_active=self.data['query_active']),
+                   formatter=output.get_formatter(self.data['output']), out_file=self.cli_ctx.out_file)
+        self.cli_ctx.out_file.flush()
+
     @staticmethod
     def _extract_parameter_names(args):
         # note: name start with more than 2 '-' will be treated as value e.g. certs in PEM format
         return [(p.split('=', 1)[0] if p.startswith('--') else p[:2]) for p in args if
                 (p.startswith('-') and not p.startswith('---') and len(p) > 1)]
 
-    def _run_job(self, expanded_arg, cmd_copy):
+    def _run_job(self, expanded_arg, cmd_copy, throttling=None):
         params = self._filter_params(expanded_arg)
         try:
-            result = cmd_copy(params)
+            result = self._invoke_with_backoff(cmd_copy, params, throttling) if throttling else cmd_copy(params)
             if cmd_copy.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
                 result = None
             elif cmd_copy.no_wait_param and getattr(expanded_arg, cmd_copy.no_wait_param, False):
@@ -378,27 +466,62 @@ class AzCliCommandInvoker(CommandInvoker):
                 return CommandResultItem(None, exit_code=1, error=ex)
             six.reraise(*sys.exc_info())
 
-    def _run_jobs_serially(self, jobs, ids):
+    @staticmethod
+    def _invoke_with_backoff(cmd_copy, params, throttling):
+        attempt = 0
+        while True:
+            throttling.wait()
+            try:
+                return cmd_copy(params)
+            except Exception as ex:  # pylint: disable=broad-except
+                retry_after = _get_throttling_retry_after(ex)
+                if retry_after is None or attempt >= _THROTTLING_MAX_RETRIES:
+                    raise
+                attempt += 1
+                delay = throttling.backoff(attempt, retry_after)
+                logger.warning("The request of '%s' was throttled. Retrying in %.0f seconds (%d/%d).",
+                               cmd_copy.name, delay, attempt, _THROTTLING_MAX_RETRIES)
+
+    def _run_jobs_serially(self, jobs, ids, on_result=None):
         results, exceptions = [], []
+        throttling = _ThrottlingBackoff()
         for job, id_arg in zip(jobs, ids):
             expanded_arg, cmd_copy = job
             try:
-                results.append(self._run_job(expanded_arg, cmd_copy))
+                result = self._run_job(expanded_arg, cmd_copy, throttling)
             except(Exception, SystemExit) as ex:  # pylint: disable=broad-except
                 exceptions.append((ex, id_arg))
+                continue
+            results.append(result)
+            if on_result:
+                on_result(result)
         return results, exceptions
 
-    def _run_jobs_concurrently(self, jobs, ids):
+    def _run_jobs_concurrently(self, jobs, ids, max_workers=DEFAULT_MAX_CONCURRENCY, on_result=None):
         from concurrent.futures import ThreadPoolExecutor, as_completed
-        tasks, results, exceptions = [], [], []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            for expanded_arg, cmd_copy in jobs:
-                tasks.append(executor.submit(self._run_job, expanded_arg, cmd_copy))
-            for index, task in enumerate(as_completed(tasks)):
-                try:
-                    results.append(task.result())
-                except (Exception, SystemExit) as ex:  # pylint: disable=broad-except
-                    exceptions.append((ex, ids[index]))
+        throttling = _ThrottlingBackoff()
+        outcomes = [None] * len(jobs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            tasks = {executor.submit(self._run_job, expanded_arg, cmd_copy, throttling): index
+                     for index, (expanded_arg, cmd_copy) in enumerate(jobs)}
+            try:
+                for task in as_completed(tasks):
+                    index = tasks[task]
+                    try:
+                        outcomes[index] = (task.result(), None)
+                    except (Exception, SystemExit) as ex:  # pylint: disable=broad-except
+                        outcomes[index] = (None, ex)
+                        continue
+                    if on_result:
+                        on_result(outcomes[index][0])
+            except BaseException:
+                # don't start the remaining jobs, e.g. on Ctrl+C
+                for task in tasks:
+                    task.cancel()
+                raise
+        # report the results and errors in the order of the IDs rather than in the order the jobs completed
+        results = [result for result, ex in outcomes if ex is None]
+        exceptions = [(ex, id_arg) for (_, ex), id_arg in zip(outcomes, ids) if ex is not None]
         return results, exceptions
 
     def resolve_warnings(self, cmd, parsed_args):
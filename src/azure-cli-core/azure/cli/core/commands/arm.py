@@ -177,53 +177,60 @@ def resource_exists(cli_ctx, resource_group, name, namespace, type, **_):  # pyl
 def register_ids_argument(cli_ctx):
 
     from knack import events
+    from azure.cli.core.commands.events import EVENT_PARSER_PRE_COMMAND_PARSER_CREATE
     from msrestazure.tools import parse_resource_id, is_valid_resource_id
 
     ids_metadata = {}
 
     def add_ids_arguments(_, **kwargs):  # pylint: disable=unused-argument
 
-        command_table = kwargs.get('commands_loader').command_table
+        command = kwargs['command']
 
-        if not command_table:
+        # Somewhat blunt hammer, but any create commands will not have an automatic id parameter
+        if command.name.split()[-1] == 'create':
             return
 
-        for command in command_table.values():
-
-            # Somewhat blunt hammer, but any create commands will not have an automatic id parameter
-            if command.name.split()[-1] == 'create':
-                continue
+        # the parser of a command may be built more than once, but each invocation has new command objects
+        if '_max_parallel' in command.arguments:
+            return
 
-            # Only commands with a resource name are candidates for an id parameter
-            id_parts = [a.type.settings.get('id_part') for a in command.arguments.values()]
-            if 'name' not in id_parts and 'resource_name' not in id_parts:
-                continue
+        # Only commands with a resource name are candidates for an id parameter
+        id_parts = [a.type.settings.get('id_part') for a in command.arguments.values()]
+        if 'name' not in id_parts and 'resource_name' not in id_parts:
+            return
 
-            group_name = 'Resource Id'
+        group_name = 'Resource Id'
 
-            # determine which arguments are required and optional and store in ids_metadata
-            ids_metadata[command.name] = {'required': [], 'optional': []}
-            for arg in [a for a in command.arguments.values() if a.type.settings.get('id_part')]:
-                if arg.options.get('required', False):
-                    ids_metadata[command.name]['required'].append(arg.name)
-                else:
-                    ids_metadata[command.name]['optional'].append(arg.name)
-                arg.required = False
-                arg.arg_group = group_name
-
-            # retrieve existing `ids` arg if it exists
-            id_arg = command.loader.argument_registry.arguments[command.name].get('ids', None)
-            deprecate_info = id_arg.settings.get('deprecate_info', None) if id_arg else None
-            id_kwargs = {
-                'metavar': 'ID',
-                'help': "One or more resource IDs (space-delimited). If provided, "
-                        "no other 'Resource Id' arguments should be specified.",
-                'dest': 'ids' if id_arg else '_ids',
-                'deprecate_info': deprecate_info,
-                'nargs': '+',
-                'arg_group': group_name
-            }
-            command.add_argument('ids', '--ids', **id_kwargs)
+        # determine which arguments are required and optional and store in ids_metadata
+        ids_metadata[command.name] = {'required': [], 'optional': []}
+        for arg in [a for a in command.arguments.values() if a.type.settings.get('id_part')]:
+            if arg.options.get('required', False):
+                ids_metadata[command.name]['required'].append(arg.name)
+            else:
+                ids_metadata[command.name]['optional'].append(arg.name)
+            arg.required = False
+            arg.arg_group = group_name
+
+        # retrieve existing `ids` arg if it exists
+        id_arg = command.loader.argument_registry.arguments[command.name].get('ids', None)
+        deprecate_info = id_arg.settings.get('deprecate_info', None) if id_arg else None
+        id_kwargs = {
+            'metavar': 'ID',
+            'help': "One or more resource IDs (space-delimited). If provided, "
+                    "no other 'Resource Id' arguments should be specified.",
+            'dest': 'ids' if id_arg else '_ids',
+            'deprecate_info': deprecate_info,
+            'nargs': '+',
+            'arg_group': group_name
+        }
+        command.add_argument('ids', '--ids', **id_kwargs)
+        command.add_argument('_max_parallel', '--max-parallel', type=int, metavar='N', arg_group=group_name,
+                             help='Maximum number of IDs to process in parallel. The default can be configured '
+                                  'with `max_concurrency` in the [core] section of the config file or the '
+                                  'AZURE_CORE_MAX_CONCURRENCY environment variable. Default: 10.')
+        command.add_argument('_stream_results', '--stream-results', action='store_true', arg_group=group_name,
+                             help='Output the result of each ID as soon as it is available, rather than a '
+                                  'single list once all IDs have been processed.')
 
     def parse_ids_arguments(_, command, args):
         namespace = args
@@ -316,19 +323,18 @@ def register_ids_argument(cli_ctx):
             else:
                 namespace._argument_deprecations.append(deprecate_info)  # pylint: disable=protected-access
 
-    cli_ctx.register_event(events.EVENT_INVOKER_POST_CMD_TBL_CREATE, add_ids_arguments)
+    cli_ctx.register_event(EVENT_PARSER_PRE_COMMAND_PARSER_CREATE, add_ids_arguments)
     cli_ctx.register_event(events.EVENT_INVOKER_POST_PARSE_ARGS, parse_ids_arguments)
 
 
 def register_global_subscription_argument(cli_ctx):
 
-    import knack.events as events
+    from azure.cli.core.commands.events import EVENT_PARSER_PRE_COMMAND_PARSER_CREATE
 
     def add_subscription_parameter(_, **kwargs):
         from azure.cli.core._completers import get_subscription_id_list
 
-        commands_loader = kwargs['commands_loader']
-        cmd_tbl = commands_loader.command_table
+        cmd = kwargs['command']
         subscription_kwargs = {
             'help': 'Name or ID of subscription. You can configure the default subscription '
                     'using `az account set -s NAME_OR_ID`',
@@ -337,11 +343,10 @@ def register_global_subscription_argument(cli_ctx):
             'configured_default': 'subscription',
             'id_part': 'subscription'
         }
-        for _, cmd in cmd_tbl.items():
-            if 'subscription' not in cmd.arguments:
-                cmd.add_argument('_subscription', '--subscription', **subscription_kwargs)
+        if 'subscription' not in cmd.arguments:
+            cmd.add_argument('_subscription', '--subscription', **subscription_kwargs)
 
-    cli_ctx.register_event(events.EVENT_INVOKER_POST_CMD_TBL_CREATE, add_subscription_parameter)
+    cli_ctx.register_event(EVENT_PARSER_PRE_COMMAND_PARSER_CREATE, add_subscription_parameter)
 
 
 add_usage = '--add property.listProperty <key=value, string or JSON string>'
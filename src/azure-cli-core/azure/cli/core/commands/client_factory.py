@@ -4,6 +4,8 @@
 # --------------------------------------------------------------------------------------------
 
 import os
+import threading
+import weakref
 
 from knack.log import get_logger
 from knack.util import CLIError
@@ -18,6 +20,55 @@ logger = get_logger(__name__)
 UA_AGENT = "AZURECLI/{}".format(core_version)
 ENV_ADDITIONAL_USER_AGENT = 'AZURE_HTTP_USER_AGENT'
 
+# invocation => _InvocationClientCache
+_invocation_client_caches = weakref.WeakKeyDictionary()
+_invocation_client_caches_lock = threading.Lock()
+
+
+class _InvocationClientCache(object):  # pylint: disable=too-few-public-methods
+    """
+    State shared by the management clients created during one invocation: the resolved credentials, and one pooled
+    HTTP session per thread so that clients reuse connections instead of opening (and handshaking) new ones.
+
+    Client instances themselves are not shared, as command modules customize the clients and operation groups they
+    get (e.g. by pinning the api_version of an operation group).
+    """
+
+    def __init__(self):
+        self.credentials = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def share_http_session(self, client):
+        try:
+            sender = client.config.pipeline._sender.driver  # pylint: disable=protected-access
+            session_mapping = sender._session_mapping  # pylint: disable=protected-access
+        except AttributeError:
+            # the client manages its own session
+            return
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            # the first session is initialized by the client with the common retry and redirect settings
+            self._local.session = sender.session
+        else:
+            session_mapping.session = session
+        # don't close the session after each request
+        client.config.keep_alive = True
+
+
+def _get_invocation_client_cache(cli_ctx):
+    invocation = getattr(cli_ctx, 'invocation', None)
+    if invocation is None:
+        return None
+    with _invocation_client_caches_lock:
+        try:
+            cache = _invocation_client_caches.get(invocation)
+            if cache is None:
+                cache = _invocation_client_caches[invocation] = _InvocationClientCache()
+        except TypeError:
+            return None
+    return cache
+
 
 def resolve_client_arg_name(operation, kwargs):
     if not isinstance(operation, str):
@@ -119,12 +170,11 @@ def _get_mgmt_service_client(cli_ctx,
                              sdk_profile=None,
                              aux_subscriptions=None,
                              **kwargs):
-    from azure.cli.core._profile import Profile
     logger.debug('Getting management service client client_type=%s', client_type.__name__)
     resource = resource or cli_ctx.cloud.endpoints.active_directory_resource_id
-    profile = Profile(cli_ctx=cli_ctx)
-    cred, subscription_id, _ = profile.get_login_credentials(subscription_id=subscription_id, resource=resource,
-                                                             aux_subscriptions=aux_subscriptions)
+    client_cache = _get_invocation_client_cache(cli_ctx)
+    cred, subscription_id = _get_login_credentials(cli_ctx, client_cache, subscription_id, resource,
+                                                   aux_subscriptions)
 
     client_kwargs = {}
     if base_url_bound:
@@ -142,10 +192,28 @@ def _get_mgmt_service_client(cli_ctx,
         client = client_type(cred, **client_kwargs)
 
     configure_common_settings(cli_ctx, client)
+    if client_cache:
+        client_cache.share_http_session(client)
 
     return client, subscription_id
 
 
+def _get_login_credentials(cli_ctx, client_cache, subscription_id, resource, aux_subscriptions):
+    from azure.cli.core._profile import Profile
+
+    key = (subscription_id, resource, tuple(aux_subscriptions or []))
+    if client_cache:
+        with client_cache.lock:
+            if key in client_cache.credentials:
+                return client_cache.credentials[key]
+    cred, resolved_subscription_id, _ = Profile(cli_ctx=cli_ctx).get_login_credentials(
+        subscription_id=subscription_id, resource=resource, aux_subscriptions=aux_subscriptions)
+    if client_cache:
+        with client_cache.lock:
+            client_cache.credentials[key] = (cred, resolved_subscription_id)
+    return cred, resolved_subscription_id
+
+
 def get_data_service_client(cli_ctx, service_type, account_name, account_key, connection_string=None,
                             sas_token=None, socket_timeout=None, token_credential=None, endpoint_suffix=None):
     logger.debug('Getting data service client service_type=%s', service_type.__name__)
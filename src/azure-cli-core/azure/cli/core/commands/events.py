@@ -5,6 +5,8 @@
 
 EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE = 'CommandInvoker.OnPreCommandTableTruncate'
 EVENT_INVOKER_ON_TAB_COMPLETION = 'CommandInvoker.OnTabCompletion'
+# raised with the command when the parser of a command is about to be built, which happens lazily when it's looked up
+EVENT_PARSER_PRE_COMMAND_PARSER_CREATE = 'CommandParser.OnPreCommandParserCreate'
 
 # special events used for Interactive and Alias extension communication
 EVENT_INTERACTIVE_PRE_COMPLETER_TEXT_PARSING = 'Interactive.PreCompleterTextParsing'
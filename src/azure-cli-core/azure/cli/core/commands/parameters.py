@@ -13,6 +13,7 @@ from knack.log import get_logger
 from knack.util import CLIError
 
 from azure.cli.core import EXCLUDED_PARAMS
+from azure.cli.core._argument_cache import track_argument_factory
 from azure.cli.core.commands.constants import CLI_PARAM_KWARGS, CLI_POSITIONAL_PARAM_KWARGS
 from azure.cli.core.commands.validators import validate_tag, validate_tags, generate_deployment_name
 from azure.cli.core.decorators import Completer
@@ -29,8 +30,8 @@ def get_subscription_locations(cli_ctx):
 
 @Completer
 def get_location_completion_list(cmd, prefix, namespace, **kwargs):  # pylint: disable=unused-argument
-    result = get_subscription_locations(cmd.cli_ctx)
-    return [l.name for l in result]
+    from azure.cli.core._completion_cache import CompletionCache
+    return CompletionCache(cmd.cli_ctx).get('locations')
 
 
 # pylint: disable=redefined-builtin
@@ -82,6 +83,8 @@ def get_datetime_type(help=None, date=True, time=True, timezone=True):
             iso_string = dt_val.isoformat()
             setattr(namespace, self.dest, iso_string)
 
+    track_argument_factory(DatetimeAction, get_datetime_type, kwargs={'help': help, 'date': date, 'time': time,
+                                                                      'timezone': timezone}, setting='action')
     return CLIArgumentType(action=DatetimeAction, nargs='+', help=help_string)
 
 
@@ -97,7 +100,7 @@ def get_location_name_type(cli_ctx):
             name = next((l.name for l in get_subscription_locations(cli_ctx)
                          if l.display_name.lower() == name.lower()), name)
         return name
-    return location_name_type
+    return track_argument_factory(location_name_type, get_location_name_type, args=[cli_ctx])
 
 
 def get_one_of_subscription_locations(cli_ctx):
@@ -115,8 +118,8 @@ def get_resource_groups(cli_ctx):
 
 @Completer
 def get_resource_group_completion_list(cmd, prefix, namespace, **kwargs):  # pylint: disable=unused-argument
-    result = get_resource_groups(cmd.cli_ctx)
-    return [l.name for l in result]
+    from azure.cli.core._completion_cache import CompletionCache
+    return CompletionCache(cmd.cli_ctx).get('resourceGroups')
 
 
 def get_resources_in_resource_group(cli_ctx, resource_group_name, resource_type=None):
@@ -141,12 +144,11 @@ def get_resource_name_completion_list(resource_type=None):
 
     @Completer
     def completer(cmd, prefix, namespace, **kwargs):  # pylint: disable=unused-argument
+        from azure.cli.core._completion_cache import CompletionCache
         rg = getattr(namespace, 'resource_group_name', None)
-        if rg:
-            return [r.name for r in get_resources_in_resource_group(cmd.cli_ctx, rg, resource_type=resource_type)]
-        return [r.name for r in get_resources_in_subscription(cmd.cli_ctx, resource_type)]
+        return CompletionCache(cmd.cli_ctx).get('resources', rg or None, resource_type)
 
-    return completer
+    return track_argument_factory(completer, get_resource_name_completion_list, args=[resource_type])
 
 
 def get_generic_completion_list(generic_list):
@@ -154,7 +156,7 @@ def get_generic_completion_list(generic_list):
     @Completer
     def completer(cmd, prefix, namespace, **kwargs):  # pylint: disable=unused-argument
         return generic_list
-    return completer
+    return track_argument_factory(completer, get_generic_completion_list, args=[generic_list])
 
 
 def get_three_state_flag(positive_label='true', negative_label='false', invert=False, return_label=False):
@@ -183,6 +185,8 @@ def get_three_state_flag(positive_label='true', negative_label='false', invert=F
                 set_val = is_positive
             setattr(namespace, self.dest, set_val)
 
+    track_argument_factory(ThreeStateAction, get_three_state_flag,
+                           args=[positive_label, negative_label, invert, return_label], setting='action')
     params = {
         'choices': CaseInsensitiveList(choices),
         'nargs': '?',
@@ -219,6 +223,7 @@ def get_enum_type(data, default=None):
     def _type(value):
         return next((x for x in choices if x.lower() == value.lower()), value) if value else value
 
+    track_argument_factory(DefaultAction, get_enum_type, args=[choices], setting='action')
     default_value = None
     if default:
         default_value = next((x for x in choices if x.lower() == default.lower()), None)
@@ -0,0 +1,401 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Long-lived `az` process which serves CLI invocations over a Unix domain socket.
+
+Most of the start-up time of the CLI is spent importing the CLI, its command modules and their dependencies. The daemon
+pays that cost once: it imports them when it starts and then forks a child process for every invocation forwarded to
+it. The child inherits the already imported modules, takes over the standard streams, working directory and environment
+of the client and runs the command in a new `AzCli` instance, so configuration, credentials and extensions are read
+afresh and no state is shared between invocations.
+
+The client side (`run_in_daemon`) only uses the Python Standard Library, so forwarding an invocation costs little more
+than starting the interpreter.
+"""
+
+from __future__ import print_function
+
+import array
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+
+DAEMON_SOCKET_FILE_NAME = 'daemon.sock'
+DAEMON_PID_FILE_NAME = 'daemon.pid'
+DAEMON_LOG_FILE_NAME = 'daemon.log'
+
+# Modules which (almost) every command needs, imported up front in addition to the command modules.
+_PRELOAD_MODULES = ['requests', 'adal', 'msrest', 'msrestazure', 'azure.cli.core._profile',
+                    'azure.cli.core.commands.client_factory', 'azure.cli.core.commands.arm']
+
+_STANDARD_STREAMS = (0, 1, 2)
+_HEADER = struct.Struct('!I')
+_POLL_INTERVAL = 0.5
+
+
+def is_daemon_supported():
+    """ The daemon passes file descriptors over Unix domain sockets, which requires a POSIX platform and Python 3. """
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket.socket, 'sendmsg') and hasattr(os, 'fork')
+
+
+def get_daemon_file_path(file_name, config_dir=None):
+    from azure.cli.core._environment import get_config_dir
+    return os.path.join(config_dir or get_config_dir(), file_name)
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError('Connection closed by peer.')
+        data += chunk
+    return data
+
+
+def send_request(sock, request, fds):
+    """ Send an invocation request along with the file descriptors of the standard streams of the client. """
+    payload = json.dumps(request).encode('utf-8')
+    sock.sendmsg([_HEADER.pack(len(payload))],
+                 [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))])
+    sock.sendall(payload)
+
+
+def receive_request(sock):
+    """ Receive an invocation request. Returns the request and the file descriptors sent with it. """
+    fds = array.array('i')
+    header, ancdata, _, _ = sock.recvmsg(_HEADER.size, socket.CMSG_LEN(len(_STANDARD_STREAMS) * fds.itemsize))
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - (len(data) % fds.itemsize)])
+    if len(header) < _HEADER.size:
+        header += _recv_exactly(sock, _HEADER.size - len(header))
+    payload = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    return json.loads(payload.decode('utf-8')), list(fds)
+
+
+def _send_message(sock, message):
+    sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+def run_in_daemon(args, socket_path=None):
+    """
+    Forward an invocation to a running daemon and wait for it to complete.
+
+    :param args: The command line arguments of the invocation.
+    :param socket_path: The socket the daemon listens on. Defaults to the socket in the configuration directory.
+    :return: The exit code of the command, or None if no daemon is available and the command should run in-process.
+    """
+    if not is_daemon_supported():
+        return None
+    socket_path = socket_path or get_daemon_file_path(DAEMON_SOCKET_FILE_NAME)
+    if not os.path.exists(socket_path):
+        return None
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+        send_request(client, {'argv': [sys.argv[0]] + list(args), 'cwd': os.getcwd(), 'env': dict(os.environ)},
+                     _STANDARD_STREAMS)
+    except (OSError, EOFError):
+        # stale socket of a daemon which is no longer running
+        client.close()
+        return None
+
+    # The daemon sends the process id of the child running the command first, then its exit code.
+    pid = None
+    with client, client.makefile('r') as responses:
+        while True:
+            try:
+                line = responses.readline()
+            except KeyboardInterrupt:
+                if pid is None:
+                    raise
+                # the child is not attached to this terminal, so pass the interrupt on
+                os.kill(pid, signal.SIGINT)
+                continue
+            if not line:
+                print('The az daemon stopped before the command completed.', file=sys.stderr)
+                return 1
+            message = json.loads(line)
+            if 'pid' in message:
+                pid = message['pid']
+            if 'exit_code' in message:
+                return message['exit_code']
+
+
+def _run_command(argv):
+    """ Run a command the same way `python -m azure.cli` does, returning its exit code. """
+    from knack.completion import ARGCOMPLETE_ENV_NAME
+    from azure.cli.core import get_default_cli
+    import azure.cli.core.telemetry as telemetry
+
+    az_cli = get_default_cli()
+    telemetry.set_application(az_cli, ARGCOMPLETE_ENV_NAME)
+    try:
+        telemetry.start()
+        try:
+            exit_code = az_cli.invoke(argv)
+        except SystemExit as ex:
+            exit_code = ex.code
+        if exit_code and exit_code != 0:
+            telemetry.set_failure()
+        else:
+            telemetry.set_success()
+        return exit_code
+    except KeyboardInterrupt:
+        telemetry.set_user_fault('keyboard interrupt')
+        return 1
+    finally:
+        telemetry.conclude()
+
+
+class AzDaemonServer(object):
+    """
+    Serves CLI invocations forwarded by `run_in_daemon`, each in a forked child process.
+
+    :param socket_path: The path of the Unix domain socket to listen on.
+    :param idle_timeout: Seconds without any invocation after which the daemon exits. None to run until stopped.
+    """
+
+    def __init__(self, socket_path, idle_timeout=None):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.listener = None
+        self.children = set()
+        self._stopped = False
+
+    @staticmethod
+    def preload():
+        """ Import the command modules and common dependencies so that the children inherit them. """
+        from importlib import import_module
+        from azure.cli.core import get_default_cli
+
+        for name in _PRELOAD_MODULES:
+            try:
+                import_module(name)
+            except ImportError:
+                pass
+        az_cli = get_default_cli()
+        # some command modules record state on the invocation while registering commands
+        az_cli.invocation = az_cli.invocation_cls(cli_ctx=az_cli, parser_cls=az_cli.parser_cls,
+                                                  commands_loader_cls=az_cli.commands_loader_cls,
+                                                  help_cls=az_cli.help_cls)
+        az_cli.invocation.commands_loader.load_command_table(None)
+
+    def bind(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # only the owner may connect, as the daemon runs commands with the credentials of the owner
+        old_umask = os.umask(0o177)
+        try:
+            self.listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        self.listener.listen(16)
+
+    def serve_forever(self):
+        import select
+
+        if not self.listener:
+            self.bind()
+        last_activity = time.time()
+        try:
+            while not self._stopped:
+                readable, _, _ = select.select([self.listener], [], [], _POLL_INTERVAL)
+                self._reap_children()
+                if readable:
+                    conn, _ = self.listener.accept()
+                    self._handle_connection(conn)
+                    last_activity = time.time()
+                elif self.children:
+                    last_activity = time.time()
+                elif self.idle_timeout and time.time() - last_activity > self.idle_timeout:
+                    break
+        finally:
+            self.close()
+
+    def shutdown(self):
+        self._stopped = True
+
+    def close(self):
+        if self.listener:
+            self.listener.close()
+            self.listener = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def _reap_children(self):
+        for pid in list(self.children):
+            try:
+                finished, _ = os.waitpid(pid, os.WNOHANG)
+            except OSError:
+                finished = pid
+            if finished:
+                self.children.discard(pid)
+
+    def _handle_connection(self, conn):
+        try:
+            request, fds = receive_request(conn)
+        except (OSError, EOFError, ValueError):
+            conn.close()
+            return
+        pid = os.fork()
+        if pid == 0:
+            self._run_child(conn, request, fds)
+        self.children.add(pid)
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+
+    def _run_child(self, conn, request, fds):
+        exit_code = 1
+        try:
+            self.listener.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            for target, fd in zip(_STANDARD_STREAMS, fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(request['cwd'])
+            os.environ.clear()
+            os.environ.update(request['env'])
+            sys.argv = request['argv'][:1]
+            _send_message(conn, {'pid': os.getpid()})
+            exit_code = _run_command(request['argv'][1:])
+        except BaseException:  # pylint: disable=broad-except
+            import traceback
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                _send_message(conn, {'exit_code': exit_code if isinstance(exit_code, int) else 1})
+            except Exception:  # pylint: disable=broad-except
+                pass
+            os._exit(0)  # pylint: disable=protected-access
+
+
+def _read_pid(pid_path):
+    try:
+        with open(pid_path, 'r') as f:
+            pid = int(f.read().strip())
+        os.kill(pid, 0)
+        return pid
+    except (OSError, IOError, ValueError):
+        return None
+
+
+def _serve(socket_path, pid_path, idle_timeout):
+    server = AzDaemonServer(socket_path, idle_timeout=idle_timeout)
+
+    def _handle_sigterm(*_):
+        server.shutdown()
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    server.preload()
+    server.bind()
+    with open(pid_path, 'w') as f:
+        f.write(str(os.getpid()))
+    try:
+        server.serve_forever()
+    finally:
+        if _read_pid(pid_path) == os.getpid():
+            os.remove(pid_path)
+    return 0
+
+
+def _start(socket_path, pid_path, idle_timeout):
+    import subprocess
+
+    pid = _read_pid(pid_path)
+    if pid:
+        print('The az daemon is already running (pid {}).'.format(pid))
+        return 0
+    command = [sys.executable, '-m', 'azure.cli.core.daemon', 'start', '--foreground']
+    if idle_timeout:
+        command += ['--idle-timeout', str(idle_timeout)]
+    log_path = os.path.join(os.path.dirname(pid_path), DAEMON_LOG_FILE_NAME)
+    with open(os.devnull, 'r') as devnull, open(log_path, 'a') as log:
+        process = subprocess.Popen(command, stdin=devnull, stdout=log, stderr=log, start_new_session=True)
+    while process.poll() is None and not (os.path.exists(socket_path) and _read_pid(pid_path)):
+        time.sleep(0.1)
+    if process.poll() is not None:
+        print('The az daemon failed to start. See {} for details.'.format(log_path), file=sys.stderr)
+        return 1
+    print('Started the az daemon (pid {}).'.format(process.pid))
+    return 0
+
+
+def _stop(socket_path, pid_path):
+    pid = _read_pid(pid_path)
+    if not pid:
+        print('The az daemon is not running.')
+        return 0
+    os.kill(pid, signal.SIGTERM)
+    while _read_pid(pid_path) == pid and os.path.exists(socket_path):
+        time.sleep(0.1)
+    print('Stopped the az daemon (pid {}).'.format(pid))
+    return 0
+
+
+def _status(socket_path, pid_path):
+    pid = _read_pid(pid_path)
+    if pid:
+        print('The az daemon is running (pid {}), listening on {}.'.format(pid, socket_path))
+        return 0
+    print('The az daemon is not running.')
+    return 1
+
+
+def main(args):
+    """
+    Entry point of `az daemon start|stop|status`.
+
+    :param args: The arguments following `az daemon`.
+    :return: The exit code.
+    """
+    import argparse
+    from knack.util import ensure_dir
+    from azure.cli.core._environment import get_config_dir
+
+    parser = argparse.ArgumentParser(prog='az daemon', description='Manage a long-lived az process which serves '
+                                                                   'invocations of az to reduce their start-up time.')
+    subparsers = parser.add_subparsers(dest='action')
+    start_parser = subparsers.add_parser('start', help='Start the daemon in the background.')
+    start_parser.add_argument('--idle-timeout', type=int, default=None,
+                              help='Exit after the given number of seconds without invocations.')
+    start_parser.add_argument('--foreground', action='store_true', help='Run the daemon in the foreground.')
+    subparsers.add_parser('stop', help='Stop the daemon.')
+    subparsers.add_parser('status', help='Show whether the daemon is running.')
+    parsed = parser.parse_args(args)
+    if not parsed.action:
+        parser.print_help()
+        return 0
+
+    if not is_daemon_supported():
+        print('The az daemon requires Python 3 on Linux or macOS.', file=sys.stderr)
+        return 1
+    config_dir = get_config_dir()
+    ensure_dir(config_dir)
+    socket_path = get_daemon_file_path(DAEMON_SOCKET_FILE_NAME, config_dir)
+    pid_path = get_daemon_file_path(DAEMON_PID_FILE_NAME, config_dir)
+
+    if parsed.action == 'start':
+        if parsed.foreground:
+            return _serve(socket_path, pid_path, parsed.idle_timeout)
+        return _start(socket_path, pid_path, parsed.idle_timeout)
+    if parsed.action == 'stop':
+        return _stop(socket_path, pid_path)
+    return _status(socket_path, pid_path)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -5,9 +5,8 @@
 
 from __future__ import print_function
 from knack.util import CLIError
-from knack.help import GroupHelpFile
 
-from azure.cli.core._help import CliCommandHelpFile
+from azure.cli.core._help import CliCommandHelpFile, CliGroupHelpFile
 
 
 def get_all_help(cli_ctx):
@@ -28,7 +27,7 @@ def get_all_help(cli_ctx):
     help_files = []
     for cmd, parser in zip(sub_parser_keys, sub_parser_values):
         try:
-            help_file = GroupHelpFile(help_ctx, cmd, parser) if _is_group(parser) \
+            help_file = CliGroupHelpFile(help_ctx, cmd, parser) if _is_group(parser) \
                 else CliCommandHelpFile(help_ctx, cmd, parser)
             help_file.load(parser)
             help_files.append(help_file)
@@ -59,7 +58,8 @@ def create_invoker_and_load_cmds_and_args(cli_ctx):
     register_global_subscription_argument(cli_ctx)
     register_ids_argument(cli_ctx)  # global subscription must be registered first!
     cli_ctx.raise_event(events.EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=invoker.commands_loader)
-    invoker.parser.load_command_table(invoker.commands_loader)
+    # build the parsers of all the commands, which adds the global arguments to them
+    invoker.parser.load_command_table(invoker.commands_loader, lazy=False)
 
 
 def _store_parsers(parser, parser_keys, parser_values, sub_parser_keys, sub_parser_values):
@@ -7,6 +7,7 @@ from __future__ import print_function
 
 import sys
 import difflib
+from functools import partial
 
 import argparse
 import argcomplete
@@ -16,9 +17,10 @@ from knack.parser import CLICommandParser
 from knack.util import CLIError
 
 import azure.cli.core.telemetry as telemetry
+from azure.cli.core._startup_profiler import startup_profiler
 from azure.cli.core.extension import get_extension
 from azure.cli.core.commands import ExtensionCommandSource
-from azure.cli.core.commands.events import EVENT_INVOKER_ON_TAB_COMPLETION
+from azure.cli.core.commands.events import EVENT_INVOKER_ON_TAB_COMPLETION, EVENT_PARSER_PRE_COMMAND_PARSER_CREATE
 
 logger = get_logger(__name__)
 
@@ -33,6 +35,7 @@ class IncorrectUsageError(CLIError):
 class AzCompletionFinder(argcomplete.CompletionFinder):
 
     def _get_completions(self, comp_words, cword_prefix, cword_prequote, last_wordbreak_pos):
+        from azure.cli.core._completion import record_parser
         external_completions = []
         self._parser.cli_ctx.raise_event(EVENT_INVOKER_ON_TAB_COMPLETION,
                                          external_completions=external_completions,
@@ -42,10 +45,43 @@ class AzCompletionFinder(argcomplete.CompletionFinder):
                                          cword_prequote=cword_prequote,
                                          last_wordbreak_pos=last_wordbreak_pos)
 
-        return external_completions + super(AzCompletionFinder, self)._get_completions(comp_words,
-                                                                                       cword_prefix,
-                                                                                       cword_prequote,
-                                                                                       last_wordbreak_pos)
+        completions = super(AzCompletionFinder, self)._get_completions(comp_words, cword_prefix, cword_prequote,
+                                                                       last_wordbreak_pos)
+        # pylint: disable=protected-access
+        record_parser(self._parser, self._parser.cli_ctx.invocation.data.get('command_string'),
+                      bool(self._parser.cli_ctx._event_handlers.get(EVENT_INVOKER_ON_TAB_COMPLETION)))
+        return external_completions + completions
+
+
+class _LazyParserMap(dict):
+    """The parsers of the subcommands of a group, which builds the parser of a command when it's first looked up."""
+
+    def __init__(self, *args, **kwargs):
+        super(_LazyParserMap, self).__init__(*args, **kwargs)
+        self._factories = {}
+
+    def add_lazy(self, name, factory):
+        self._factories[name] = factory
+        dict.__setitem__(self, name, name)
+
+    def __setitem__(self, name, value):
+        self._factories.pop(name, None)
+        dict.__setitem__(self, name, value)
+
+    def __getitem__(self, name):
+        factory = self._factories.pop(name, None)
+        if factory:
+            factory()
+        return dict.__getitem__(self, name)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def values(self):
+        return [self[name] for name in list(self)]
+
+    def items(self):
+        return [(name, self[name]) for name in list(self)]
 
 
 class AzCliCommandParser(CLICommandParser):
@@ -55,8 +91,18 @@ class AzCliCommandParser(CLICommandParser):
         self.command_source = kwargs.pop('_command_source', None)
         super(AzCliCommandParser, self).__init__(cli_ctx, cli_help=cli_help, **kwargs)
 
-    def load_command_table(self, command_loader):
-        """Load a command table into our parser."""
+    def add_subparsers(self, **kwargs):
+        subparsers = super(AzCliCommandParser, self).add_subparsers(**kwargs)
+        # pylint: disable=protected-access
+        subparsers._name_parser_map = subparsers.choices = _LazyParserMap(subparsers._name_parser_map)
+        return subparsers
+
+    def load_command_table(self, command_loader, lazy=True):  # pylint: disable=arguments-differ
+        """Load a command table into our parser.
+
+        :param command_loader: The commands loader with the command table to load.
+        :param lazy: Whether to only build the parser of a command when it's looked up.
+        """
         # If we haven't already added a subparser, we
         # better do it.
         cmd_tbl = command_loader.command_table
@@ -73,57 +119,73 @@ class AzCliCommandParser(CLICommandParser):
                 continue
 
             command_verb = command_name.split()[-1]
-            # To work around http://bugs.python.org/issue9253, we artificially add any new
-            # parsers we add to the "choices" section of the subparser.
-            subparser.choices[command_verb] = command_verb
-
-            # inject command_module designer's help formatter -- default is HelpFormatter
-            fc = metadata.formatter_class or argparse.HelpFormatter
-
-            command_parser = subparser.add_parser(command_verb,
-                                                  description=metadata.description,
-                                                  parents=self.parents,
-                                                  conflict_handler='error',
-                                                  help_file=metadata.help,
-                                                  formatter_class=fc,
-                                                  cli_help=self.cli_help,
-                                                  _command_source=metadata.command_source)
-            command_parser.cli_ctx = self.cli_ctx
-            command_validator = metadata.validator
-            argument_validators = []
-            argument_groups = {}
-            for _, arg in metadata.arguments.items():
-                # don't add deprecated arguments to the parser
-                deprecate_info = arg.type.settings.get('deprecate_info', None)
-                if deprecate_info and deprecate_info.expired():
-                    continue
-
-                if arg.validator:
-                    argument_validators.append(arg.validator)
-                try:
-                    if arg.arg_group:
-                        try:
-                            group = argument_groups[arg.arg_group]
-                        except KeyError:
-                            # group not found so create
-                            group_name = '{} Arguments'.format(arg.arg_group)
-                            group = command_parser.add_argument_group(arg.arg_group, group_name)
-                            argument_groups[arg.arg_group] = group
-                        param = AzCliCommandParser._add_argument(group, arg)
-                    else:
-                        param = AzCliCommandParser._add_argument(command_parser, arg)
-                except argparse.ArgumentError as ex:
-                    raise CLIError("command authoring error for '{}': '{}' {}".format(
-                        command_name, ex.args[0].dest, ex.message))  # pylint: disable=no-member
-                param.completer = arg.completer
-                param.deprecate_info = arg.deprecate_info
-            command_parser.set_defaults(
-                func=metadata,
-                command=command_name,
-                _cmd=metadata,
-                _command_validator=command_validator,
-                _argument_validators=argument_validators,
-                _parser=command_parser)
+            if lazy and isinstance(subparser.choices, _LazyParserMap):
+                # the parser of the command is built when it's looked up, e.g. when argparse descends into it
+                subparser.choices.add_lazy(command_verb, partial(self._add_lazy_command_parser, subparser,
+                                                                 command_verb, command_name, metadata))
+            else:
+                self._add_command_parser(subparser, command_verb, command_name, metadata)
+
+    def _add_lazy_command_parser(self, subparser, command_verb, command_name, metadata):
+        # the parser is built while the arguments are parsed, so its time is reported on its own
+        with startup_profiler.phase('build command parser', command=command_name):
+            self._add_command_parser(subparser, command_verb, command_name, metadata)
+
+    def _add_command_parser(self, subparser, command_verb, command_name, metadata):
+        if self.cli_ctx:
+            self.cli_ctx.raise_event(EVENT_PARSER_PRE_COMMAND_PARSER_CREATE, command=metadata)
+
+        # To work around http://bugs.python.org/issue9253, we artificially add any new
+        # parsers we add to the "choices" section of the subparser.
+        subparser.choices[command_verb] = command_verb
+
+        # inject command_module designer's help formatter -- default is HelpFormatter
+        fc = metadata.formatter_class or argparse.HelpFormatter
+
+        command_parser = subparser.add_parser(command_verb,
+                                              description=metadata.description,
+                                              parents=self.parents,
+                                              conflict_handler='error',
+                                              help_file=metadata.help,
+                                              formatter_class=fc,
+                                              cli_help=self.cli_help,
+                                              _command_source=metadata.command_source)
+        command_parser.cli_ctx = self.cli_ctx
+        command_validator = metadata.validator
+        argument_validators = []
+        argument_groups = {}
+        for _, arg in metadata.arguments.items():
+            # don't add deprecated arguments to the parser
+            deprecate_info = arg.type.settings.get('deprecate_info', None)
+            if deprecate_info and deprecate_info.expired():
+                continue
+
+            if arg.validator:
+                argument_validators.append(arg.validator)
+            try:
+                if arg.arg_group:
+                    try:
+                        group = argument_groups[arg.arg_group]
+                    except KeyError:
+                        # group not found so create
+                        group_name = '{} Arguments'.format(arg.arg_group)
+                        group = command_parser.add_argument_group(arg.arg_group, group_name)
+                        argument_groups[arg.arg_group] = group
+                    param = AzCliCommandParser._add_argument(group, arg)
+                else:
+                    param = AzCliCommandParser._add_argument(command_parser, arg)
+            except argparse.ArgumentError as ex:
+                raise CLIError("command authoring error for '{}': '{}' {}".format(
+                    command_name, ex.args[0].dest, ex.message))  # pylint: disable=no-member
+            param.completer = arg.completer
+            param.deprecate_info = arg.deprecate_info
+        command_parser.set_defaults(
+            func=metadata,
+            command=command_name,
+            _cmd=metadata,
+            _command_validator=command_validator,
+            _argument_validators=argument_validators,
+            _parser=command_parser)
 
     def validation_error(self, message):
         telemetry.set_user_fault('validation error')
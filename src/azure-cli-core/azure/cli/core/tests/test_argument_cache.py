@@ -0,0 +1,133 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from knack.arguments import CaseInsensitiveList
+
+from azure.cli.core import AzCommandsLoader, MainCommandsLoader
+from azure.cli.core._argument_cache import ArgumentCache, ArgumentNotCacheableError
+from azure.cli.core.commands.parameters import get_enum_type, get_three_state_flag, get_location_type
+from azure.cli.core.commands.validators import validate_tags
+from azure.cli.core.mock import DummyCli
+
+
+def sample_vm_get(resource_group_name, vm_name, size=None, enabled=None):  # pylint: disable=unused-argument
+    """
+    The operation to get a virtual machine.
+
+    :param resource_group_name: The name of the resource group.
+    :param vm_name: The name of the virtual machine.
+    :param size: The size of the virtual machine.
+    :param enabled: Whether the virtual machine is enabled.
+    """
+    pass
+
+
+class TestCommandsLoader(AzCommandsLoader):
+
+    load_arguments_calls = 0
+
+    def load_command_table(self, args):
+        super(TestCommandsLoader, self).load_command_table(args)
+        with self.command_group('test vm', operations_tmpl='{}#{{}}'.format(__name__)) as g:
+            g.command('show', 'sample_vm_get')
+        return self.command_table
+
+    def load_arguments(self, command):
+        TestCommandsLoader.load_arguments_calls += 1
+        with self.argument_context('test vm show') as c:
+            c.argument('vm_name', options_list=('--name', '-n'), validator=validate_tags)
+            c.argument('size', arg_type=get_enum_type(['Small', 'Large']))
+            c.argument('enabled', arg_type=get_three_state_flag())
+
+
+class TestArgumentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cli = DummyCli()
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.cli.config.config_dir = self.config_dir
+        self.cache = ArgumentCache(self.cli)
+
+    def _roundtrip(self, value):
+        return self.cache._deserialize(self.cache._serialize(value))
+
+    def test_argument_cache_serialize_values(self):
+        self.assertEqual(self._roundtrip(('--name', '-n')), ('--name', '-n'))
+        self.assertEqual(self._roundtrip({'a': [1, 2.5, None, True]}), {'a': [1, 2.5, None, True]})
+        self.assertIs(self._roundtrip(validate_tags), validate_tags)
+        self.assertIs(self._roundtrip(int), int)
+
+        choices = self._roundtrip(CaseInsensitiveList(['Small', 'Large']))
+        self.assertIsInstance(choices, CaseInsensitiveList)
+        self.assertIn('small', choices)
+
+        enum_action = self._roundtrip(get_enum_type(['Small', 'Large']).settings['action'])
+        self.assertTrue(issubclass(enum_action, __import__('argparse').Action))
+
+        location_type = get_location_type(self.cli)
+        self.assertEqual(self._roundtrip(location_type.settings['type'])('westus'), 'westus')
+
+    def test_argument_cache_rejects_closures(self):
+        with self.assertRaises(ArgumentNotCacheableError):
+            self.cache._serialize(lambda x: x)
+
+        class LocalAction(object):  # pylint: disable=too-few-public-methods
+            pass
+
+        with self.assertRaises(ArgumentNotCacheableError):
+            self.cache._serialize(LocalAction)
+
+    def _load_arguments(self, command_name):
+        main_loader = MainCommandsLoader(self.cli)
+        self.cli.invocation = mock.MagicMock()
+        self.cli.invocation.commands_loader = main_loader
+        self.cli.invocation.data = {'command_string': command_name}
+        loader = TestCommandsLoader(self.cli)
+        main_loader.command_table = loader.load_command_table(None)
+        main_loader.cmd_to_loader_map = {command_name: [loader]}
+        main_loader.load_arguments(command_name)
+        return main_loader.command_table[command_name]
+
+    def test_argument_cache_load_arguments(self):
+        command_name = 'test vm show'
+        TestCommandsLoader.load_arguments_calls = 0
+
+        expected = self._load_arguments(command_name)
+        self.assertEqual(TestCommandsLoader.load_arguments_calls, 1)
+        self.assertTrue(os.path.isfile(self.cache._get_cache_path(command_name)))
+
+        actual = self._load_arguments(command_name)
+        self.assertEqual(TestCommandsLoader.load_arguments_calls, 1)
+
+        self.assertEqual(list(expected.arguments), list(actual.arguments))
+        for name, arg in expected.arguments.items():
+            cached_arg = actual.arguments[name]
+            self.assertEqual(arg.options_list, cached_arg.options_list)
+            self.assertEqual(arg.options.get('required'), cached_arg.options.get('required'))
+            self.assertEqual(arg.options.get('help'), cached_arg.options.get('help'))
+            self.assertEqual(arg.choices, cached_arg.choices)
+        self.assertIs(actual.arguments['vm_name'].validator, validate_tags)
+        self.assertEqual(actual.arguments['resource_group_name'].type.default_name_tooling, 'group')
+
+    def test_argument_cache_disabled(self):
+        command_name = 'test vm show'
+        TestCommandsLoader.load_arguments_calls = 0
+        with mock.patch.object(self.cli.config, 'getboolean', return_value=False):
+            self._load_arguments(command_name)
+            self._load_arguments(command_name)
+        self.assertEqual(TestCommandsLoader.load_arguments_calls, 2)
+        self.assertFalse(os.path.isfile(self.cache._get_cache_path(command_name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+import mock
+
+from azure.cli.core.commands.client_factory import get_mgmt_service_client
+from azure.cli.core.mock import DummyCli
+from azure.cli.core.profiles import ResourceType
+
+
+def _get_session(client):
+    return client.config.pipeline._sender.driver.session  # pylint: disable=protected-access
+
+
+class TestClientFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.cli = DummyCli()
+        self.cli.invocation = mock.MagicMock()
+        patcher = mock.patch('azure.cli.core._profile.Profile.get_login_credentials', autospec=True,
+                             return_value=(mock.MagicMock(), '00000000-0000-0000-0000-000000000000', 'tenant'))
+        self.get_login_credentials = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_mgmt_clients_share_credentials_and_session(self):
+        first = get_mgmt_service_client(self.cli, ResourceType.MGMT_RESOURCE_RESOURCES)
+        second = get_mgmt_service_client(self.cli, ResourceType.MGMT_RESOURCE_RESOURCES)
+        third = get_mgmt_service_client(self.cli, ResourceType.MGMT_STORAGE)
+
+        self.assertEqual(self.get_login_credentials.call_count, 1)
+        # clients are not shared, as callers may customize them
+        self.assertIsNot(first, second)
+        self.assertIs(_get_session(first), _get_session(second))
+        self.assertIs(_get_session(first), _get_session(third))
+        self.assertTrue(third.config.keep_alive)
+
+        get_mgmt_service_client(self.cli, ResourceType.MGMT_STORAGE, subscription_id='other')
+        self.assertEqual(self.get_login_credentials.call_count, 2)
+
+    def test_mgmt_clients_not_shared_across_invocations(self):
+        first = get_mgmt_service_client(self.cli, ResourceType.MGMT_RESOURCE_RESOURCES)
+        self.cli.invocation = mock.MagicMock()
+        second = get_mgmt_service_client(self.cli, ResourceType.MGMT_RESOURCE_RESOURCES)
+
+        self.assertEqual(self.get_login_credentials.call_count, 2)
+        self.assertIsNot(_get_session(first), _get_session(second))
+
+
+if __name__ == '__main__':
+    unittest.main()
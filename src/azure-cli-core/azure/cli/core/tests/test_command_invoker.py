@@ -0,0 +1,110 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.core.commands import AzCliCommandInvoker
+from azure.cli.core.mock import DummyCli
+
+
+class _ThrottledError(Exception):
+
+    def __init__(self, retry_after=None):
+        super(_ThrottledError, self).__init__('Too Many Requests')
+        self.response = mock.MagicMock(status_code=429, headers={'Retry-After': retry_after})
+
+
+class _FakeCommand(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, cli_ctx, handler):
+        self.name = 'fake show'
+        self.cli_ctx = cli_ctx
+        self.supports_no_wait = False
+        self.no_wait_param = None
+        self.command_kwargs = {}
+        self.exception_handler = None
+        self.handler = handler
+
+    def __call__(self, params):
+        return self.handler(**params)
+
+
+class TestCommandInvoker(unittest.TestCase):
+
+    def setUp(self):
+        self.cli = DummyCli()
+        self.invoker = AzCliCommandInvoker(cli_ctx=self.cli)
+
+    def _create_jobs(self, handler, values):
+        return [(argparse.Namespace(value=value), _FakeCommand(self.cli, handler)) for value in values]
+
+    def test_concurrent_jobs_keep_input_order(self):
+        def _handler(value):
+            # later IDs complete first
+            time.sleep(0.01 * (5 - value))
+            if value % 2:
+                raise ValueError(value)
+            return value
+
+        streamed = []
+        ids = ['id{}'.format(i) for i in range(5)]
+        results, exceptions = self.invoker._run_jobs_concurrently(  # pylint: disable=protected-access
+            self._create_jobs(_handler, range(5)), ids, 5, streamed.append)
+
+        self.assertEqual(results, [0, 2, 4])
+        self.assertEqual([(str(ex), id_arg) for ex, id_arg in exceptions], [('1', 'id1'), ('3', 'id3')])
+        # streamed in the order the jobs completed
+        self.assertEqual(streamed, [4, 2, 0])
+
+    def test_concurrent_jobs_bounded(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def _handler(value):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return value
+
+        results, _ = self.invoker._run_jobs_concurrently(  # pylint: disable=protected-access
+            self._create_jobs(_handler, range(8)), [None] * 8, 2)
+        self.assertEqual(results, list(range(8)))
+        self.assertEqual(running[1], 2)
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_throttled_jobs_retried(self, sleep):
+        attempts = []
+
+        def _handler(value):
+            attempts.append(value)
+            if len(attempts) == 1:
+                raise _ThrottledError(retry_after='7')
+            if value == 1:
+                raise _ThrottledError()
+            return value
+
+        results, exceptions = self.invoker._run_jobs_serially(  # pylint: disable=protected-access
+            self._create_jobs(_handler, [0, 1]), ['id0', 'id1'])
+
+        self.assertEqual(results, [0])
+        self.assertEqual(len(exceptions), 1)
+        self.assertEqual(exceptions[0][1], 'id1')
+        # the first job waits for the delay requested by the service, the second one retries with a backoff
+        self.assertEqual(attempts, [0, 0] + [1] * 6)
+        self.assertAlmostEqual(sleep.call_args_list[0][0][0], 7, delta=1)
+        # time doesn't pass while sleep is mocked, so every attempt following the first throttling holds off
+        self.assertEqual(sleep.call_count, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
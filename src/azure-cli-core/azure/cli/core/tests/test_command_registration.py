@@ -220,6 +220,52 @@ class TestCommandRegistration(unittest.TestCase):
         self.assertTrue(isinstance(ext2.command_source, ExtensionCommandSource))
         self.assertTrue(ext2.command_source.overrides_command)
 
+    def test_command_index(self):
+        import os
+        import shutil
+        import tempfile
+        from azure.cli.core import CommandIndex
+        from azure.cli.core._session import INDEX
+
+        cli = DummyCli()
+        index_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, index_dir)
+        INDEX.load(os.path.join(index_dir, 'commandIndex.json'))
+        extensions = TestCommandRegistration._mock_get_extensions()
+
+        for patcher in [mock.patch('importlib.import_module', TestCommandRegistration._mock_import_lib),
+                        mock.patch('pkgutil.iter_modules', TestCommandRegistration._mock_iter_modules),
+                        mock.patch('azure.cli.core.commands._load_command_loader',
+                                   TestCommandRegistration._mock_load_command_loader),
+                        mock.patch('azure.cli.core.extension.get_extension_modname',
+                                   TestCommandRegistration._mock_extension_modname),
+                        mock.patch('azure.cli.core.extension.get_extensions',
+                                   TestCommandRegistration._mock_get_extensions)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # the first invocation loads every module and builds the index
+        cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+        self.assertIn('hello noodle', cmd_tbl)
+        modules, ext_names = CommandIndex(cli).get(['hello', 'world'], extensions)
+        self.assertEqual(modules, [__name__])
+        self.assertTrue(ext_names)
+        self.assertTrue(set(ext_names).issubset(set(e.name for e in extensions)))
+        self.assertIsNone(CommandIndex(cli).get(['goodbye'], extensions))
+        self.assertIsNone(CommandIndex(cli).get(['--version'], extensions))
+
+        # subsequent invocations resolve the owning modules from the index
+        with mock.patch('pkgutil.iter_modules') as iter_modules_mock:
+            cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            iter_modules_mock.assert_not_called()
+        self.assertIn('hello world', cmd_tbl)
+
+        # the index is not used once the installed extensions change
+        self.assertIsNone(CommandIndex(cli).get(['hello', 'world'], extensions[:1]))
+
+        CommandIndex(cli).invalidate()
+        self.assertIsNone(CommandIndex(cli).get(['hello', 'world'], extensions))
+
     def test_argument_with_overrides(self):
 
         global_vm_name_type = CLIArgumentType(
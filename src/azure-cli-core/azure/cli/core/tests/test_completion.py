@@ -0,0 +1,120 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+from six import StringIO
+
+from azure.cli.core._completion import CommandTree, COMMAND_TREE_FILE_NAME, complete_from_command_tree
+from azure.cli.core.commands import AzCliCommand
+from azure.cli.core.mock import DummyCli
+from azure.cli.core.parser import AzCliCommandParser
+
+
+def _handler():
+    pass
+
+
+class TestCommandTree(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+
+        cli = DummyCli()
+        cli.loader = mock.MagicMock()
+        cli.loader.cli_ctx = cli
+        show = AzCliCommand(cli.loader, 'test show', _handler)
+        show.add_argument('name', '--name', '-n')
+        show.add_argument('kind', '--kind', choices=['Small', 'Large'])
+        show.add_argument('location', '--location', '-l', completer=lambda **_: ['westus'])
+        show.add_argument('detailed', '--detailed', action='store_true')
+        show.add_argument('secret', '--secret', help=argparse.SUPPRESS)
+        self.command_table = {
+            'test show': show,
+            'test sub list': AzCliCommand(cli.loader, 'test sub list', _handler),
+            'other run': AzCliCommand(cli.loader, 'other run', _handler)
+        }
+        cli.commands_loader.command_table = self.command_table
+        self.parser = AzCliCommandParser(cli)
+        self.parser.load_command_table(cli.commands_loader)
+
+        self.tree = CommandTree(self.config_dir).load()
+        self.tree.add_commands(self.command_table, {})
+        self.tree.add_parser(self.parser, 'test show')
+
+    def test_complete_command_names(self):
+        self.assertEqual(self.tree.complete([], ''), ['-h', '--help', 'test', 'other'])
+        self.assertEqual(self.tree.complete([], 't'), ['test'])
+        self.assertEqual(self.tree.complete(['test'], ''), ['-h', '--help', 'show', 'sub'])
+        self.assertEqual(self.tree.complete(['test', 'sub'], 'l'), ['list'])
+        # the options of groups which haven't been completed are unknown
+        del self.tree.data['groups']['other']
+        self.assertIsNone(self.tree.complete(['other'], ''))
+        self.assertIsNone(self.tree.complete(['unknown'], ''))
+        self.assertIsNone(self.tree.complete(['--debug', 'test'], ''))
+
+    def test_complete_options(self):
+        options = ['-h', '--help', '--name', '-n', '--kind', '--location', '-l', '--detailed', '--subscription']
+        self.assertEqual(self.tree.complete(['test', 'show'], ''), options)
+        self.assertEqual(self.tree.complete(['test', 'show'], '--n'), ['--name'])
+        self.assertEqual(self.tree.complete(['test', 'show', '--name', 'foo', '--detailed'], '-'), options)
+        self.assertEqual(self.tree.complete(['test', 'show', '--kind'], '-'), options)
+        # the arguments of commands which haven't been completed are unknown
+        self.assertIsNone(self.tree.complete(['test', 'sub', 'list'], ''))
+        self.assertIsNone(self.tree.complete(['test', 'show', '--unknown'], ''))
+        self.assertIsNone(self.tree.complete(['test', 'show', 'value'], ''))
+
+    def test_complete_values(self):
+        self.assertEqual(self.tree.complete(['test', 'show', '--kind'], ''), ['Small', 'Large'])
+        self.assertEqual(self.tree.complete(['test', 'show', '--kind'], 'l'), ['Large'])
+        self.assertEqual(self.tree.complete(['test', 'show', '--name'], ''), [])
+        self.assertEqual(self.tree.complete(['test', 'show', '--secret'], ''), [])
+        # values given by a completer can't be told from the tree
+        self.assertIsNone(self.tree.complete(['test', 'show', '-l'], ''))
+
+    def test_complete_commands_of_partial_command_table(self):
+        tree = CommandTree(self.config_dir).load()
+        tree.add_commands({'test show': self.command_table['test show']}, {}, top_command='test')
+        tree.add_parser(self.parser, 'test show')
+        self.assertIsNone(tree.complete([], ''))
+        self.assertEqual(tree.complete(['test'], ''), ['-h', '--help', 'show'])
+
+    def test_tree_discarded_when_config_changes(self):
+        self.tree.save()
+        self.assertEqual(CommandTree(self.config_dir).load().complete(['test'], 's'), ['show', 'sub'])
+
+        with open(os.path.join(self.config_dir, 'config'), 'w') as f:
+            f.write('[core]\n')
+        self.assertIsNone(CommandTree(self.config_dir).load().complete(['test'], 's'))
+
+    def test_complete_from_command_tree(self):
+        self.tree.data['externalCompletions'] = False
+        self.tree.save()
+        output = StringIO()
+        output.close = lambda: None
+        env = {'_ARGCOMPLETE': '1', '_ARGCOMPLETE_IFS': '\n', 'COMP_LINE': 'az test show --kind L',
+               'COMP_POINT': '21'}
+        with mock.patch.dict(os.environ, env), mock.patch('os.fdopen', return_value=output), \
+                mock.patch('azure.cli.core._config.GLOBAL_CONFIG_DIR', self.config_dir):
+            self.assertTrue(complete_from_command_tree())
+            self.assertEqual(output.getvalue(), 'Large ')
+
+            for line in ['az test show --kind "L', 'az test show -l ', 'az test show --kind=L']:
+                with mock.patch.dict(os.environ, {'COMP_LINE': line, 'COMP_POINT': str(len(line))}):
+                    self.assertFalse(complete_from_command_tree())
+            with mock.patch.dict(os.environ, {'AZURE_CORE_USE_COMMAND_TREE': 'false'}):
+                self.assertFalse(complete_from_command_tree())
+
+        self.assertTrue(os.path.isfile(os.path.join(self.config_dir, COMMAND_TREE_FILE_NAME)))
+
+
+if __name__ == '__main__':
+    unittest.main()
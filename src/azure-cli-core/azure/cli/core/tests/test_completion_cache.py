@@ -0,0 +1,88 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import mock
+
+from azure.cli.core._completion_cache import CompletionCache, DEFAULT_TTL, MAX_STALENESS, _LISTS
+from azure.cli.core.mock import DummyCli
+
+
+class TestCompletionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cli = DummyCli()
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.cli.config.config_dir = self.config_dir
+
+        self.lists = {
+            'resourceGroups': mock.MagicMock(return_value=['rg1', 'rg2']),
+            'locations': mock.MagicMock(return_value=['westus']),
+            'resources': mock.MagicMock(side_effect=lambda _, rg, resource_type: [rg + '-vm'])
+        }
+        for patcher in [mock.patch.dict(_LISTS, self.lists),
+                        mock.patch('azure.cli.core.commands.client_factory.get_subscription_id',
+                                   return_value='00000000-0000-0000-0000-000000000000')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch('subprocess.Popen')
+        self.popen = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _age(self, seconds):
+        return mock.patch('time.time', return_value=time.time() + seconds)
+
+    def test_completion_cache_fetches_once(self):
+        self.assertEqual(CompletionCache(self.cli).get('resourceGroups'), ['rg1', 'rg2'])
+        self.assertEqual(CompletionCache(self.cli).get('resourceGroups'), ['rg1', 'rg2'])
+        self.assertEqual(self.lists['resourceGroups'].call_count, 1)
+
+        self.assertEqual(CompletionCache(self.cli).get('resources', 'MyRG', 'Microsoft.Compute/virtualMachines'),
+                         ['MyRG-vm'])
+        self.assertEqual(CompletionCache(self.cli).get('resources', 'MyRG', 'Microsoft.Compute/virtualMachines'),
+                         ['MyRG-vm'])
+        self.assertEqual(CompletionCache(self.cli).get('resources', 'other', 'Microsoft.Compute/virtualMachines'),
+                         ['other-vm'])
+        self.assertEqual(self.lists['resources'].call_count, 2)
+
+    def test_completion_cache_prefetches_on_first_use(self):
+        CompletionCache(self.cli).get('resourceGroups')
+        self.assertEqual(self.popen.call_count, 1)
+        self.assertIn('[["locations", []]]', self.popen.call_args[1]['args'])
+        self.assertTrue(self.popen.call_args[1]['close_fds'])
+
+        # the background refresh which was started isn't started again
+        CompletionCache(self.cli).get('resources', 'rg1', None)
+        self.assertEqual(self.popen.call_count, 1)
+
+    def test_completion_cache_refreshes_expired_values_in_background(self):
+        CompletionCache(self.cli).get('locations')
+        self.lists['locations'].return_value = ['eastus']
+        with self._age(DEFAULT_TTL + 10 + 120):
+            self.assertEqual(CompletionCache(self.cli).get('locations'), ['westus'])
+        self.assertEqual(self.lists['locations'].call_count, 1)
+        self.assertIn('[["locations", []]]', self.popen.call_args[1]['args'])
+
+        with self._age(DEFAULT_TTL + MAX_STALENESS + 10):
+            self.assertEqual(CompletionCache(self.cli).get('locations'), ['eastus'])
+        self.assertEqual(self.lists['locations'].call_count, 2)
+
+    @mock.patch.dict(os.environ, {'AZURE_CORE_COMPLETION_CACHE_TTL': '0'})
+    def test_completion_cache_disabled(self):
+        CompletionCache(self.cli).get('locations')
+        CompletionCache(self.cli).get('locations')
+        self.assertEqual(self.lists['locations'].call_count, 2)
+        self.assertFalse(os.path.exists(os.path.join(self.config_dir, 'completionCache')))
+        self.popen.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from azure.cli.core.daemon import (AzDaemonServer, is_daemon_supported, receive_request, run_in_daemon,
+                                   send_request)
+
+
+@unittest.skipUnless(is_daemon_supported(), 'The daemon is not supported on this platform.')
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.socket_path = os.path.join(self.temp_dir, 'daemon.sock')
+
+    def test_daemon_request_passes_file_descriptors(self):
+        client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        read_fd, write_fd = os.pipe()
+        try:
+            send_request(client, {'argv': ['az', 'vm', 'list'], 'env': {'A': 'b'}}, [write_fd, write_fd, write_fd])
+            request, fds = receive_request(server)
+            self.assertEqual(request, {'argv': ['az', 'vm', 'list'], 'env': {'A': 'b'}})
+            self.assertEqual(len(fds), 3)
+
+            os.write(fds[1], b'output')
+            self.assertEqual(os.read(read_fd, 6), b'output')
+            for fd in fds:
+                os.close(fd)
+        finally:
+            for fd in (read_fd, write_fd):
+                os.close(fd)
+            client.close()
+            server.close()
+
+    def test_daemon_not_running(self):
+        self.assertIsNone(run_in_daemon(['vm', 'list'], self.socket_path))
+
+        # stale socket left behind by a daemon which is no longer running
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+        self.assertIsNone(run_in_daemon(['vm', 'list'], self.socket_path))
+
+    @mock.patch('azure.cli.core.daemon._run_command', side_effect=lambda argv: len(argv))
+    def test_daemon_runs_command(self, _):
+        server = AzDaemonServer(self.socket_path)
+        server.bind()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            self.assertEqual(run_in_daemon(['vm', 'list', '--debug'], self.socket_path), 3)
+            self.assertEqual(run_in_daemon(['vm', 'list'], self.socket_path), 2)
+        finally:
+            server.shutdown()
+            thread.join()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,10 +8,10 @@ from __future__ import print_function
 import logging
 import unittest
 
-from azure.cli.core._help import ArgumentGroupRegistry, CliCommandHelpFile
+from azure.cli.core._help import ArgumentGroupRegistry, CliCommandHelpFile, CliGroupHelpFile
 from azure.cli.core.mock import DummyCli
 
-from knack.help import HelpObject, GroupHelpFile, HelpAuthoringException
+from knack.help import HelpObject, HelpAuthoringException
 
 
 class HelpTest(unittest.TestCase):
@@ -52,7 +52,7 @@ class HelpTest(unittest.TestCase):
 
         for name, parser in parser_dict.items():
             try:
-                help_file = GroupHelpFile(help_ctx, name, parser) if _is_group(parser) \
+                help_file = CliGroupHelpFile(help_ctx, name, parser) if _is_group(parser) \
                     else CliCommandHelpFile(help_ctx, name, parser)
                 help_file.load(parser)
             except Exception as ex:
@@ -0,0 +1,105 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from knack.help_files import helps
+
+from azure.cli.core._help import AzCliHelp
+from azure.cli.core._help_index import HelpIndex, HELP_INDEX_FILE_NAME, _compile_help
+from azure.cli.core.mock import DummyCli
+
+
+class TestHelpIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.cli = DummyCli()
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        self.cli.config.config_dir = self.config_dir
+
+        self.help_file = os.path.join(self.config_dir, '_help.py')
+        with open(self.help_file, 'w') as f:
+            f.write('')
+        patcher = mock.patch('azure.cli.core._help_index._get_help_modules', return_value=[('test', self.help_file)])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.texts = {
+            'test': 'type: group\nshort-summary: Manage tests.',
+            'test show': u'type: command\nshort-summary: Show a tést.',
+        }
+        patcher = mock.patch('azure.cli.core._help_index._compile_help', return_value=dict(self.texts))
+        self.compile_help = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_help_index_compiled_once(self):
+        index = HelpIndex(self.cli)
+        self.assertEqual(index.get('test show'), self.texts['test show'])
+        self.assertTrue(os.path.isfile(os.path.join(self.config_dir, HELP_INDEX_FILE_NAME)))
+        self.compile_help.assert_called_once_with(['test'])
+
+        index = HelpIndex(self.cli)
+        self.assertEqual(index.get('test show'), self.texts['test show'])
+        self.assertEqual(index.get('test'), self.texts['test'])
+        self.assertIsNone(index.get('test list'))
+        self.assertEqual(index.get_all(), self.texts)
+        self.compile_help.assert_called_once_with(['test'])
+
+    def test_help_index_compiled_again_when_help_changes(self):
+        HelpIndex(self.cli).get('test')
+        mtime = os.path.getmtime(self.help_file)
+        os.utime(self.help_file, (mtime + 10, mtime + 10))
+
+        self.compile_help.return_value = {'test': 'type: group\nshort-summary: Manage the tests.'}
+        self.assertEqual(HelpIndex(self.cli).get('test'), 'type: group\nshort-summary: Manage the tests.')
+        self.assertEqual(self.compile_help.call_count, 2)
+
+    def test_help_index_replaced_atomically(self):
+        HelpIndex(self.cli).get('test')
+        mtime = os.path.getmtime(self.help_file)
+        os.utime(self.help_file, (mtime + 10, mtime + 10))
+
+        # an index which fails to be written leaves the previous one in place
+        with mock.patch('os.replace', side_effect=OSError('in use'), create=True):
+            self.assertEqual(HelpIndex(self.cli).get('test'), self.texts['test'])
+        self.assertEqual(sorted(os.listdir(self.config_dir)), sorted(['_help.py', HELP_INDEX_FILE_NAME]))
+
+        self.compile_help.return_value = {'test': 'type: group\nshort-summary: Manage the tests.'}
+        self.assertEqual(HelpIndex(self.cli).get('test'), 'type: group\nshort-summary: Manage the tests.')
+        self.assertEqual(sorted(os.listdir(self.config_dir)), sorted(['_help.py', HELP_INDEX_FILE_NAME]))
+
+    @mock.patch.dict(os.environ, {'AZURE_CORE_USE_HELP_INDEX': 'false'})
+    def test_help_index_disabled(self):
+        index = HelpIndex(self.cli)
+        self.assertEqual(index.get('test show'), self.texts['test show'])
+        self.assertEqual(index.get_all(), self.texts)
+        self.assertFalse(os.path.exists(os.path.join(self.config_dir, HELP_INDEX_FILE_NAME)))
+
+    def test_help_registered_in_memory_takes_precedence(self):
+        help_ctx = AzCliHelp(self.cli)
+        self.assertEqual(help_ctx.get_help_text('test show'), self.texts['test show'])
+        with mock.patch.dict(helps, {'test show': 'type: command\nshort-summary: Show an extension test.'}):
+            self.assertEqual(help_ctx.get_help_text('test show'),
+                             'type: command\nshort-summary: Show an extension test.')
+
+
+class TestCompileHelp(unittest.TestCase):
+
+    def test_compile_help_of_command_modules(self):
+        with mock.patch.dict(helps, {'extension test': 'type: group'}, clear=True):
+            texts = _compile_help(['find'])
+            self.assertEqual(helps, {'extension test': 'type: group'})
+        self.assertIn('find', texts)
+        self.assertNotIn('extension test', texts)
+
+
+if __name__ == '__main__':
+    unittest.main()
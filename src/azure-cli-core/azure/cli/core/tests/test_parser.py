@@ -17,6 +17,10 @@ from azure.cli.core.mock import DummyCli
 from knack.arguments import enum_choice_list
 
 
+def _show_resource(resource_group_name, name):
+    return {'resourceGroup': resource_group_name, 'name': name}
+
+
 class TestParser(unittest.TestCase):
 
     def setUp(self):
@@ -76,6 +80,60 @@ class TestParser(unittest.TestCase):
         parser.parse_args('test command'.split())
         self.assertTrue(AzCliCommandParser.error.called)
 
+    def test_command_parsers_built_on_lookup(self):
+        def test_handler():
+            pass
+
+        cli = DummyCli()
+        cli.loader = mock.MagicMock()
+        cli.loader.cli_ctx = cli
+
+        command = AzCliCommand(cli.loader, 'test show', test_handler)
+        command2 = AzCliCommand(cli.loader, 'test list', test_handler)
+        cli.commands_loader.command_table = {'test show': command, 'test list': command2}
+
+        parser = AzCliCommandParser(cli)
+        parser.load_command_table(cli.commands_loader)
+        self.assertNotIn('_subscription', command.arguments)
+        self.assertNotIn('_subscription', command2.arguments)
+
+        args = parser.parse_args('test show --subscription mysub'.split())
+        self.assertIs(args.func, command)
+        self.assertEqual(args._subscription, 'mysub')  # pylint: disable=protected-access
+        self.assertIn('_subscription', command.arguments)
+        self.assertNotIn('_subscription', command2.arguments)
+
+        choices = parser.subparsers[('test',)].choices
+        self.assertEqual(sorted(choices), ['list', 'show'])
+        self.assertTrue(all(isinstance(p, AzCliCommandParser) for p in choices.values()))
+        self.assertIn('_subscription', command2.arguments)
+
+    def test_ids_argument_on_repeated_invocations(self):
+        from azure.cli.core.commands.parameters import resource_group_name_type
+
+        class TestCommandsLoader(AzCommandsLoader):
+
+            def load_command_table(self, args):
+                super(TestCommandsLoader, self).load_command_table(args)
+                with self.command_group('test', operations_tmpl='{}#{{}}'.format(__name__)) as g:
+                    g.command('show', '_show_resource')
+                return self.command_table
+
+            def load_arguments(self, command):
+                super(TestCommandsLoader, self).load_arguments(command)
+                with self.argument_context('test show') as c:
+                    c.argument('resource_group_name', resource_group_name_type)
+                    c.argument('name', options_list=['--name', '-n'], id_part='name')
+                self._update_command_definitions()  # pylint: disable=protected-access
+
+        cli = DummyCli(commands_loader_cls=TestCommandsLoader)
+        resource_id = '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/myrg/providers/' \
+                      'Microsoft.Network/virtualNetworks/myvnet'
+        # every invocation builds new commands, which need the --ids argument again
+        for _ in range(2):
+            self.assertEqual(cli.invoke(['test', 'show', '--ids', resource_id], out_file=StringIO()), 0)
+            self.assertEqual(cli.result.result, {'resourceGroup': 'myrg', 'name': 'myvnet'})
+
     def test_nargs_parameter(self):
         def test_handler():
             pass
@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 # pylint: disable=protected-access
+import datetime
 import json
 import os
 import unittest
@@ -1547,6 +1548,36 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
+    @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
+    @mock.patch('adal.AuthenticationContext', autospec=True)
+    def test_credscache_serves_fresh_tokens_from_memory(self, mock_adal_auth_context, mock_read_file):
+        cli = DummyCli()
+        now = datetime.datetime.now()
+        token_entries = [
+            {"accessToken": "token 1", "tokenType": "Bearer", "expiresOn": str(now + datetime.timedelta(hours=1))},
+            {"accessToken": "token 2", "tokenType": "Bearer", "expiresOn": str(now + datetime.timedelta(minutes=1))},
+            {"accessToken": "token 3", "tokenType": "Bearer", "expiresOn": str(now + datetime.timedelta(hours=1))}
+        ]
+        mock_adal_auth_context.acquire_token.side_effect = token_entries
+        mock_read_file.return_value = []
+        creds_cache = CredsCache(cli, auth_ctx_factory=lambda *_, **__: mock_adal_auth_context, async_persist=False)
+        mgmt_resource = 'https://management.core.windows.net/'
+
+        # action & assert: the token is retrieved once while it is valid
+        self.assertEqual(creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, mgmt_resource)[1], 'token 1')
+        self.assertEqual(creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, mgmt_resource)[1], 'token 1')
+        self.assertEqual(mock_adal_auth_context.acquire_token.call_count, 1)
+
+        # tokens about to expire are retrieved again
+        creds_cache._token_memory_cache.clear()
+        self.assertEqual(creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, mgmt_resource)[1], 'token 2')
+        self.assertEqual(creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, mgmt_resource)[1], 'token 3')
+        self.assertEqual(mock_adal_auth_context.acquire_token.call_count, 3)
+
+        # removing the credentials of a user drops the tokens served from memory
+        creds_cache.remove_cached_creds(self.user1)
+        self.assertEqual(creds_cache._token_memory_cache, {})
+
     @mock.patch('azure.cli.core._profile.get_file_json', autospec=True)
     def test_credscache_good_error_on_file_corruption(self, mock_read_file):
         mock_read_file.side_effect = ValueError('a bad error for you')
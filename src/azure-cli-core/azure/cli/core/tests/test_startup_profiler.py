@@ -0,0 +1,76 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+import unittest
+
+from azure.cli.core._startup_profiler import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def _create_profiler(self):
+        # not started, so that no import hooks are installed while the tests run
+        profiler = StartupProfiler()
+        profiler.enabled = True
+        profiler._origin = timeit.default_timer()  # pylint: disable=protected-access
+        return profiler
+
+    def test_startup_profiler_disabled(self):
+        profiler = StartupProfiler()
+        with profiler.phase('load command table'):
+            pass
+        profiler.annotate(command='vm list')
+        self.assertEqual(profiler.phases, [])
+        self.assertEqual(profiler.metadata, {})
+
+    def test_startup_profiler_report(self):
+        profiler = self._create_profiler()
+        with profiler.phase('load command table'):
+            with profiler.phase('load module vm', module='vm'):
+                pass
+        profiler.annotate(command='vm list')
+
+        def _fake_import(name):
+            sys.modules[name] = object()
+
+        self.addCleanup(sys.modules.pop, 'azure.cli.fake_module', None)
+        profiler._time_import('azure.cli.fake_module', _fake_import, 'azure.cli.fake_module')  # pylint: disable=protected-access
+        # imports of modules which are already loaded are not recorded
+        profiler._time_import('os', lambda _: os, 'os')  # pylint: disable=protected-access
+
+        report = profiler.get_report()
+        self.assertEqual(report['metadata'], {'command': 'vm list'})
+        phases = [p for p in report['phases'] if p['name'] != 'interpreter start']
+        self.assertEqual([p['name'] for p in phases], ['load command table', 'load module vm'])
+        self.assertEqual(phases[1]['args'], {'module': 'vm'})
+        self.assertTrue(phases[0]['duration'] >= phases[1]['duration'])
+        self.assertEqual([i['module'] for i in report['imports']], ['azure.cli.fake_module'])
+
+        trace = profiler.get_chrome_trace()
+        names = [(e['name'], e['cat'], e['ph']) for e in trace['traceEvents']]
+        self.assertIn(('load module vm', 'phase', 'X'), names)
+        self.assertIn(('azure.cli.fake_module', 'import', 'X'), names)
+
+    def test_startup_profiler_write(self):
+        profiler = self._create_profiler()
+        profiler.output_format = 'chrome'
+        with profiler.phase('build parser'):
+            pass
+        fd, profiler.output = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, profiler.output)
+        profiler.write()
+        with open(profiler.output, 'r') as f:
+            trace = json.load(f)
+        self.assertIn('build parser', [e['name'] for e in trace['traceEvents']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
 import sys
 import uuid
 
@@ -29,6 +30,23 @@ def cli_main(cli, args):
     return cli.invoke(args)
 
 
+# Answer tab completion from the command tree when possible, without loading any command module.
+if ARGCOMPLETE_ENV_NAME in os.environ:
+    from azure.cli.core._completion import complete_from_command_tree
+    if complete_from_command_tree():
+        sys.exit(0)
+
+if sys.argv[1:2] == ['daemon']:
+    from azure.cli.core.daemon import main as daemon_main
+    sys.exit(daemon_main(sys.argv[2:]))
+
+# Forward the invocation to a running `az daemon`, if any. Tab completion always runs in-process.
+if ARGCOMPLETE_ENV_NAME not in os.environ:
+    from azure.cli.core.daemon import run_in_daemon
+    daemon_exit_code = run_in_daemon(sys.argv[1:])
+    if daemon_exit_code is not None:
+        sys.exit(daemon_exit_code)
+
 az_cli = get_default_cli()
 
 telemetry.set_application(az_cli, ARGCOMPLETE_ENV_NAME)
@@ -360,9 +360,22 @@ helps['aks get-credentials'] = """
         - name: --overwrite-existing
           type: bool
           short-summary: Overwrite any existing cluster entry with the same name.
+        - name: --all
+          type: bool
+          short-summary: Get the credentials of all the managed clusters of the resource group, or of the subscription.
+          long-summary: >
+            The credentials are fetched concurrently and the Kubernetes configuration file is written once, keeping
+            its current context. Clusters whose entries conflict with existing ones, e.g. clusters with the same name
+            in different resource groups, are skipped unless --overwrite-existing is used. The number of concurrent
+            requests can be configured with `max_concurrency` in the [core] section of the config file. Default: 10.
         - name: --output -o
           type: string
           long-summary: Credentials are always in YAML format, so this argument is effectively ignored.
+    examples:
+        - name: Get the credentials of a managed Kubernetes cluster.
+          text: az aks get-credentials -g MyResourceGroup -n MyManagedCluster
+        - name: Get the credentials of all the managed Kubernetes clusters of a resource group.
+          text: az aks get-credentials -g MyResourceGroup --all
 """
 
 helps['aks get-upgrades'] = """
@@ -189,6 +189,7 @@ def load_arguments(self, _):
         c.argument('admin', options_list=['--admin', '-a'], default=False)
         c.argument('path', options_list=['--file', '-f'], type=file_type, completer=FilesCompleter(),
                    default=os.path.join(os.path.expanduser('~'), '.kube', 'config'))
+        c.argument('all_clusters', options_list=['--all'], action='store_true')
 
     with self.argument_context('aks install-cli') as c:
         c.argument('client_version', validator=validate_k8s_client_version)
@@ -998,26 +998,41 @@ def _k8s_get_credentials_internal(name, acs_info, path, ssh_key_file, overwrite_
             logger.warning('The credentials have been saved to %s', path_candidate)
 
 
-def _handle_merge(existing, addition, key, replace):
-    if addition[key]:
-        if existing[key] is None:
-            existing[key] = addition[key]
-            return
-
-        for i in addition[key]:
-            for j in existing[key]:
-                if i['name'] == j['name']:
-                    if replace or i == j:
-                        existing[key].remove(j)
-                    else:
-                        raise CLIError('A different object named {} already exists in {}'.format(i['name'], key))
-            existing[key].append(i)
+# libyaml, when PyYAML is built with it, is much faster at reading and writing kubeconfigs of many clusters
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
+
+
+_KUBECONFIG_SECTIONS = ['clusters', 'users', 'contexts']
+
+
+def _handle_merge(existing, indexes, addition, replace):
+    """Merge the clusters, users and contexts of a kubeconfig into an existing one, whose objects are indexed by
+    name in `indexes`. Nothing is merged if an object conflicts with an existing one.
+    """
+    for key in _KUBECONFIG_SECTIONS:
+        for obj in addition.get(key) or []:
+            for ix in indexes[key].get(obj['name'], []):
+                if not (replace or existing[key][ix] == obj):
+                    raise CLIError('A different object named {} already exists in {}'.format(obj['name'], key))
+
+    for key in _KUBECONFIG_SECTIONS:
+        if not addition.get(key):
+            continue
+        if existing.get(key) is None:
+            existing[key] = []
+        for obj in addition[key]:
+            # replaced objects are removed once all the kubeconfigs are merged
+            for ix in indexes[key].pop(obj['name'], []):
+                existing[key][ix] = None
+            indexes[key][obj['name']] = [len(existing[key])]
+            existing[key].append(obj)
 
 
 def load_kubernetes_configuration(filename):
     try:
         with open(filename) as stream:
-            return yaml.safe_load(stream)
+            return yaml.load(stream, Loader=_YAML_LOADER)
     except (IOError, OSError) as ex:
         if getattr(ex, 'errno', 0) == errno.ENOENT:
             raise CLIError('{} does not exist'.format(filename))
@@ -1027,40 +1042,72 @@ def load_kubernetes_configuration(filename):
         raise CLIError('Error parsing {} ({})'.format(filename, str(ex)))
 
 
-def merge_kubernetes_configurations(existing_file, addition_file, replace):
-    existing = load_kubernetes_configuration(existing_file)
-    addition = load_kubernetes_configuration(addition_file)
+def _merge_kubernetes_configuration(existing, additions, replace, skip_conflicts=False):
+    """Merge loaded kubeconfigs into a loaded kubeconfig, which may be None. The current context of the last one
+    becomes the current context. Kubeconfigs which conflict with the merged ones are skipped with a warning if
+    `skip_conflicts` is set.
 
-    # rename the admin context so it doesn't overwrite the user context
-    for ctx in addition.get('contexts', []):
+    :return: The merged kubeconfig and the number of kubeconfigs merged into it.
+    """
+    for addition in additions:
+        # rename the admin context so it doesn't overwrite the user context
+        for ctx in addition.get('contexts') or []:
+            try:
+                if ctx['context']['user'].startswith('clusterAdmin'):
+                    admin_name = ctx['name'] + '-admin'
+                    addition['current-context'] = ctx['name'] = admin_name
+                    break
+            except (KeyError, TypeError):
+                continue
+
+    merged = 0
+    if existing is None:
+        existing, additions = additions[0], additions[1:]
+        merged += 1
+
+    # index the objects by name, so that merging many kubeconfigs doesn't compare every pair of objects
+    indexes = {}
+    for key in _KUBECONFIG_SECTIONS:
+        indexes[key] = {}
+        for ix, obj in enumerate(existing.get(key) or []):
+            indexes[key].setdefault(obj['name'], []).append(ix)
+    for addition in additions:
         try:
-            if ctx['context']['user'].startswith('clusterAdmin'):
-                admin_name = ctx['name'] + '-admin'
-                addition['current-context'] = ctx['name'] = admin_name
-                break
-        except (KeyError, TypeError):
+            _handle_merge(existing, indexes, addition, replace)
+        except CLIError as ex:
+            if not skip_conflicts:
+                raise
+            logger.warning("Skipped the credentials of '%s': %s", addition.get('current-context'), ex)
             continue
-
-    if addition is None:
-        raise CLIError('failed to load additional configuration from {}'.format(addition_file))
-
-    if existing is None:
-        existing = addition
-    else:
-        _handle_merge(existing, addition, 'clusters', replace)
-        _handle_merge(existing, addition, 'users', replace)
-        _handle_merge(existing, addition, 'contexts', replace)
         existing['current-context'] = addition['current-context']
+        merged += 1
+    for key in _KUBECONFIG_SECTIONS:
+        if existing.get(key):
+            existing[key] = [obj for obj in existing[key] if obj is not None]
+    return existing, merged
+
 
+def _write_kubernetes_configuration(filename, config):
     # check that ~/.kube/config is only read- and writable by its owner
     if platform.system() != 'Windows':
-        existing_file_perms = "{:o}".format(stat.S_IMODE(os.lstat(existing_file).st_mode))
+        existing_file_perms = "{:o}".format(stat.S_IMODE(os.lstat(filename).st_mode))
         if not existing_file_perms.endswith('600'):
             logger.warning('%s has permissions "%s".\nIt should be readable and writable only by its owner.',
-                           existing_file, existing_file_perms)
+                           filename, existing_file_perms)
+
+    with open(filename, 'w+') as stream:
+        yaml.dump(config, stream, Dumper=_YAML_DUMPER, default_flow_style=False)
 
-    with open(existing_file, 'w+') as stream:
-        yaml.dump(existing, stream, default_flow_style=False)
+
+def merge_kubernetes_configurations(existing_file, addition_file, replace):
+    existing = load_kubernetes_configuration(existing_file)
+    addition = load_kubernetes_configuration(addition_file)
+
+    if addition is None:
+        raise CLIError('failed to load additional configuration from {}'.format(addition_file))
+
+    merged, _ = _merge_kubernetes_configuration(existing, [addition], replace)
+    _write_kubernetes_configuration(existing_file, merged)
 
     current_context = addition.get('current-context', 'UNKNOWN')
     msg = 'Merged "{}" as current context in {}'.format(current_context, existing_file)
@@ -1604,9 +1651,20 @@ def aks_get_versions(cmd, client, location):
     return client.list_orchestrators(location, resource_type='managedClusters')
 
 
-def aks_get_credentials(cmd, client, resource_group_name, name, admin=False,
+def aks_get_credentials(cmd, client, resource_group_name=None, name=None, admin=False,
                         path=os.path.join(os.path.expanduser('~'), '.kube', 'config'),
-                        overwrite_existing=False):
+                        overwrite_existing=False, all_clusters=False):
+    if all_clusters == bool(name) or (name and not resource_group_name):
+        raise CLIError('usage error: --resource-group NAME --name NAME | --all [--resource-group NAME]')
+
+    if all_clusters:
+        kubeconfigs = _get_all_kubeconfigs(cmd, client, resource_group_name, admin)
+    else:
+        kubeconfigs = [_get_kubeconfig(client, resource_group_name, name, admin)]
+    _print_or_merge_credentials(path, kubeconfigs, overwrite_existing, all_clusters=all_clusters)
+
+
+def _get_kubeconfig(client, resource_group_name, name, admin):
     credentialResults = None
     if admin:
         credentialResults = client.list_cluster_admin_credentials(resource_group_name, name)
@@ -1617,12 +1675,42 @@ def aks_get_credentials(cmd, client, resource_group_name, name, admin=False,
         raise CLIError("No Kubernetes credentials found.")
     else:
         try:
-            kubeconfig = credentialResults.kubeconfigs[0].value.decode(encoding='UTF-8')
-            _print_or_merge_credentials(path, kubeconfig, overwrite_existing)
+            return credentialResults.kubeconfigs[0].value.decode(encoding='UTF-8')
         except (IndexError, ValueError):
             raise CLIError("Fail to find kubeconfig file.")
 
 
+def _get_all_kubeconfigs(cmd, client, resource_group_name, admin):
+    """
+    Get the kubeconfigs of all the managed clusters of a resource group or of the subscription. They are fetched
+    concurrently, at most `max_concurrency` in the [core] section of the configuration at a time. Clusters whose
+    credentials can't be fetched are skipped with a warning.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from msrestazure.tools import parse_resource_id
+    from azure.cli.core.commands import DEFAULT_MAX_CONCURRENCY
+    if resource_group_name:
+        managed_clusters = list(client.list_by_resource_group(resource_group_name))
+    else:
+        managed_clusters = list(client.list())
+    max_workers = max(1, cmd.cli_ctx.config.getint('core', 'max_concurrency', fallback=DEFAULT_MAX_CONCURRENCY))
+
+    def _get_cluster_kubeconfig(managed_cluster):
+        cluster_resource_group = parse_resource_id(managed_cluster.id)['resource_group']
+        try:
+            return _get_kubeconfig(client, cluster_resource_group, managed_cluster.name, admin)
+        except (CLIError, CloudError) as ex:
+            logger.warning("Failed to get the credentials of the managed cluster '%s' in resource group '%s': %s",
+                           managed_cluster.name, cluster_resource_group, ex)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        kubeconfigs = [k for k in executor.map(_get_cluster_kubeconfig, managed_clusters) if k]
+    if not kubeconfigs:
+        raise CLIError("No Kubernetes credentials found.")
+    return kubeconfigs
+
+
 ADDONS = {
     'http_application_routing': 'httpApplicationRouting',
     'monitoring': 'omsagent',
@@ -2249,13 +2337,28 @@ def _get_rg_location(ctx, resource_group_name, subscription_id=None):
     return rg.location
 
 
-def _print_or_merge_credentials(path, kubeconfig, overwrite_existing):
-    """Merge an unencrypted kubeconfig into the file at the specified path, or print it to
-    stdout if the path is "-".
+def _print_or_merge_credentials(path, kubeconfigs, overwrite_existing, all_clusters=False):
+    """Merge unencrypted kubeconfigs into the file at the specified path, or print them to
+    stdout if the path is "-". The file is read and written once, whatever the number of kubeconfigs.
+    When merging the kubeconfigs of all the clusters, the current context of the file is kept and
+    the clusters which conflict with existing ones are skipped.
     """
     # Special case for printing to stdout
+    if path == "-" and len(kubeconfigs) == 1:
+        print(kubeconfigs[0])
+        return
+
+    try:
+        additions = [yaml.load(kubeconfig, Loader=_YAML_LOADER) for kubeconfig in kubeconfigs]
+    except yaml.YAMLError as ex:
+        logger.warning('Failed to merge credentials to kube config file: %s', ex)
+        return
+    if any(addition is None for addition in additions):
+        raise CLIError('failed to load the kubeconfig of a cluster')
+
     if path == "-":
-        print(kubeconfig)
+        merged, _ = _merge_kubernetes_configuration(None, additions, overwrite_existing, skip_conflicts=all_clusters)
+        print(yaml.dump(merged, Dumper=_YAML_DUMPER, default_flow_style=False))
         return
 
     # ensure that at least an empty ~/.kube/config exists
@@ -2270,18 +2373,19 @@ def _print_or_merge_credentials(path, kubeconfig, overwrite_existing):
         with os.fdopen(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600), 'wt'):
             pass
 
-    # merge the new kubeconfig into the existing one
-    fd, temp_path = tempfile.mkstemp()
-    additional_file = os.fdopen(fd, 'w+t')
-    try:
-        additional_file.write(kubeconfig)
-        additional_file.flush()
-        merge_kubernetes_configurations(path, temp_path, overwrite_existing)
-    except yaml.YAMLError as ex:
-        logger.warning('Failed to merge credentials to kube config file: %s', ex)
-    finally:
-        additional_file.close()
-        os.remove(temp_path)
+    # merge the new kubeconfigs into the existing one
+    existing = load_kubernetes_configuration(path)
+    current_context = existing.get('current-context') if existing and all_clusters else None
+    merged, count = _merge_kubernetes_configuration(existing, additions, overwrite_existing,
+                                                    skip_conflicts=all_clusters)
+    if current_context:
+        merged['current-context'] = current_context
+    _write_kubernetes_configuration(path, merged)
+
+    if all_clusters:
+        print('Merged the credentials of {} clusters in {}'.format(count, path))
+    else:
+        print('Merged "{}" as current context in {}'.format(merged.get('current-context', 'UNKNOWN'), path))
 
 
 def _remove_nulls(managed_clusters):
@@ -20,7 +20,8 @@ from azure.cli.command_modules.acs._params import (regions_in_preview,
 from azure.cli.command_modules.acs.custom import (merge_kubernetes_configurations, list_acs_locations,
                                                   _acs_browse_internal, _add_role_assignment, _get_default_dns_prefix,
                                                   create_application, _update_addons,
-                                                  _ensure_container_insights_for_monitoring, k8s_install_cli)
+                                                  _ensure_container_insights_for_monitoring, k8s_install_cli,
+                                                  aks_get_credentials)
 from azure.mgmt.containerservice.models import (ContainerServiceOrchestratorTypes,
                                                 ContainerService,
                                                 ContainerServiceOrchestratorProfile)
@@ -544,6 +545,108 @@ class AcsCustomCommandTest(unittest.TestCase):
         self.assertEqual(merged['users'], expected_users)
         self.assertEqual(merged['current-context'], obj2['current-context'])
 
+    @staticmethod
+    def _kubeconfig(name, resource_group_name='aztest', token='token'):
+        user = 'clusterUser_{}_{}'.format(resource_group_name, name)
+        return {
+            'apiVersion': 'v1',
+            'clusters': [{'cluster': {'server': 'https://{}.hcp.eastus.azmk8s.io:443'.format(name)}, 'name': name}],
+            'contexts': [{'context': {'cluster': name, 'user': user}, 'name': name}],
+            'current-context': name,
+            'kind': 'Config',
+            'users': [{'name': user, 'user': {'token': token}}]
+        }
+
+    def test_merge_many_credentials(self):
+        existing = tempfile.NamedTemporaryFile(delete=False)
+        existing.close()
+        self.addCleanup(os.remove, existing.name)
+        with open(existing.name, 'w+') as stream:
+            yaml.dump(self._kubeconfig('cluster0'), stream)
+
+        names = ['cluster{}'.format(i) for i in range(30)]
+        credentials = {name: mock.MagicMock(kubeconfigs=[mock.MagicMock(
+            value=yaml.dump(self._kubeconfig(name)).encode('utf-8'))]) for name in names}
+        credentials['cluster7'] = None
+        managed_clusters = [mock.MagicMock(id='/subscriptions/sub/resourceGroups/aztest/providers/'
+                                              'Microsoft.ContainerService/managedClusters/' + name) for name in names]
+        for managed_cluster, name in zip(managed_clusters, names):
+            managed_cluster.name = name
+        client = mock.MagicMock()
+        client.list.return_value = managed_clusters
+        client.list_cluster_user_credentials.side_effect = lambda _, name: credentials[name]
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.config.getint.return_value = 4
+
+        with self.assertRaises(CLIError):
+            aks_get_credentials(cmd, client, path=existing.name)
+        with mock.patch('azure.cli.command_modules.acs.custom.logger') as logger_mock:
+            aks_get_credentials(cmd, client, path=existing.name, all_clusters=True)
+        self.assertEqual(logger_mock.warning.call_count, 1)
+        client.list_by_resource_group.assert_not_called()
+
+        with open(existing.name, 'r') as stream:
+            merged = yaml.safe_load(stream)
+        expected_names = [name for name in names if name != 'cluster7']
+        self.assertEqual([c['name'] for c in merged['clusters']], expected_names)
+        self.assertEqual([c['name'] for c in merged['contexts']], expected_names)
+        self.assertEqual(len(merged['users']), len(expected_names))
+        self.assertEqual(merged['current-context'], 'cluster0')
+
+        # a different cluster with the same name is only merged when overwriting
+        credentials = {'cluster5': mock.MagicMock(kubeconfigs=[mock.MagicMock(
+            value=yaml.dump(self._kubeconfig('cluster5', token='new')).encode('utf-8'))])}
+        with self.assertRaises(CLIError):
+            aks_get_credentials(cmd, client, 'aztest', 'cluster5', path=existing.name)
+        aks_get_credentials(cmd, client, 'aztest', 'cluster5', path=existing.name,
+                            overwrite_existing=True)
+        with open(existing.name, 'r') as stream:
+            merged = yaml.safe_load(stream)
+        self.assertEqual(len(merged['users']), len(expected_names))
+        self.assertEqual(merged['users'][-1], {'name': 'clusterUser_aztest_cluster5', 'user': {'token': 'new'}})
+        self.assertEqual(merged['current-context'], 'cluster5')
+
+    def test_merge_all_credentials_skips_conflicts(self):
+        existing = tempfile.NamedTemporaryFile(delete=False)
+        existing.close()
+        self.addCleanup(os.remove, existing.name)
+        with open(existing.name, 'w+') as stream:
+            yaml.dump(self._kubeconfig('cluster0'), stream)
+
+        # clusters with the same name in different resource groups have contexts with the same name
+        clusters = [('rg1', 'cluster1'), ('rg2', 'cluster1'), ('rg1', 'cluster2')]
+        managed_clusters = []
+        for resource_group_name, name in clusters:
+            managed_cluster = mock.MagicMock(id='/subscriptions/sub/resourceGroups/{}/providers/Microsoft.'
+                                                'ContainerService/managedClusters/{}'.format(resource_group_name, name))
+            managed_cluster.name = name
+            managed_clusters.append(managed_cluster)
+        client = mock.MagicMock()
+        client.list.return_value = managed_clusters
+        client.list_cluster_user_credentials.side_effect = lambda rg, name: mock.MagicMock(kubeconfigs=[
+            mock.MagicMock(value=yaml.dump(self._kubeconfig(name, resource_group_name=rg)).encode('utf-8'))])
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.config.getint.return_value = 1
+
+        with mock.patch('azure.cli.command_modules.acs.custom.logger') as logger_mock:
+            aks_get_credentials(cmd, client, path=existing.name, all_clusters=True)
+        self.assertEqual(logger_mock.warning.call_count, 1)
+
+        with open(existing.name, 'r') as stream:
+            merged = yaml.safe_load(stream)
+        self.assertEqual([c['name'] for c in merged['clusters']], ['cluster0', 'cluster1', 'cluster2'])
+        self.assertEqual([c['name'] for c in merged['contexts']], ['cluster0', 'cluster1', 'cluster2'])
+        self.assertEqual([u['name'] for u in merged['users']],
+                         ['clusterUser_aztest_cluster0', 'clusterUser_rg1_cluster1', 'clusterUser_rg1_cluster2'])
+        self.assertEqual(merged['current-context'], 'cluster0')
+
+        # the conflicting cluster replaces the existing one when overwriting
+        aks_get_credentials(cmd, client, path=existing.name, overwrite_existing=True, all_clusters=True)
+        with open(existing.name, 'r') as stream:
+            merged = yaml.safe_load(stream)
+        self.assertEqual([c['context']['user'] for c in merged['contexts']],
+                         ['clusterUser_aztest_cluster0', 'clusterUser_rg2_cluster1', 'clusterUser_rg1_cluster2'])
+
     def test_acs_sp_create_failed_with_polished_error_if_due_to_permission(self):
 
         class FakedError(object):
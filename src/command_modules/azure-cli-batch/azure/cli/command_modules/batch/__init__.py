@@ -5,7 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.batch._help  # pylint: disable=unused-import
 from azure.cli.command_modules.batch._exception_handler import batch_exception_handler
 from azure.cli.command_modules.batch._command_type import BatchCommandGroup
 
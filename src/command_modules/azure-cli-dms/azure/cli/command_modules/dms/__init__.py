@@ -5,7 +5,6 @@
 
 
 # pylint: disable=unused-import
-import azure.cli.command_modules.dms._help
 
 from azure.cli.core import AzCommandsLoader
 
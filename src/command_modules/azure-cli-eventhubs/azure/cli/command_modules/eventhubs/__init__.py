@@ -8,8 +8,6 @@ from azure.cli.core import AzCommandsLoader
 # pylint: disable=unused-import
 # pylint: disable=line-too-long
 
-from ._help import helps
-
 
 class EventhubCommandsLoader(AzCommandsLoader):
 
@@ -11,6 +11,7 @@ from knack.help_files import helps
 
 def build_command_table(cli_ctx):
     from azure.cli.core import MainCommandsLoader
+    from azure.cli.core._help_index import HelpIndex
     cmd_table = MainCommandsLoader(cli_ctx).load_command_table(None)
     for command in cmd_table:
         cmd_table[command].load_arguments()
@@ -46,8 +47,11 @@ def build_command_table(cli_ctx):
         com_descip['parameters'] = param_descrip
         data[command] = com_descip
 
-    for command in helps:
-        diction_help = yaml.load(helps[command])
+    # the help of the command modules is read from the help index, extensions register theirs when loaded
+    help_texts = HelpIndex(cli_ctx).get_all()
+    help_texts.update(helps)
+    for command in help_texts:
+        diction_help = yaml.load(help_texts[command])
         if command not in data:
             data[command] = {
                 'short-summary': diction_help.get(
@@ -5,7 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 from azure.cli.core.profiles import ResourceType
-import azure.cli.command_modules.keyvault._help  # pylint: disable=unused-import
 
 
 class KeyVaultCommandsLoader(AzCommandsLoader):
@@ -5,8 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.kusto._help  # pylint: disable=unused-import
-
 
 class KustoCommandsLoader(AzCommandsLoader):
 
@@ -35,10 +35,6 @@ Known limitations:
     'TXT', 'SRV', 'SPF', 'URI', 'CAA'
 """
 
-import copy
-import datetime
-import time
-import argparse
 from collections import OrderedDict
 import re
 
@@ -50,7 +46,6 @@ from azure.cli.command_modules.network.zone_file.exceptions import InvalidLineEx
 
 logger = get_logger(__name__)
 
-semicolon_regex = re.compile(r'(?:"[^"]*")*[^\\](;.*)')
 date_regex_dict = {
     'w': {'regex': re.compile(r'(\d*w)'), 'scale': 86400 * 7},
     'd': {'regex': re.compile(r'(\d*d)'), 'scale': 86400},
@@ -59,79 +54,31 @@ date_regex_dict = {
     's': {'regex': re.compile(r'(\d*s)'), 'scale': 1}
 }
 
-
-class ZonefileLineParser(argparse.ArgumentParser):
-    def error(self, message):
-        """
-        Silent error message
-        """
-        raise InvalidLineException(message)
-
-
-class IncorrectParserException(Exception):
-    pass
-
-
-def _make_record_parser(parsers, rec_type, arg_defs):
-    """
-    Make a parser for a given type of DNS record
-    """
-    parser = ZonefileLineParser(rec_type)
-    parser.add_argument('name', type=str)
-
-    for arg in arg_defs:
-        nargs = arg[2] if len(arg) > 2 else 1
-        parser.add_argument(arg[0], type=arg[1], nargs=nargs)
-
-    parsers.append(parser)
-
-
-def _make_parser():
-    """
-    Make an array of parsers that can process different DNS record types
-    """
-    parsers = []
-
-    # parse $ORIGIN
-    origin = ZonefileLineParser('$ORIGIN')
-    origin.add_argument('DELIM', type=str)
-    origin.add_argument('value', type=str)
-    parsers.append(origin)
-
-    # parse $TTL
-    ttl = ZonefileLineParser('$TTL')
-    ttl.add_argument('DELIM', type=str)
-    ttl.add_argument('value', type=str)
-    parsers.append(ttl)
-
-    # parse each RR
-    _make_record_parser(parsers, 'SOA', [
-        ('ttl', str), ('DELIM', str),
-        ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str)
-    ])
-    _make_record_parser(parsers, 'NS', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'A', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'AAAA', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'CAA', [('ttl', str, '?'), ('DELIM', str), ('flags', int), ('tag', str), ('value', str)])
-    _make_record_parser(parsers, 'CNAME', [('ttl', str, '?'), ('DELIM', str), ('alias', str)])
-    _make_record_parser(parsers, 'MX', [('ttl', str, '?'), ('DELIM', str), ('preference', str), ('host', str)])
-    _make_record_parser(parsers, 'TXT', [('ttl', str), ('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'TXT', [('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'PTR', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'SRV', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('port', int), ('target', str)])
-    _make_record_parser(parsers, 'SPF', [('ttl', str, '?'), ('DELIM', str), ('txt', str)])
-    _make_record_parser(parsers, 'URI', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('target', str)])
-
-    return parsers
+SENTINEL = '%%%'
+
+# The formats of each type of record, tried in order. A format is whether the record has a TTL (True, False or None
+# when it's optional) and the fields following the type, as (name, type, nargs).
+_RECORD_FORMATS = {
+    'SOA': [
+        (True, [('host', str, 1), ('email', str, 1), ('serial', int, 1), ('refresh', str, 1), ('retry', str, 1),
+                ('expire', str, 1), ('minimum', str, 1)]),
+        (False, [('host', str, 1), ('email', str, 1), ('serial', int, 1), ('refresh', str, 1), ('retry', str, 1),
+                 ('expire', str, 1), ('minimum', str, 1)])
+    ],
+    'NS': [(None, [('host', str, 1)])],
+    'A': [(None, [('ip', str, 1)])],
+    'AAAA': [(None, [('ip', str, 1)])],
+    'CAA': [(None, [('flags', int, 1), ('tag', str, 1), ('value', str, 1)])],
+    'CNAME': [(None, [('alias', str, 1)])],
+    'MX': [(None, [('preference', str, 1), ('host', str, 1)])],
+    'TXT': [(True, [('txt', str, '+')]), (False, [('txt', str, '+')])],
+    'PTR': [(None, [('host', str, 1)])],
+    'SRV': [(None, [('priority', int, 1), ('weight', int, 1), ('port', int, 1), ('target', str, 1)])],
+    'SPF': [(None, [('txt', str, 1)])],
+    'URI': [(None, [('priority', int, 1), ('weight', int, 1), ('target', str, 1)])]
+}
+_DIRECTIVES = [x for x in SUPPORTED_RECORDS if x.startswith('$')]
+_RECORD_TYPES = [x for x in SUPPORTED_RECORDS if x in _RECORD_FORMATS]
 
 
 def _tokenize_line(line, quote_strings=False, infer_name=True):
@@ -140,17 +87,22 @@ def _tokenize_line(line, quote_strings=False, infer_name=True):
     * split tokens on whitespace
     * treat quoted strings as a single token
     """
+    if '"' not in line and '\\' not in line:
+        # nothing is quoted or escaped, so the tokens are the words of the line
+        ret = line.split()
+        if line[:1].isspace():
+            ret.insert(0, '$NAME' if infer_name else ' ')
+        return [] if ret == ['$NAME'] else ret
+
     ret = []
     escape = False
     quote = False
     tokbuf = ""
     firstchar = True
-    ll = list(line)
-    while len(ll) > 0:
-        c = ll.pop(0)
+    for c in line:
         if c.isspace():
             if firstchar:
-                # used by the _add_record_names method
+                # the record name is inferred from the previous record
                 tokbuf += '$NAME' if infer_name else ' '
 
             if not quote and not escape:
@@ -219,6 +171,8 @@ def _find_comment_index(line):
     Finds the index of a ; denoting a comment.
     Ignores escaped semicolons and semicolons inside quotes
     """
+    if ';' not in line:
+        return -1
     escape = False
     quote = False
     for i, char in enumerate(line):
@@ -263,166 +217,143 @@ def _serialize(tokens):
     return " ".join(ret)
 
 
-def _remove_comments(text):
+def _iter_lines(text):
     """
-    Remove comments from a zonefile
+    Iterate over the lines of the text, without splitting it all at once
     """
-    ret = []
-    lines = text.split("\n")
+    start = 0
+    end = text.find('\n')
+    while end != -1:
+        yield text[start:end]
+        start = end + 1
+        end = text.find('\n', start)
+    yield text[start:]
+
+
+def _iter_flattened_lines(lines):
+    """
+    Iterate over the records of a zonefile, one line each:
+    * remove comments and Windows line endings
+    * join the lines of records grouped by parenthesis
+    """
+    capturing = False
+    captured = []
     for line in lines:
         if not line:
             continue
-
         index = _find_comment_index(line)
         if index != -1:
             line = line[:index]
-        if line:
-            ret.append(line)
-
-    return "\n".join(ret)
-
-
-def _flatten(text):
-    """
-    Flatten the text:
-    * make sure each record is on one line.
-    * remove parenthesis
-    * remove Windows line endings
-    """
-    lines = text.split('\n')
-    SENTINEL = '%%%'
+            if not line:
+                continue
 
-    # tokens: sequence of non-whitespace separated by '' where a newline was
-    tokens = []
-    for line in (x for x in lines if len(x) > 0):
         line = line.replace('\t', ' ')
-        tokens += _tokenize_line(line, quote_strings=True, infer_name=False)
+        tokens = _tokenize_line(line, quote_strings=True, infer_name=False)
         tokens.append(SENTINEL)
+        for tok in tokens:
+            if tok == '$NAME':
+                tok = ' '
+
+            if not capturing and tok == SENTINEL:
+                # normal end-of-line
+                if len(captured) > 0:
+                    yield " ".join(captured)
+                    captured = []
+                continue
 
-    # find (...) and turn it into a single line ("capture" it)
-    capturing = False
-    captured = []
-
-    flattened = []
-    while len(tokens) > 0:
-        tok = tokens.pop(0)
-
-        if tok == '$NAME':
-            tok = ' '
-
-        if not capturing and tok == SENTINEL:
-            # normal end-of-line
-            if len(captured) > 0:
-                flattened.append(" ".join(captured))
-                captured = []
-            continue
-
-        if tok.startswith("("):
-            # begin grouping
-            tok = tok.lstrip("(")
-            capturing = True
-
-        if capturing and tok.endswith(")"):
-            # end grouping.  next end-of-line will turn this sequence into a flat line
-            tok = tok.rstrip(")")
-            capturing = False
-
-        if tok != SENTINEL:
-            captured.append(tok)
-
-    return "\n".join(flattened)
+            if tok.startswith("("):
+                # begin grouping
+                tok = tok.lstrip("(")
+                capturing = True
 
+            if capturing and tok.endswith(")"):
+                # end grouping.  next end-of-line will turn this sequence into a flat line
+                tok = tok.rstrip(")")
+                capturing = False
 
-def _remove_class(text):
-    """
-    Remove the CLASS from each DNS record, if present.
-    The only class that gets used today (for all intents
-    and purposes) is 'IN'.
-    """
-    # see RFC 1035 for list of classes
-    lines = text.split("\n")
-    ret = []
-    for line in lines:
-        original_tokens = _tokenize_line(line)
-        tokens = []
-        for token in original_tokens:
-            if token.upper() != 'IN':
-                tokens.append(token)
-        ret.append(_serialize(tokens))
-    return "\n".join(ret)
+            if tok != SENTINEL:
+                captured.append(tok)
 
 
-def _add_record_names(text):
+def _iter_record_tokens(lines):
     """
-    Go through each line of the text and ensure that
-    a name is defined.  Use previous record name if there is none.
+    Iterate over the tokens of the records of a zonefile:
+    * remove the CLASS of each record, if present. The only class that gets used today (for all intents and
+      purposes) is 'IN', see RFC 1035 for list of classes.
+    * ensure that a name is defined, using the name of the previous record if there is none
     """
-    global SUPPORTED_RECORDS
-
-    lines = text.split("\n")
-    ret = []
     previous_record_name = None
-
-    for line in lines:
-        tokens = _tokenize_line(line)
+    for line in _iter_flattened_lines(lines):
+        tokens = [x for x in _tokenize_line(line) if x.upper() != 'IN']
+        # tokenize the serialized tokens as the quotes of the tokens with whitespace are stripped
+        tokens = _tokenize_line(_serialize(tokens))
         if not tokens:
             continue
 
         record_name = tokens[0]
         if record_name == '$NAME':
-            tokens = [previous_record_name] + tokens[1:]
+            if previous_record_name is None:
+                raise CLIError('Unable to parse: {}. The record has no name.'.format(_serialize(tokens[1:])))
+            tokens[0] = previous_record_name
         elif not record_name.startswith('$'):
             previous_record_name = record_name
-
-        ret.append(_serialize(tokens))
-
-    return "\n".join(ret)
+        yield tokens
 
 
-def _parse_record(parser, record_token):
-    global SUPPORTED_RECORDS
-
-    # match parser to record type
-    record_type = None
-    for i in range(3):
+def _match_record_format(tokens, record_type, has_ttl, fields):
+    """
+    Match the tokens of a record to a format
+    """
+    name, tokens = tokens[0], tokens[1:]
+    count = len(fields)
+    variadic = fields[-1][2] == '+'
+    if has_ttl is None:
+        has_ttl = len(tokens) == count + 2
+    offset = 1 if has_ttl else 0
+    if len(tokens) < count + offset + 1 or (len(tokens) > count + offset + 1 and not variadic):
+        raise InvalidLineException
+    record = {'name': name}
+    if has_ttl:
+        record['ttl'] = tokens[0]
+    record['DELIM'] = tokens[offset]
+    if record['DELIM'].upper() != record_type:
+        raise InvalidLineException
+    values = tokens[offset + 1:]
+    for i, (field, field_type, nargs) in enumerate(fields):
         try:
-            if record_token[i].upper() in SUPPORTED_RECORDS:
-                record_type = record_token[i].upper()
-                break
-        except KeyError:
-            break
-
-    if not record_type:
-        from knack.util import CLIError
-        raise CLIError('Unable to determine record type: {}'.format(' '.join(record_token)))
+            if nargs == '+' and len(values) - i > 1:
+                record[field] = [field_type(x) for x in values[i:]]
+            else:
+                record[field] = field_type(values[i])
+        except ValueError:
+            raise InvalidLineException
+    return record
 
-    # move the record type to the front of the token list so it will conform to argparse
-    if record_type != parser.prog:
-        raise IncorrectParserException
 
-    try:
-        rr, unmatched = parser.parse_known_args(record_token)
-        assert len(unmatched) == 0, "Unmatched fields: %s" % unmatched
-    except (SystemExit, AssertionError, InvalidLineException):
-        # invalid argument
-        raise InvalidLineException(' '.join(record_token))
-
-    record = rr.__dict__
-    record['type'] = record_type
+def _parse_record(tokens):
+    """
+    Parse the tokens of a record or of a directive into a dict
+    """
+    if tokens[0].upper() in _DIRECTIVES:
+        if len(tokens) != 2:
+            raise InvalidLineException
+        return {'DELIM': tokens[0], 'value': tokens[1], 'type': tokens[0].upper()}
 
-    # remove emtpy fields
-    for field in list(record.keys()):
-        if record[field] is None:
-            del record[field]
+    record_type = next((x.upper() for x in tokens[1:3] if x.upper() in _RECORD_TYPES), None)
+    if not record_type:
+        if any(x.upper() in SUPPORTED_RECORDS for x in tokens[:3]):
+            # e.g. a directive following a name, or a name like a type of record
+            raise InvalidLineException
+        raise CLIError('Unable to determine record type: {}'.format(' '.join(tokens)))
 
-    for key in record:
+    for has_ttl, fields in _RECORD_FORMATS[record_type]:
         try:
-            if len(record[key]) == 1:
-                record[key] = record[key][0]
-        except TypeError:
+            record = _match_record_format(tokens, record_type, has_ttl, fields)
+        except InvalidLineException:
             continue
-
-    return record
+        record['type'] = record_type
+        return record
+    raise InvalidLineException
 
 
 def _convert_to_seconds(value):
@@ -440,7 +371,10 @@ def _convert_to_seconds(value):
             if match:
                 match_string = match.group(0)
                 ttl_string = ttl_string.replace(match_string, '')
-                match_value = int(match_string.strip(component))
+                try:
+                    match_value = int(match_string.strip(component))
+                except ValueError:
+                    raise CLIError("Unable to convert value '{}' to seconds.".format(value))
                 seconds += match_value * date_regex_dict[component]['scale']
             if not ttl_string:
                 return seconds
@@ -474,16 +408,6 @@ def _post_process_ttl(zone):
                     record['ttl'] = ttl
 
 
-def _pre_process_txt_records(text):
-    """ This looks only for the cases of multiple text records not surrounded by quotes.
-    This must be done after flattening but before any tokenization occurs, as this strips out
-    the quotes. """
-    lines = text.split('\n')
-    for line in lines:
-        pass
-    return text
-
-
 def _post_process_txt_record(record, current_ttl):
     if not isinstance(record['txt'], list):
         record['txt'] = [record['txt']]
@@ -518,37 +442,20 @@ def _post_check_names(zone):
 
 def parse_zone_file(text, zone_name, ignore_invalid=False):
     """
-    Parse a zonefile into a dict
+    Parse a zonefile into a dict, in a single pass over its lines
     """
-    parsers = _make_parser()
-
-    text = _remove_comments(text)
-    text = _flatten(text)
-    text = _remove_class(text)
-    text = _pre_process_txt_records(text)
-    text = _add_record_names(text)
-
     zone_obj = OrderedDict()
-    record_lines = text.split("\n")
     current_origin = zone_name.rstrip('.') + '.'
     current_ttl = 3600
     soa_processed = False
 
-    for record_line in record_lines:
-        parse_match = False
-        record = None
-        for parser in parsers:
-            record_tokens = _tokenize_line(record_line)
-            try:
-                record = _parse_record(parser, record_tokens)
-                if record['DELIM'].lower() != record['type'].lower():
-                    raise IncorrectParserException
-                parse_match = True
-                break
-            except (InvalidLineException, IncorrectParserException):
+    for record_tokens in _iter_record_tokens(_iter_lines(text)):
+        try:
+            record = _parse_record(record_tokens)
+        except InvalidLineException:
+            if ignore_invalid:
                 continue
-        if not parse_match and not ignore_invalid:
-            raise CLIError('Unable to parse: {}'.format(record_line))
+            raise CLIError('Unable to parse: {}'.format(_serialize(record_tokens)))
 
         record_type = record['type'].lower()
         if record_type.lower() == '$origin':
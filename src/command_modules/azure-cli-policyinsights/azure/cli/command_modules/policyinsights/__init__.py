@@ -5,7 +5,6 @@
 
 # pylint: disable=unused-import
 
-from azure.cli.command_modules.policyinsights._help import helps
 from azure.cli.core import AzCommandsLoader
 
 
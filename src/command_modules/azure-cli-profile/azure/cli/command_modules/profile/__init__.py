@@ -7,7 +7,6 @@ from azure.cli.core import AzCommandsLoader
 from azure.cli.core.commands import CliCommandType
 
 from azure.cli.command_modules.profile._format import transform_account_list
-import azure.cli.command_modules.profile._help  # pylint: disable=unused-import
 
 
 class ProfileCommandsLoader(AzCommandsLoader):
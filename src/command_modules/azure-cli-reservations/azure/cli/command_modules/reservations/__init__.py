@@ -5,7 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.reservations._help  # pylint: disable=unused-import
 from azure.cli.command_modules.reservations._client_factory import reservation_mgmt_client_factory
 from ._exception_handler import reservations_exception_handler
 
@@ -5,8 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.resource._help  # pylint: disable=unused-import
-
 
 class ResourceCommandsLoader(AzCommandsLoader):
 
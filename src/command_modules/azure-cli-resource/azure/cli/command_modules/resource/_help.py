@@ -579,6 +579,9 @@ helps['resource show'] = """
 helps['resource delete'] = """
     type: command
     short-summary: Delete a resource.
+    long-summary: >
+        The resources given with --ids are deleted in parallel. The resources which fail to be deleted, e.g. because
+        another resource depends on them, are retried once the others are deleted.
     examples:
         - name: Delete a virtual machine named 'MyVm'.
           text: >
@@ -589,6 +592,9 @@ helps['resource delete'] = """
         - name: Delete a subnet using a resource identifier.
           text: >
             az resource delete --ids /subscriptions/0b1f6471-1bf0-4dda-aec3-111111111111/resourceGroups/MyResourceGroup/providers/Microsoft.Network/virtualNetworks/MyVnet/subnets/MySubnet
+        - name: Delete all the resources of a resource group, 20 at a time, deleting nested resources before their parent.
+          text: >
+            az resource delete --ids $(az resource list -g MyResourceGroup --query [].id -o tsv) --max-parallel 20 --dependency-order
 """
 
 helps['resource tag'] = """
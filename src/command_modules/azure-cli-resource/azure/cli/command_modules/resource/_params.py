@@ -56,6 +56,10 @@ def load_arguments(self, _):
         c.argument('resource_ids', nargs='+', options_list=['--ids'], help='One or more resource IDs (space-delimited). If provided, no other "Resource Id" arguments should be specified.', arg_group='Resource Id')
         c.argument('include_response_body', arg_type=get_three_state_flag(), help='Use if the default command output doesn\'t capture all of the property data.')
 
+    with self.argument_context('resource delete') as c:
+        c.argument('max_parallel', type=int, metavar='N', arg_group='Resource Id', help='Maximum number of resources to delete in parallel. The default can be configured with `max_concurrency` in the [core] section of the config file. Default: 10.')
+        c.argument('dependency_order', action='store_true', arg_group='Resource Id', help='With --ids, delete the resources nested in other resources first, e.g. the subnets of a virtual network before the virtual network.')
+
     with self.argument_context('resource list') as c:
         c.argument('name', resource_name_type)
 
@@ -14,6 +14,7 @@ import os
 import re
 import ssl
 import sys
+import threading
 import uuid
 
 from six.moves.urllib.request import urlopen  # pylint: disable=import-error
@@ -356,7 +357,8 @@ def _list_resources_odata_filter_builder(resource_group_name=None, resource_prov
 
 def _get_auth_provider_latest_api_version(cli_ctx):
     rcf = _resource_client_factory(cli_ctx)
-    api_version = _ResourceUtils.resolve_api_version(rcf, 'Microsoft.Authorization', None, 'providerOperations')
+    api_version = _ResourceUtils.resolve_api_version(rcf, 'Microsoft.Authorization', None, 'providerOperations',
+                                                     cli_ctx=cli_ctx)
     return api_version
 
 
@@ -779,7 +781,7 @@ def _get_parsed_resource_ids(resource_ids):
     return (parse_resource_id(rid) for rid in resource_ids)
 
 
-def _get_rsrc_util_from_parsed_id(cli_ctx, parsed_id, api_version):
+def _get_rsrc_util_from_parsed_id(cli_ctx, parsed_id, api_version, rcf=None):
     return _ResourceUtils(cli_ctx,
                           parsed_id['resource_group'],
                           parsed_id['resource_namespace'],
@@ -787,7 +789,8 @@ def _get_rsrc_util_from_parsed_id(cli_ctx, parsed_id, api_version):
                           parsed_id['resource_type'],
                           parsed_id['resource_name'],
                           None,
-                          api_version)
+                          api_version,
+                          rcf=rcf)
 
 
 def _create_parsed_id(resource_group_name=None, resource_provider_namespace=None, parent_resource_path=None,
@@ -829,48 +832,43 @@ def show_resource(cmd, resource_ids=None, resource_group_name=None,
 # pylint: disable=unused-argument
 def delete_resource(cmd, resource_ids=None, resource_group_name=None,
                     resource_provider_namespace=None, parent_resource_path=None, resource_type=None,
-                    resource_name=None, api_version=None):
+                    resource_name=None, api_version=None, max_parallel=None, dependency_order=False):
     """
     Deletes the given resource(s).
     This function allows deletion of ids with dependencies on one another.
-    This is done with multiple passes through the given ids.
+    This is done with multiple passes through the given ids, deleting the resources of a pass concurrently.
     """
+    from azure.cli.core.commands import DEFAULT_MAX_CONCURRENCY
+    max_parallel = max_parallel or cmd.cli_ctx.config.getint('core', 'max_concurrency',
+                                                             fallback=DEFAULT_MAX_CONCURRENCY)
+    if max_parallel < 1:
+        raise CLIError('usage error: --max-parallel must be a positive integer')
+
     parsed_ids = _get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
                                                                               resource_provider_namespace,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
-    to_be_deleted = [(_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version), id_dict)
+    # share a client, and the api-versions it resolves, across the resources
+    rcf = _resource_client_factory(cmd.cli_ctx)
+    to_be_deleted = [(_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version, rcf=rcf), id_dict)
                      for id_dict in parsed_ids]
 
+    # nested resources are deleted before their parent when ordered by dependency
+    waves = _order_by_dependency(resource_ids, to_be_deleted) if dependency_order and resource_ids \
+        else [to_be_deleted]
     results = []
-    from msrestazure.azure_exceptions import CloudError
-    while to_be_deleted:
-        logger.debug("Start new loop to delete resources.")
-        operations = []
-        failed_to_delete = []
-        for rsrc_utils, id_dict in to_be_deleted:
-            try:
-                operations.append(rsrc_utils.delete())
-                resource = resource_dict_to_id(**id_dict) if id_dict.get("subscription") else resource_name
-                logger.debug("deleting %s", resource)
-            except CloudError as e:
-                # request to delete failed, add parsed id dict back to queue
-                id_dict['exception'] = str(e)
-                failed_to_delete.append((rsrc_utils, id_dict))
-        to_be_deleted = failed_to_delete
-
-        # stop deleting if none deletable
-        if not operations:
-            break
-
-        # all operations return result before next pass
-        for operation in operations:
-            results.append(operation.result())
-
-    if to_be_deleted:
+    failed_to_delete = []
+    for wave in waves:
+        wave_results, wave_failed = _delete_resources_in_passes(wave, max_parallel, resource_name)
+        results.extend(wave_results)
+        failed_to_delete.extend(wave_failed)
+
+    if len(to_be_deleted) == 1 and failed_to_delete:
+        raise failed_to_delete[0][1]['error']
+    if failed_to_delete:
         error_msg_builder = ['Some resources failed to be deleted:']
-        for _, id_dict in to_be_deleted:
+        for _, id_dict in failed_to_delete:
             logger.debug(id_dict['exception'])
             error_msg_builder.append(resource_dict_to_id(**id_dict))
         raise CLIError(os.linesep.join(error_msg_builder))
@@ -878,6 +876,55 @@ def delete_resource(cmd, resource_ids=None, resource_group_name=None,
     return _single_or_collection(results)
 
 
+def _delete_resources_in_passes(to_be_deleted, max_parallel, resource_name=None):
+    """ Delete the resources concurrently, retrying the failed ones in passes as long as a pass deletes any.
+    Returns the results of the deletions and the resources which couldn't be deleted. """
+    from concurrent.futures import ThreadPoolExecutor
+    from msrestazure.azure_exceptions import CloudError
+
+    def _delete(rsrc_utils, id_dict):
+        operation = rsrc_utils.delete()
+        resource = resource_dict_to_id(**id_dict) if id_dict.get("subscription") else resource_name
+        logger.debug("deleting %s", resource)
+        return operation.result()
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        while to_be_deleted:
+            logger.debug("Start new loop to delete resources.")
+            futures = [executor.submit(_delete, rsrc_utils, id_dict) for rsrc_utils, id_dict in to_be_deleted]
+            failed_to_delete = []
+            for (rsrc_utils, id_dict), future in zip(to_be_deleted, futures):
+                try:
+                    results.append(future.result())
+                except CloudError as e:
+                    # request to delete failed, e.g. as another resource depends on it, add it back to queue
+                    id_dict['exception'] = str(e)
+                    id_dict['error'] = e
+                    failed_to_delete.append((rsrc_utils, id_dict))
+
+            # stop deleting if none deletable
+            if len(failed_to_delete) == len(to_be_deleted):
+                break
+            to_be_deleted = failed_to_delete
+    return results, to_be_deleted
+
+
+def _order_by_dependency(resource_ids, to_be_deleted):
+    """ Group the resources in waves to delete one after the other: a resource comes in a later wave than the
+    resources nested in it, e.g. a virtual network after its subnets. """
+    normalized_ids = [rid.lower().rstrip('/') for rid in resource_ids]
+    # the resources nested in a resource have a longer id, so they get their height first
+    heights = {}
+    for rid in sorted(set(normalized_ids), key=len, reverse=True):
+        nested = [heights[other] for other in heights if other.startswith(rid + '/')]
+        heights[rid] = max(nested) + 1 if nested else 0
+    waves = [[] for _ in range(max(heights.values()) + 1)]
+    for rid, item in zip(normalized_ids, to_be_deleted):
+        waves[heights[rid]].append(item)
+    return waves
+
+
 # pylint: unused-argument
 def update_resource(cmd, parameters, resource_ids=None,
                     resource_group_name=None, resource_provider_namespace=None,
@@ -1785,6 +1832,61 @@ def list_resource_links(cmd, scope=None, filter_string=None):
 # endregion
 
 
+# resource types and api-versions of the resource providers, cached for the invocation
+_provider_resource_types = {}
+_provider_cache = {}
+_provider_cache_lock = threading.Lock()
+_PROVIDER_CACHE_FILE_NAME = 'resourceProviderCache.json'
+_DEFAULT_PROVIDER_CACHE_TTL = 24 * 60 * 60
+
+
+def _get_provider_cache_file(cli_ctx):
+    """ The file caching the resource types of the providers across invocations, or None if it is disabled. """
+    from azure.cli.core.api import get_config_dir
+    from azure.cli.core._session import Session
+    ttl = cli_ctx.config.getint('resource', 'provider_cache_ttl', fallback=_DEFAULT_PROVIDER_CACHE_TTL)
+    if ttl <= 0:
+        return None, ttl
+    path = os.path.join(get_config_dir(), _PROVIDER_CACHE_FILE_NAME)
+    if path not in _provider_cache:
+        _provider_cache[path] = Session()
+        _provider_cache[path].load(path)
+    return _provider_cache[path], ttl
+
+
+def _get_provider_resource_types(rcf, resource_provider_namespace, cli_ctx=None, refresh=False):
+    """
+    The resource types of a provider, as a list of (resource type, api-versions). The provider is looked up once per
+    invocation, and cached on disk per cloud and subscription for `provider_cache_ttl` seconds from the [resource]
+    section of the configuration.
+
+    :param refresh: Whether to look the provider up again if it was read from the disk cache, e.g. when a resource
+                    type isn't found in it.
+    """
+    import time
+    key = '{}|{}|{}'.format(rcf.config.base_url, rcf.config.subscription_id, resource_provider_namespace.lower())
+    with _provider_cache_lock:
+        resource_types, from_disk = _provider_resource_types.get(key, (None, False))
+        if resource_types is not None and not (refresh and from_disk):
+            return resource_types
+
+        session, ttl = _get_provider_cache_file(cli_ctx) if cli_ctx else (None, 0)
+        entry = session.get(key) if session is not None and not refresh else None
+        if entry and entry.get('expires_on', 0) > time.time():
+            resource_types, from_disk = [(t, v) for t, v in entry['resource_types']], True
+        else:
+            provider = rcf.providers.get(resource_provider_namespace)
+            resource_types, from_disk = [(t.resource_type, list(t.api_versions or []))
+                                         for t in provider.resource_types], False
+            if session is not None:
+                now = time.time()
+                # drop the expired entries while at it
+                session.data = {k: v for k, v in session.data.items() if v.get('expires_on', 0) > now}
+                session[key] = {'resource_types': resource_types, 'expires_on': now + ttl}
+        _provider_resource_types[key] = (resource_types, from_disk)
+        return resource_types
+
+
 class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
     def __init__(self, cli_ctx,
                  resource_group_name=None, resource_provider_namespace=None,
@@ -1801,14 +1903,15 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
         self.rcf = rcf or _resource_client_factory(cli_ctx)
         if api_version is None:
             if resource_id:
-                api_version = _ResourceUtils._resolve_api_version_by_id(self.rcf, resource_id)
+                api_version = _ResourceUtils._resolve_api_version_by_id(self.rcf, resource_id, cli_ctx=cli_ctx)
             else:
                 _validate_resource_inputs(resource_group_name, resource_provider_namespace,
                                           resource_type, resource_name)
                 api_version = _ResourceUtils.resolve_api_version(self.rcf,
                                                                  resource_provider_namespace,
                                                                  parent_resource_path,
-                                                                 resource_type)
+                                                                 resource_type,
+                                                                 cli_ctx=cli_ctx)
 
         self.resource_group_name = resource_group_name
         self.resource_provider_namespace = resource_provider_namespace
@@ -1977,25 +2080,27 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
                                     self.rcf.resources.config.long_running_operation_timeout)
 
     @staticmethod
-    def resolve_api_version(rcf, resource_provider_namespace, parent_resource_path, resource_type):
-        provider = rcf.providers.get(resource_provider_namespace)
-
+    def resolve_api_version(rcf, resource_provider_namespace, parent_resource_path, resource_type, cli_ctx=None):
         # If available, we will use parent resource's api-version
         resource_type_str = (parent_resource_path.split('/')[0] if parent_resource_path else resource_type)
 
-        rt = [t for t in provider.resource_types
-              if t.resource_type.lower() == resource_type_str.lower()]
+        def _find_resource_type(refresh=False):
+            return [(t, v) for t, v in _get_provider_resource_types(rcf, resource_provider_namespace, cli_ctx, refresh)
+                    if t.lower() == resource_type_str.lower()]
+
+        # the resource type may have been added to the provider since it was cached
+        rt = _find_resource_type() or _find_resource_type(refresh=True)
         if not rt:
             raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
-        if len(rt) == 1 and rt[0].api_versions:
-            npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-            return npv[0] if npv else rt[0].api_versions[0]
+        if len(rt) == 1 and rt[0][1]:
+            npv = [v for v in rt[0][1] if 'preview' not in v.lower()]
+            return npv[0] if npv else rt[0][1][0]
         raise IncorrectUsageError(
             'API version is required and could not be resolved for resource {}'
             .format(resource_type))
 
     @staticmethod
-    def _resolve_api_version_by_id(rcf, resource_id):
+    def _resolve_api_version_by_id(rcf, resource_id, cli_ctx=None):
         parts = parse_resource_id(resource_id)
         namespace = parts.get('child_namespace_1', parts['namespace'])
         if parts.get('child_type_2'):
@@ -2014,4 +2119,4 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
             parent = None
             resource_type = parts['type']
 
-        return _ResourceUtils.resolve_api_version(rcf, namespace, parent, resource_type)
+        return _ResourceUtils.resolve_api_version(rcf, namespace, parent, resource_type, cli_ctx=cli_ctx)
@@ -78,6 +78,44 @@ class TestApiCheck(unittest.TestCase):
                                    resource_group_name='rg', rcf=rcf)
         self.assertEqual(res_utils.api_version, "2005-01-01-preview")
 
+    def test_resolve_api_provider_cached(self):
+        # Verifies the provider is looked up once, and then read from the disk cache in the next invocations.
+        import shutil
+        import tempfile
+        import mock
+        from azure.cli.core.mock import DummyCli
+        from azure.cli.command_modules.resource import custom
+
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        self.addCleanup(custom._provider_cache.clear)
+        self.addCleanup(custom._provider_resource_types.clear)
+        cli = DummyCli()
+        rcf = self._get_mock_client()
+        rcf.config.base_url = 'https://management.azure.com'
+        rcf.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        with mock.patch('azure.cli.core.api.get_config_dir', return_value=config_dir):
+            for name in ['vnet1', 'vnet2', 'vnet3']:
+                res_utils = _ResourceUtils(cli, resource_type='Mock/test', resource_name=name,
+                                           resource_group_name='rg', rcf=rcf)
+                self.assertEqual(res_utils.api_version, "2016-01-01")
+            self.assertEqual(rcf.providers.get.call_count, 1)
+
+            custom._provider_resource_types.clear()
+            custom._provider_cache.clear()
+            res_utils = _ResourceUtils(cli, resource_type='Mock/foo', resource_name='vnet1',
+                                       resource_group_name='rg', rcf=rcf)
+            self.assertEqual(res_utils.api_version, "1999-01-01")
+            self.assertEqual(rcf.providers.get.call_count, 1)
+
+            # a resource type missing from the disk cache is looked up again
+            rcf.providers.get.return_value.resource_types.append(
+                self._get_mock_resource_type('new', ['2019-01-01']))
+            res_utils = _ResourceUtils(cli, resource_type='Mock/new', resource_name='vnet1',
+                                       resource_group_name='rg', rcf=rcf)
+            self.assertEqual(res_utils.api_version, "2019-01-01")
+            self.assertEqual(rcf.providers.get.call_count, 2)
+
     def _get_mock_client(self):
         client = MagicMock()
         provider = MagicMock()
@@ -18,7 +18,7 @@ except ImportError:
 from azure.cli.core.util import CLIError, get_file_json, shell_safe_json_parse
 from azure.cli.command_modules.resource.custom import \
     (_get_missing_parameters, _extract_lock_params, _process_parameters, _find_missing_parameters,
-     _prompt_for_parameters, _load_file_string_or_uri)
+     _prompt_for_parameters, _load_file_string_or_uri, _order_by_dependency, _delete_resources_in_passes)
 
 
 def _simulate_no_tty():
@@ -28,6 +28,32 @@ def _simulate_no_tty():
 
 @mock.patch('knack.prompting.verify_is_a_tty', _simulate_no_tty)
 class TestCustom(unittest.TestCase):
+    def test_order_by_dependency(self):
+        vnet = '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Network/virtualNetworks/vnet'
+        ids = [vnet, vnet + '/subnets/a', '/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Web/sites/app',
+               vnet.upper() + '/subnets/b/', vnet + 'x']
+        waves = _order_by_dependency(ids, list(range(len(ids))))
+        self.assertEqual(waves, [[1, 2, 3, 4], [0]])
+
+    def test_delete_resources_in_passes(self):
+        from msrestazure.azure_exceptions import CloudError
+        deleted = []
+
+        def _create_util(name, depends_on=None, fails=False):
+            def _delete():
+                if fails or (depends_on and depends_on not in deleted):
+                    raise CloudError(mock.MagicMock(status_code=409), error='{} is in use'.format(name))
+                operation = mock.MagicMock()
+                operation.result.side_effect = lambda: deleted.append(name) or name
+                return operation
+            return mock.MagicMock(delete=_delete), {'name': name}
+
+        results, failed = _delete_resources_in_passes(
+            [_create_util('vnet', depends_on='nic'), _create_util('nic'), _create_util('bad', fails=True)], 2)
+        self.assertEqual(results, ['nic', 'vnet'])
+        self.assertEqual([id_dict['name'] for _, id_dict in failed], ['bad'])
+        self.assertIsInstance(failed[0][1]['error'], CloudError)
+
     def test_file_string_or_uri(self):
         data = '{ "some": "data here"}'
         with tempfile.NamedTemporaryFile(delete=False) as tmp:
@@ -5,8 +5,6 @@
 
 from azure.cli.core import AzCommandsLoader
 
-import azure.cli.command_modules.sqlvm._help  # pylint: disable=unused-import
-
 
 # pylint: disable=line-too-long
 class SqlVmCommandsLoader(AzCommandsLoader):
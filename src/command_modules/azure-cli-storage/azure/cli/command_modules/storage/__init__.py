@@ -7,8 +7,6 @@ from azure.cli.core import AzCommandsLoader
 from azure.cli.core.profiles import ResourceType
 from azure.cli.core.commands import AzCommandGroup, AzArgumentContext
 
-import azure.cli.command_modules.storage._help  # pylint: disable=unused-import
-
 
 class StorageCommandsLoader(AzCommandsLoader):
     def __init__(self, cli_ctx=None):
@@ -197,7 +195,8 @@ If you want to use the old authentication method and allow querying for the righ
                                   'used in conjunction with either storage account key or a SAS token. If neither are '
                                   'present, the command will try to query the storage account key using the '
                                   'authenticated Azure account. If a large number of storage commands are executed the '
-                                  'API quota may be hit')
+                                  'API quota may be hit. The queried key is cached for 5 minutes, which can be changed '
+                                  'with `account_cache_ttl` in the [storage] section of the config file.')
         command.add_argument('account_key', '--account-key', required=False, default=None,
                              arg_group=group_name,
                              help='Storage account key. Must be used in conjunction with storage account name. '
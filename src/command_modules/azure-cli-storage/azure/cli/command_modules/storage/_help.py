@@ -28,6 +28,30 @@ helps['storage entity insert'] = """
           short-summary: The server timeout, expressed in seconds.
 """
 
+helps['storage entity insert-batch'] = """
+    type: command
+    short-summary: Insert the entities of a CSV or JSON lines file into a table.
+    long-summary: >
+        The file is read as a stream. Its entities are grouped by PartitionKey into transactions of up to 100 entities,
+        which are submitted in parallel. Every entity must have a PartitionKey and a RowKey. The numeric values of the
+        other properties are converted to numbers, as with `az storage entity insert`. The empty cells of a CSV file
+        are skipped.
+    parameters:
+        - name: --table-name -t
+          type: string
+          short-summary: The name of the table to insert the entities into.
+        - name: --if-exists
+          type: string
+          short-summary: Behavior when an entity already exists for the specified PartitionKey and RowKey.
+        - name: --timeout
+          short-summary: The server timeout of each transaction, expressed in seconds.
+    examples:
+        - name: Load a table from a CSV file whose header names the properties.
+          text: az storage entity insert-batch -t MyTable -s ./export.csv --account-name MyStorageAccount
+        - name: Insert or replace the entities of a JSON lines file, with one JSON object per line.
+          text: az storage entity insert-batch -t MyTable -s ./export.jsonl --if-exists replace --account-name MyStorageAccount
+"""
+
 helps['storage blob upload'] = """
     type: command
     short-summary: Upload a file to a storage blob.
@@ -178,6 +202,14 @@ helps['storage account keys list'] = """
           text: az storage account keys list -g MyResourceGroup -n MyStorageAccount
 """
 
+helps['storage account keys renew'] = """
+    type: command
+    short-summary: Regenerate one of the access keys for a storage account.
+    examples:
+        - name: Regenerate the primary key of a storage account.
+          text: az storage account keys renew -g MyResourceGroup -n MyStorageAccount --key primary
+"""
+
 helps['storage blob'] = """
     type: group
     short-summary: Manage object storage for unstructured data (blobs).
@@ -280,6 +312,8 @@ helps['storage blob set-tier'] = """
 helps['storage blob upload-batch'] = """
     type: command
     short-summary: Upload files from a local directory to a blob container.
+    long-summary: Files are uploaded in parallel. If the upload is interrupted, running the same command again resumes
+                  it, skipping the files which were uploaded and haven't changed since.
     parameters:
         - name: --source -s
           type: string
@@ -317,11 +351,14 @@ helps['storage blob upload-batch'] = """
     examples:
         - name: Upload all files that end with .py unless blob exists and has been modified since given date.
           text: az storage blob upload-batch -d MyContainer --account-name MyStorageAccount -s directory_path --pattern *.py --if-unmodified-since 2018-08-27T20:51Z
+        - name: Upload all files of a directory, 32 files at a time.
+          text: az storage blob upload-batch -d MyContainer --account-name MyStorageAccount -s directory_path --max-parallel 32
 """
 
 helps['storage blob download-batch'] = """
     type: command
     short-summary: Download blobs from a blob container recursively.
+    long-summary: Blobs are downloaded in parallel, starting while the rest of the container is still being listed.
     parameters:
         - name: --source -s
           type: string
@@ -340,11 +377,14 @@ helps['storage blob download-batch'] = """
     examples:
         - name: Download all blobs that end with .py
           text: az storage blob download-batch -d . --pattern *.py -s MyContainer --account-name MyStorageAccount
+        - name: Synchronize a local directory with a container, downloading only the blobs which changed.
+          text: az storage blob download-batch -d ./MyContainer -s MyContainer --account-name MyStorageAccount --skip-unchanged
 """
 
 helps['storage blob delete-batch'] = """
     type: command
     short-summary: Delete blobs from a blob container recursively.
+    long-summary: Blobs are deleted in parallel, starting while the rest of the container is still being listed.
     parameters:
         - name: --source -s
           type: string
@@ -381,6 +421,7 @@ helps['storage blob copy start'] = """
 helps['storage blob copy start-batch'] = """
     type: command
     short-summary: Copy multiple blobs or files to a blob container. Use `az storage blob show` to check the status of the blobs.
+    long-summary: The copies are started in parallel. With `--wait`, the command returns once all of them have completed.
     parameters:
         - name: --destination-container -c
           type: string
@@ -632,6 +673,7 @@ helps['storage file download-batch'] = """
 helps['storage file delete-batch'] = """
     type: command
     short-summary: Delete files from an Azure Storage File Share.
+    long-summary: Files are deleted in parallel, starting while the rest of the share is still being listed.
     parameters:
         - name: --source -s
           type: string
@@ -647,6 +689,7 @@ helps['storage file delete-batch'] = """
 helps['storage file copy start-batch'] = """
     type: command
     short-summary: Copy multiple files or blobs to a file share.
+    long-summary: The copies are started in parallel. With `--wait`, the command returns once all of them have completed.
     parameters:
         - name: --destination-share
           type: string
@@ -61,6 +61,10 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
                                     action='store_true', validator=add_progress_callback)
     socket_timeout_type = CLIArgumentType(help='The socket timeout(secs), used by the service to regulate data flow.',
                                           type=int)
+    max_parallel_type = CLIArgumentType(
+        type=int, options_list=['--max-parallel'],
+        help='Maximum number of items to process in parallel. The default can be configured with `max_parallel` in the '
+             '[storage] section of the config file or the AZURE_STORAGE_MAX_PARALLEL environment variable. Default: 8.')
     num_results_type = CLIArgumentType(
         default=5000, help='Specifies the maximum number of results to return. Provide "*" to return all.',
         validator=validate_storage_data_plane_list)
@@ -296,6 +300,8 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('maxsize_condition', arg_group='Content Control')
         c.argument('validate_content', action='store_true', min_api='2016-05-31', arg_group='Content Control')
         c.argument('blob_type', options_list=('--type', '-t'), arg_type=get_enum_type(get_blob_types()))
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of files to upload in parallel. The default '
+                   'can be configured with `max_parallel` in the [storage] section of the config file. Default: 8.')
         c.extra('no_progress', progress_type)
         c.extra('socket_timeout', socket_timeout_type)
 
@@ -316,6 +322,12 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('socket_timeout', socket_timeout_type)
         c.argument('max_connections', type=int,
                    help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of blobs to download in parallel. The '
+                   'default can be configured with `max_parallel` in the [storage] section of the config file. '
+                   'Default: 8.')
+        c.argument('skip_unchanged', action='store_true',
+                   help='Skip the blobs whose local file is unchanged: it has the same size and either the '
+                        'modification time of the blob or the same MD5 hash.')
 
     with self.argument_context('storage blob delete') as c:
         from .sdkutil import get_delete_blob_snapshot_type_names
@@ -327,6 +339,9 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('delete_snapshots', arg_type=get_enum_type(get_delete_blob_snapshot_type_names()),
                    help='Required if the blob has associated snapshots.')
         c.argument('lease_id', help='Required if the blob has an active lease.')
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of blobs to delete in parallel. The '
+                   'default can be configured with `max_parallel` in the [storage] section of the config file. '
+                   'Default: 8.')
 
     with self.argument_context('storage blob lease') as c:
         c.argument('lease_duration', type=int)
@@ -349,6 +364,14 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
 
         c.register_source_uri_arguments(validator=validate_source_uri)
 
+    with self.argument_context('storage blob copy start-batch') as c:
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of copies to start, or poll, in parallel. '
+                   'The default can be configured with `max_parallel` in the [storage] section of the config file. '
+                   'Default: 8.')
+        c.argument('wait', action='store_true',
+                   help='Wait for the copies to complete, polling their status and restarting the copies which '
+                        'fail, and report a summary.')
+
     with self.argument_context('storage blob copy start-batch', arg_group='Copy Source') as c:
         from azure.cli.command_modules.storage._validators import get_source_file_or_blob_service_client
 
@@ -618,12 +641,23 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
     with self.argument_context('storage file delete-batch') as c:
         from ._validators import process_file_batch_source_parameters
         c.argument('source', options_list=('--source', '-s'), validator=process_file_batch_source_parameters)
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of files to delete in parallel. The '
+                   'default can be configured with `max_parallel` in the [storage] section of the config file. '
+                   'Default: 8.')
 
     with self.argument_context('storage file copy start') as c:
         from azure.cli.command_modules.storage._validators import validate_source_uri
 
         c.register_source_uri_arguments(validator=validate_source_uri)
 
+    with self.argument_context('storage file copy start-batch') as c:
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of copies to start, or poll, in parallel. '
+                   'The default can be configured with `max_parallel` in the [storage] section of the config file. '
+                   'Default: 8.')
+        c.argument('wait', action='store_true',
+                   help='Wait for the copies to complete, polling their status and restarting the copies which '
+                        'fail, and report a summary.')
+
     with self.argument_context('storage file copy start-batch', arg_group='Copy Source') as c:
         from ._validators import get_source_file_or_blob_service_client
         c.argument('source_client', ignore_type, validator=get_source_file_or_blob_service_client)
@@ -736,6 +770,16 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
     with self.argument_context('storage entity insert') as c:
         c.argument('if_exists', arg_type=get_enum_type(['fail', 'merge', 'replace']))
 
+    with self.argument_context('storage entity insert-batch') as c:
+        c.argument('if_exists', arg_type=get_enum_type(['fail', 'merge', 'replace']))
+        c.argument('source', options_list=('--source', '-s'), type=file_type, completer=FilesCompleter(),
+                   help='The CSV or JSON lines file of the entities.')
+        c.argument('source_format', options_list='--format', arg_type=get_enum_type(['csv', 'jsonl']),
+                   help='The format of the source file. Default: csv if its extension is .csv, jsonl otherwise.')
+        c.argument('max_parallel', max_parallel_type, help='Maximum number of batches to insert in parallel. The '
+                   'default can be configured with `max_parallel` in the [storage] section of the config file. '
+                   'Default: 8.')
+
     with self.argument_context('storage entity query') as c:
         c.argument('accept', default='minimal', validator=validate_table_payload_format,
                    arg_type=get_enum_type(['none', 'minimal', 'full']),
@@ -26,14 +26,42 @@ logger = get_logger(__name__)
 # pylint: disable=inconsistent-return-statements,too-many-lines
 def _query_account_key(cli_ctx, account_name):
     """Query the storage account key. This is used when the customer doesn't offer account key but name."""
-    rg, scf = _query_account_rg(cli_ctx, account_name)
+    from msrestazure.azure_exceptions import CloudError
+    from azure.cli.command_modules.storage.account_cache import StorageAccountCache
+
+    cache = StorageAccountCache(cli_ctx)
+    key = cache.get_key(account_name)
+    if key:
+        logger.debug("Using the cached key of storage account '%s'.", account_name)
+        return key
+
+    rg = cache.get_resource_group(account_name)
+    if rg:
+        # the resource group is known, so skip listing the storage accounts of the subscription
+        scf = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_STORAGE)
+        try:
+            key = _list_account_key(cli_ctx, scf, rg, account_name)
+        except CloudError as ex:
+            if ex.status_code != 404:
+                raise
+            # the account was moved or deleted since it was cached
+            cache.invalidate(account_name)
+            rg = None
+    if not rg:
+        rg, scf = _query_account_rg(cli_ctx, account_name)
+        key = _list_account_key(cli_ctx, scf, rg, account_name)
+    cache.set(account_name, rg, key)
+    return key
+
+
+def _list_account_key(cli_ctx, scf, resource_group_name, account_name):
     t_storage_account_keys = get_sdk(
         cli_ctx, ResourceType.MGMT_STORAGE, 'models.storage_account_keys#StorageAccountKeys')
 
     if t_storage_account_keys:
-        return scf.storage_accounts.list_keys(rg, account_name).key1
+        return scf.storage_accounts.list_keys(resource_group_name, account_name).key1
     # of type: models.storage_account_list_keys_result#StorageAccountListKeysResult
-    return scf.storage_accounts.list_keys(rg, account_name).keys[0].value  # pylint: disable=no-member
+    return scf.storage_accounts.list_keys(resource_group_name, account_name).keys[0].value  # pylint: disable=no-member
 
 
 def _query_account_rg(cli_ctx, account_name):
@@ -441,42 +469,14 @@ def validate_encryption_source(cmd, namespace):
 def validate_entity(namespace):
     """ Converts a list of key value pairs into a dictionary. Ensures that required
     RowKey and PartitionKey are converted to the correct case and included. """
-    values = dict(x.split('=', 1) for x in namespace.entity)
-    keys = values.keys()
-    for key in keys:
-        if key.lower() == 'rowkey':
-            val = values[key]
-            del values[key]
-            values['RowKey'] = val
-        elif key.lower() == 'partitionkey':
-            val = values[key]
-            del values[key]
-            values['PartitionKey'] = val
-    keys = values.keys()
-    missing_keys = 'RowKey ' if 'RowKey' not in keys else ''
-    missing_keys = '{}PartitionKey'.format(missing_keys) \
-        if 'PartitionKey' not in keys else missing_keys
+    from .util import get_missing_entity_keys, normalize_entity
+    # ensure numbers are converted from strings so querying will work correctly
+    values = normalize_entity(dict(x.split('=', 1) for x in namespace.entity))
+    missing_keys = get_missing_entity_keys(values)
     if missing_keys:
         import argparse
         raise argparse.ArgumentError(
-            None, 'incorrect usage: entity requires: {}'.format(missing_keys))
-
-    def cast_val(key, val):
-        """ Attempts to cast numeric values (except RowKey and PartitionKey) to numbers so they
-        can be queried correctly. """
-        if key in ['PartitionKey', 'RowKey']:
-            return val
-
-        def try_cast(to_type):
-            try:
-                return to_type(val)
-            except ValueError:
-                return None
-
-        return try_cast(int) or try_cast(float) or val
-
-    # ensure numbers are converted from strings so querying will work correctly
-    values = {key: cast_val(key, val) for key, val in values.items()}
+            None, 'incorrect usage: entity requires: {}'.format(' '.join(missing_keys)))
     namespace.entity = values
 
 
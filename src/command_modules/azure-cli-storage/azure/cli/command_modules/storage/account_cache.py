@@ -0,0 +1,120 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Local cache of the resource group and the key of the storage accounts, which saves the data-plane commands given
+an account name only from listing all the storage accounts of the subscription."""
+
+import json
+import os
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 300
+_CACHE_FILE_NAME = 'storageAccountCache.json'
+_KEY_FILE_NAME = 'storageAccountCache.key'
+
+
+def _write_private_file(path, content):
+    # readable by the current user only
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+
+
+class StorageAccountCache(object):
+    """
+    Caches the resource group of the storage accounts of the current subscription, and their key for a short time.
+
+    The keys are encrypted in the cache file, with a key kept in a separate file readable by the current user only.
+    The time the keys are cached for is `account_cache_ttl` in the [storage] section of the configuration, in seconds.
+    Setting it to 0 disables the cache.
+    """
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core.api import get_config_dir
+        from azure.cli.core.commands.client_factory import get_subscription_id
+        self.ttl = cli_ctx.config.getint('storage', 'account_cache_ttl', fallback=DEFAULT_TTL)
+        self.enabled = self.ttl > 0
+        self._path = os.path.join(get_config_dir(), _CACHE_FILE_NAME)
+        self._key_path = os.path.join(get_config_dir(), _KEY_FILE_NAME)
+        self._prefix = '{}/{}/'.format(cli_ctx.cloud.name, get_subscription_id(cli_ctx)) if self.enabled else None
+        self._fernet = None
+
+    def _load(self):
+        try:
+            with open(self._path, 'r') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _save(self, entries):
+        try:
+            _write_private_file(self._path, json.dumps(entries).encode('utf-8'))
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to save the storage account cache: %s", ex)
+
+    def _get_fernet(self):
+        from cryptography.fernet import Fernet
+        if self._fernet is None:
+            try:
+                with open(self._key_path, 'rb') as f:
+                    self._fernet = Fernet(f.read().strip())
+            except (IOError, OSError, ValueError):
+                key = Fernet.generate_key()
+                _write_private_file(self._key_path, key)
+                self._fernet = Fernet(key)
+        return self._fernet
+
+    def get_resource_group(self, account_name):
+        """ The cached resource group of the account, or None. """
+        if not self.enabled:
+            return None
+        return self._load().get(self._prefix + account_name, {}).get('resource_group')
+
+    def get_key(self, account_name):
+        """ The cached key of the account, or None if it isn't cached or has expired. """
+        from cryptography.fernet import InvalidToken
+        if not self.enabled:
+            return None
+        entry = self._load().get(self._prefix + account_name, {})
+        if not entry.get('key') or entry.get('expires_on', 0) < time.time():
+            return None
+        try:
+            return self._get_fernet().decrypt(entry['key'].encode('utf-8')).decode('utf-8')
+        except (InvalidToken, TypeError, ValueError):
+            return None
+
+    def set(self, account_name, resource_group, key=None):
+        """
+        Cache the resource group of the account and, optionally, its key.
+
+        :param account_name: The name of the storage account.
+        :param resource_group: The resource group of the storage account.
+        :param key: An account key, cached for `ttl` seconds.
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        # drop the keys which have expired
+        entries = {name: entry if entry.get('expires_on', 0) >= now else {'resource_group': entry.get('resource_group')}
+                   for name, entry in self._load().items() if isinstance(entry, dict)}
+        entry = {'resource_group': resource_group}
+        if key:
+            entry['key'] = self._get_fernet().encrypt(key.encode('utf-8')).decode('utf-8')
+            entry['expires_on'] = now + self.ttl
+        entries[self._prefix + account_name] = entry
+        self._save(entries)
+
+    def invalidate(self, account_name):
+        """ Remove the account from the cache, e.g. once its keys are regenerated or it is deleted. """
+        if not self.enabled:
+            return
+        entries = self._load()
+        if entries.pop(self._prefix + account_name, None) is not None:
+            self._save(entries)
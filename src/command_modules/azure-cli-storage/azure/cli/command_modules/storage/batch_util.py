@@ -0,0 +1,360 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Helpers of the batch commands: a worker pool, an aggregated progress report and a resumable journal."""
+
+import os
+import threading
+import timeit
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_PARALLEL = 8
+# connections the requests session of a storage client keeps per host unless it is told otherwise
+_DEFAULT_POOL_SIZE = 10
+_JOURNAL_DIR_NAME = 'storage_batch_journals'
+
+
+def get_max_parallel(cli_ctx, max_parallel=None):
+    """ The number of items a batch command processes in parallel: the given value, `storage.max_parallel` from the
+    configuration or 8. """
+    from knack.util import CLIError
+    max_parallel = max_parallel or cli_ctx.config.getint('storage', 'max_parallel', fallback=DEFAULT_MAX_PARALLEL)
+    if max_parallel < 1:
+        raise CLIError('usage error: --max-parallel must be a positive integer')
+    return max_parallel
+
+
+def size_connection_pool(client, connections):
+    """ Let the requests session of a storage client keep enough connections open for the workers of a batch. """
+    from requests.adapters import HTTPAdapter
+    session = getattr(client, 'request_session', None)
+    if session is None or connections <= _DEFAULT_POOL_SIZE:
+        return
+    adapter = HTTPAdapter(pool_connections=_DEFAULT_POOL_SIZE, pool_maxsize=connections)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def run_batch(func, items, max_parallel=DEFAULT_MAX_PARALLEL):
+    """
+    Call `func` for every item with a pool of worker threads and yield the results in the order of the items.
+
+    Items are consumed lazily, so that they can be produced (e.g. listed) while the first ones are being processed. The
+    first exception stops the batch: the items which haven't started are cancelled and the exception is raised.
+
+    :param func: The function called with each item.
+    :param items: An iterable of the items.
+    :param max_parallel: The maximum number of items processed at the same time.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    if max_parallel < 2:
+        for item in items:
+            yield func(item)
+        return
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                # bound the number of results waiting to be consumed
+                if len(pending) >= max_parallel * 4:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class BatchProgress(object):  # pylint: disable=too-many-instance-attributes
+    """ Aggregated progress of a batch: items done out of the total, throughput and estimated time remaining.
+
+    It is safe to update from the workers of a batch. """
+
+    def __init__(self, cli_ctx, total, total_bytes=None, enabled=True, unit='files', interval=0.5):
+        """
+        :param total: The number of items in the batch. None if unknown, e.g. while they are still being listed.
+        :param total_bytes: The size of the items in the batch, in bytes. None if unknown.
+        :param enabled: Whether to write the progress to stderr.
+        :param unit: The name of the items shown in the report.
+        :param interval: Minimum number of seconds between two updates of the report.
+        """
+        self.cli_ctx = cli_ctx
+        self.total = total
+        self.total_bytes = total_bytes
+        self.enabled = enabled
+        self.unit = unit
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes_done = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._start = timeit.default_timer()
+        self._last_report = None
+        self._controller = None
+
+    def get_callback(self, item):
+        """ A progress callback for the transfer of a single item, which reports the bytes transferred so far. """
+        def _update(current, _):
+            with self._lock:
+                self._in_flight[item] = current or 0
+                self._report()
+        return _update
+
+    def add_total(self, count=1, size=0):
+        """ Add items to the total, used while the items are still being listed. """
+        with self._lock:
+            self.total = (self.total or 0) + count
+            if size:
+                self.total_bytes = (self.total_bytes or 0) + size
+
+    def complete(self, item=None, size=0, failed=False, skipped=False, count=1):
+        """
+        Record that an item is done.
+
+        :param item: The item given to `get_callback`, if any.
+        :param size: The size of the item, in bytes.
+        :param failed: Whether the item failed.
+        :param skipped: Whether the item was skipped, e.g. because it is already up to date.
+        :param count: The number of items done, e.g. when they are processed in groups.
+        """
+        with self._lock:
+            self._in_flight.pop(item, None)
+            self.done += count
+            if failed or skipped:
+                # nothing was transferred, so it doesn't count towards the throughput
+                self.failed += count if failed else 0
+                self.skipped += count if skipped else 0
+                if self.total_bytes:
+                    self.total_bytes -= size
+            else:
+                self.bytes_done += size
+            self._report()
+
+    @property
+    def elapsed(self):
+        return timeit.default_timer() - self._start
+
+    def get_message(self):
+        from humanfriendly import format_size, format_timespan
+        elapsed = max(self.elapsed, 1e-3)
+        transferred = self.bytes_done + sum(self._in_flight.values())
+        parts = ['{}/{} {}'.format(self.done, self.total if self.total is not None else '?', self.unit)]
+        if transferred:
+            parts.append('{}/s'.format(format_size(int(transferred / elapsed))))
+        elif self.done:
+            # nothing is transferred, e.g. when deleting, so report the rate of the items instead
+            parts.append('{:.1f} {}/s'.format(self.done / elapsed, self.unit))
+        remaining = None
+        if self.total_bytes and transferred:
+            remaining = (self.total_bytes - transferred) * elapsed / transferred
+        elif self.total and self.done:
+            remaining = (self.total - self.done) * elapsed / self.done
+        if remaining is not None:
+            parts.append('ETA {}'.format(format_timespan(max(int(remaining), 0))))
+        return ', '.join(parts) + ' '
+
+    def _report(self):
+        if not self.enabled or not self.total:
+            return
+        now = timeit.default_timer()
+        if self._last_report is not None and now - self._last_report < self.interval and self.done < self.total:
+            return
+        self._last_report = now
+        if self._controller is None:
+            self._controller = self.cli_ctx.get_progress_controller(det=True)
+        self._controller.add(message=self.get_message(), value=min(self.done, self.total), total_val=self.total)
+
+    def end(self):
+        """ Stop reporting progress and return a summary of the batch. """
+        from humanfriendly import format_size, format_timespan
+        with self._lock:
+            if self._controller is not None:
+                self._controller.end(message=self.get_message())
+                self._controller = None
+            summary = '{} {} in {}'.format(self.done - self.failed - self.skipped, self.unit,
+                                           format_timespan(self.elapsed))
+            if self.bytes_done:
+                summary += ' ({}, {}/s)'.format(format_size(self.bytes_done),
+                                                format_size(int(self.bytes_done / max(self.elapsed, 1e-3))))
+            elif self.done:
+                summary += ' ({:.1f} {}/s)'.format(self.done / max(self.elapsed, 1e-3), self.unit)
+            return summary
+
+
+class BatchCopy(object):  # pylint: disable=too-few-public-methods
+    """ A server-side copy started by a batch command. """
+
+    def __init__(self, url, copy, get_copy, start_copy):
+        """
+        :param url: The URL of the destination.
+        :param copy: The copy properties returned when the copy was started.
+        :param get_copy: A function returning the current copy properties of the destination.
+        :param start_copy: A function starting the copy again and returning its copy properties.
+        """
+        self.url = url
+        self.copy = copy
+        self.get_copy = get_copy
+        self.start_copy = start_copy
+        self.retries = 0
+
+
+def _get_copied_bytes(copy):
+    # the progress of a copy is reported as '<bytes copied>/<total bytes>'
+    try:
+        return int(copy.progress.split('/')[0])
+    except (AttributeError, IndexError, ValueError):
+        return 0
+
+
+def wait_for_copies(cli_ctx, copies, max_parallel=DEFAULT_MAX_PARALLEL, progress_enabled=True, max_retries=2,
+                    poll_interval=2, max_poll_interval=30):
+    """
+    Poll the status of server-side copies in rounds until all of them have completed, restarting the copies which
+    failed or were aborted.
+
+    :param copies: The `BatchCopy` objects of the copies.
+    :param max_parallel: The maximum number of status requests sent at the same time.
+    :param progress_enabled: Whether to write the progress to stderr.
+    :param max_retries: The number of times a failed copy is restarted.
+    :param poll_interval: Seconds to wait before the first round. It doubles with every round, up to
+                          `max_poll_interval`.
+    :return: The copies which failed and a summary of the batch.
+    """
+    import time
+
+    progress = BatchProgress(cli_ctx, len(copies), enabled=progress_enabled, unit='copies')
+    failed = []
+
+    def _is_done(batch_copy):
+        status = getattr(batch_copy.copy, 'status', None)
+        if status == 'pending':
+            return False
+        if status in ('failed', 'aborted') and batch_copy.retries < max_retries:
+            logger.info("Restarting the copy to %s, which %s: %s", batch_copy.url, status,
+                        batch_copy.copy.status_description)
+            batch_copy.retries += 1
+            batch_copy.copy = batch_copy.start_copy()
+            return _is_done(batch_copy)
+        if status in ('failed', 'aborted'):
+            failed.append(batch_copy)
+            progress.complete(failed=True)
+        else:
+            progress.complete(size=_get_copied_bytes(batch_copy.copy))
+        return True
+
+    def _poll(batch_copy):
+        batch_copy.copy = batch_copy.get_copy()
+        return _is_done(batch_copy)
+
+    try:
+        pending = [c for c in copies if not _is_done(c)]
+        while pending:
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+            pending = [c for c, done in zip(pending, run_batch(_poll, pending, max_parallel)) if not done]
+    finally:
+        summary = progress.end()
+    retries = sum(c.retries for c in copies)
+    if retries:
+        summary += ', {} restarted'.format(retries)
+    if failed:
+        summary += ', {} failed'.format(len(failed))
+    return failed, summary
+
+
+def finish_copy_batch(cli_ctx, copies, wait=False, max_parallel=DEFAULT_MAX_PARALLEL):
+    """ Wait for the copies of a batch to complete if requested, and return the URLs of their destinations. """
+    if wait and copies:
+        failed, summary = wait_for_copies(cli_ctx, copies, max_parallel)
+        for batch_copy in failed:
+            logger.warning('Failed to copy %s: %s', batch_copy.url, batch_copy.copy.status_description)
+        logger.warning('Completed %s.', summary)
+    return [batch_copy.url for batch_copy in copies]
+
+
+class BatchJournal(object):
+    """ Records the items a batch has completed in a file, so that the batch skips them when it is run again after
+    being interrupted. The file is removed once the batch completes. """
+
+    def __init__(self, *key):
+        """
+        :param key: The values identifying the batch, e.g. the account, the container and the source directory.
+        """
+        import hashlib
+        import json
+        from azure.cli.core.api import get_config_dir
+
+        digest = hashlib.sha256(json.dumps([str(k) for k in key]).encode('utf-8')).hexdigest()
+        self.path = os.path.join(get_config_dir(), _JOURNAL_DIR_NAME, digest + '.jsonl')
+        self._completed = self._load()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        import json
+        completed = {}
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        completed[entry['name']] = entry['fingerprint']
+                    except (ValueError, KeyError, TypeError):
+                        # a partially written line of an interrupted batch
+                        continue
+        except (IOError, OSError):
+            pass
+        if completed:
+            logger.warning('Resuming an interrupted batch: %d items already completed will be skipped.', len(completed))
+        return completed
+
+    def is_completed(self, name, fingerprint):
+        """ Whether the item was completed by a previous run and hasn't changed since. """
+        return self._completed.get(name) == list(fingerprint)
+
+    def record(self, name, fingerprint):
+        """ Record that an item has been completed. """
+        import json
+        from .util import mkdir_p
+        line = json.dumps({'name': name, 'fingerprint': list(fingerprint)}) + '\n'
+        with self._lock:
+            if self._file is None:
+                mkdir_p(os.path.dirname(self.path))
+                self._file = open(self.path, 'a')
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self, completed=False):
+        """
+        Close the journal.
+
+        :param completed: Whether the batch completed, in which case the journal is removed.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if completed:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            elif os.path.exists(self.path):
+                logger.warning('The batch did not complete. Run the same command again to resume it.')
+
+
+def get_file_fingerprint(path):
+    """ Size and modification time of a local file, used to tell whether it changed since it was transferred. """
+    stat = os.stat(path)
+    return [stat.st_size, int(stat.st_mtime)]
@@ -46,7 +46,7 @@ def load_command_table(self, _):  # pylint: disable=too-many-locals, too-many-st
                             custom_command_type=storage_account_custom_type) as g:
         g.command('check-name', 'check_name_availability')
         g.custom_command('create', 'create_storage_account', min_api='2016-01-01')
-        g.command('delete', 'delete', confirmation=True)
+        g.custom_command('delete', 'delete_storage_account', confirmation=True)
         g.show_command('show', 'get_properties')
         g.custom_command('list', 'list_storage_accounts')
         g.custom_command('show-usage', 'show_storage_account_usage', min_api='2018-02-01')
@@ -54,7 +54,7 @@ def load_command_table(self, _):  # pylint: disable=too-many-locals, too-many-st
         g.custom_command('show-connection-string', 'show_storage_account_connection_string')
         g.generic_update_command('update', getter_name='get_properties', setter_name='update',
                                  custom_func_name='update_storage_account', min_api='2016-12-01')
-        g.command('keys renew', 'regenerate_key', transform=lambda x: getattr(x, 'keys', x))
+        g.custom_command('keys renew', 'regenerate_storage_account_key', transform=lambda x: getattr(x, 'keys', x))
         g.command('keys list', 'list_keys', transform=lambda x: getattr(x, 'keys', x))
 
     with self.command_group('storage account', cloud_data_plane_sdk) as g:
@@ -405,3 +405,4 @@ def load_command_table(self, _):  # pylint: disable=too-many-locals, too-many-st
                           exception_handler=show_exception_handler,
                           transform=transform_entity_result)
         g.storage_custom_command('insert', 'insert_table_entity')
+        g.storage_custom_command('insert-batch', 'insert_table_entities')
@@ -37,6 +37,19 @@ def create_storage_account(cmd, resource_group_name, account_name, sku=None, loc
     return scf.storage_accounts.create(resource_group_name, account_name, params)
 
 
+def delete_storage_account(cmd, client, resource_group_name, account_name):
+    from azure.cli.command_modules.storage.account_cache import StorageAccountCache
+    StorageAccountCache(cmd.cli_ctx).invalidate(account_name)
+    return client.delete(resource_group_name, account_name)
+
+
+def regenerate_storage_account_key(cmd, client, resource_group_name, account_name, key_name):
+    from azure.cli.command_modules.storage.account_cache import StorageAccountCache
+    # the cached key is about to be revoked
+    StorageAccountCache(cmd.cli_ctx).invalidate(account_name)
+    return client.regenerate_key(resource_group_name, account_name, key_name)
+
+
 def list_storage_accounts(cmd, resource_group_name=None):
     scf = storage_client_factory(cmd.cli_ctx)
     if resource_group_name:
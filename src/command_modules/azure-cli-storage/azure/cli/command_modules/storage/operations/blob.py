@@ -13,7 +13,7 @@ from azure.cli.command_modules.storage.util import (create_blob_service_from_sto
                                                     create_file_share_from_storage_client,
                                                     create_short_lived_share_sas,
                                                     create_short_lived_container_sas,
-                                                    filter_none, collect_blobs, collect_files,
+                                                    filter_none, collect_blobs, collect_files, iterate_blobs,
                                                     mkdir_p, guess_content_type, normalize_blob_file_path,
                                                     check_precondition_success)
 from azure.cli.command_modules.storage.url_quote_util import encode_for_url, make_encoded_file_url_and_params
@@ -88,8 +88,11 @@ def set_service_properties(client, parameters, delete_retention=None, delete_ret
 
 def storage_blob_copy_batch(cmd, client, source_client, container_name=None,
                             destination_path=None, source_container=None, source_share=None,
-                            source_sas=None, pattern=None, dryrun=False):
+                            source_sas=None, pattern=None, dryrun=False, max_parallel=None, wait=False):
     """Copy a group of blob or files to a blob container."""
+    from azure.cli.command_modules.storage.batch_util import (finish_copy_batch, get_max_parallel, run_batch,
+                                                              size_connection_pool)
+
     logger = None
     if dryrun:
         logger = get_logger(__name__)
@@ -100,6 +103,9 @@ def storage_blob_copy_batch(cmd, client, source_client, container_name=None,
         logger.warning('source type %s', 'blob' if source_container else 'file')
         logger.warning('    pattern %s', pattern)
         logger.warning(' operations')
+    # the operations of a dry run are listed in order
+    max_parallel = 1 if dryrun else get_max_parallel(cmd.cli_ctx, max_parallel)
+    size_connection_pool(client, max_parallel)
 
     if source_container:
         # copy blobs for blob container
@@ -118,9 +124,9 @@ def storage_blob_copy_batch(cmd, client, source_client, container_name=None,
                 return _copy_blob_to_blob_container(client, source_client, container_name, destination_path,
                                                     source_container, source_sas, blob_name)
 
-        return list(filter_none(action_blob_copy(blob) for blob in collect_blobs(source_client,
-                                                                                 source_container,
-                                                                                 pattern)))
+        # copies are started while the source container is still being listed
+        source_blobs = (blob_name for blob_name, _ in iterate_blobs(source_client, source_container, pattern))
+        copies = list(filter_none(run_batch(action_blob_copy, source_blobs, max_parallel)))
 
     elif source_share:
         # copy blob from file share
@@ -141,41 +147,22 @@ def storage_blob_copy_batch(cmd, client, source_client, container_name=None,
                 return _copy_file_to_blob_container(client, source_client, container_name, destination_path,
                                                     source_share, source_sas, dir_name, file_name)
 
-        return list(filter_none(action_file_copy(file) for file in collect_files(cmd,
-                                                                                 source_client,
-                                                                                 source_share,
-                                                                                 pattern)))
+        source_files = collect_files(cmd, source_client, source_share, pattern, max_parallel)
+        copies = list(filter_none(run_batch(action_file_copy, source_files, max_parallel)))
     else:
         raise ValueError('Fail to find source. Neither blob container or file share is specified')
 
+    return finish_copy_batch(cmd.cli_ctx, copies, wait, max_parallel)
 
-# pylint: disable=unused-argument
-def storage_blob_download_batch(client, source, destination, source_container_name, pattern=None, dryrun=False,
-                                progress_callback=None, max_connections=2):
-
-    def _download_blob(blob_service, container, destination_folder, normalized_blob_name, blob_name):
-        # TODO: try catch IO exception
-        destination_path = os.path.join(destination_folder, normalized_blob_name)
-        destination_folder = os.path.dirname(destination_path)
-        if not os.path.exists(destination_folder):
-            mkdir_p(destination_folder)
-
-        blob = blob_service.get_blob_to_path(container, blob_name, destination_path, max_connections=max_connections,
-                                             progress_callback=progress_callback)
-        return blob.name
 
-    source_blobs = collect_blobs(client, source_container_name, pattern)
-    blobs_to_download = {}
-    for blob_name in source_blobs:
-        # remove starting path seperator and normalize
-        normalized_blob_name = normalize_blob_file_path(None, blob_name)
-        if normalized_blob_name in blobs_to_download:
-            raise CLIError('Multiple blobs with download path: `{}`. As a solution, use the `--pattern` parameter '
-                           'to select for a subset of blobs to download OR utilize the `storage blob download` '
-                           'command instead to download individual blobs.'.format(normalized_blob_name))
-        blobs_to_download[normalized_blob_name] = blob_name
+# pylint: disable=unused-argument
+def storage_blob_download_batch(cmd, client, source, destination, source_container_name, pattern=None, dryrun=False,
+                                progress_callback=None, max_connections=2, max_parallel=None, skip_unchanged=False):
+    from azure.cli.command_modules.storage.batch_util import (BatchProgress, get_max_parallel, run_batch,
+                                                              size_connection_pool)
 
     if dryrun:
+        source_blobs = collect_blobs(client, source_container_name, pattern)
         logger = get_logger(__name__)
         logger.warning('download action: from %s to %s', source, destination)
         logger.warning('    pattern %s', pattern)
@@ -186,8 +173,90 @@ def storage_blob_download_batch(client, source, destination, source_container_na
             logger.warning('  - %s', b)
         return []
 
-    return list(_download_blob(client, source_container_name, destination, blob_normed, blobs_to_download[blob_normed])
-                for blob_normed in blobs_to_download)
+    max_parallel = get_max_parallel(cmd.cli_ctx, max_parallel)
+    size_connection_pool(client, max_parallel * max_connections)
+    progress = BatchProgress(cmd.cli_ctx, None, enabled=progress_callback is not None)
+
+    def _list_blobs_to_download():
+        # downloads start as soon as the first page of the listing arrives
+        download_paths = set()
+        for blob_name, properties in iterate_blobs(client, source_container_name, pattern):
+            # remove starting path seperator and normalize
+            normalized_blob_name = normalize_blob_file_path(None, blob_name)
+            if normalized_blob_name in download_paths:
+                raise CLIError('Multiple blobs with download path: `{}`. As a solution, use the `--pattern` parameter '
+                               'to select for a subset of blobs to download OR utilize the `storage blob download` '
+                               'command instead to download individual blobs.'.format(normalized_blob_name))
+            download_paths.add(normalized_blob_name)
+            progress.add_total(size=properties.content_length)
+            yield normalized_blob_name, blob_name, properties
+
+    def _download_blob(blob):
+        normalized_blob_name, blob_name, properties = blob
+        # TODO: try catch IO exception
+        destination_path = os.path.join(destination, normalized_blob_name)
+        if skip_unchanged and _is_local_file_unchanged(destination_path, properties):
+            progress.complete(size=properties.content_length, skipped=True)
+            return None
+
+        destination_folder = os.path.dirname(destination_path)
+        if not os.path.exists(destination_folder):
+            mkdir_p(destination_folder)
+
+        blob = client.get_blob_to_path(source_container_name, blob_name, destination_path,
+                                       max_connections=max_connections,
+                                       progress_callback=progress.get_callback(blob_name))
+        if skip_unchanged:
+            # the modification time of the file tells whether the blob changed the next time
+            _set_file_mtime(destination_path, blob.properties.last_modified)
+        progress.complete(blob_name, size=properties.content_length)
+        return blob.name
+
+    try:
+        results = [name for name in run_batch(_download_blob, _list_blobs_to_download(), max_parallel) if name]
+    finally:
+        summary = progress.end()
+    if progress.skipped:
+        get_logger(__name__).warning('%s of %s blobs skipped as they are unchanged', progress.skipped, progress.done)
+    get_logger(__name__).info('Downloaded %s.', summary)
+    return results
+
+
+def _is_local_file_unchanged(path, properties):
+    """ Whether the local file has the size of the blob, and either the modification time the blob had when it was
+    downloaded or the same MD5 hash. """
+    import calendar
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_size != properties.content_length:
+        return False
+    last_modified = properties.last_modified
+    if last_modified and int(stat.st_mtime) == calendar.timegm(last_modified.utctimetuple()):
+        return True
+    content_md5 = properties.content_settings.content_md5 if properties.content_settings else None
+    if content_md5 and _get_file_md5(path) == content_md5:
+        _set_file_mtime(path, last_modified)
+        return True
+    return False
+
+
+def _get_file_md5(path):
+    import base64
+    import hashlib
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode('utf-8')
+
+
+def _set_file_mtime(path, last_modified):
+    import calendar
+    if last_modified:
+        timestamp = calendar.timegm(last_modified.utctimetuple())
+        os.utime(path, (timestamp, timestamp))
 
 
 def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  # pylint: disable=too-many-locals
@@ -196,7 +265,7 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                               content_settings=None, metadata=None, validate_content=False,
                               maxsize_condition=None, max_connections=2, lease_id=None, progress_callback=None,
                               if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_parallel=None):
     def _create_return_result(blob_name, blob_content_settings, upload_result=None):
         blob_name = normalize_blob_file_path(destination_path, blob_name)
         return {
@@ -219,29 +288,61 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
         for src, dst in source_files or []:
             results.append(_create_return_result(dst, guess_content_type(src, content_settings, t_content_settings)))
     else:
+        from azure.cli.command_modules.storage.batch_util import (BatchJournal, BatchProgress, get_file_fingerprint,
+                                                                  get_max_parallel, run_batch, size_connection_pool)
+
         @check_precondition_success
         def _upload_blob(*args, **kwargs):
             return upload_blob(*args, **kwargs)
 
-        for src, dst in source_files or []:
-            logger.warning('uploading %s', src)
+        source_files = source_files or []
+        max_parallel = get_max_parallel(cmd.cli_ctx, max_parallel)
+        size_connection_pool(client, max_parallel * max_connections)
+        journal = BatchJournal('upload', client.account_name, destination_container_name, destination_path,
+                               source, pattern, blob_type)
+        progress = BatchProgress(cmd.cli_ctx, len(source_files),
+                                 total_bytes=sum(os.path.getsize(src) for src, _ in source_files),
+                                 enabled=progress_callback is not None)
+
+        def _upload_file(source_file):
+            src, dst = source_file
+            blob_name = normalize_blob_file_path(destination_path, dst)
+            fingerprint = get_file_fingerprint(src)
+            if journal.is_completed(blob_name, fingerprint):
+                progress.complete(size=fingerprint[0], skipped=True)
+                return None
+            logger.info('uploading %s', src)
             guessed_content_settings = guess_content_type(src, content_settings, t_content_settings)
-
-            include, result = _upload_blob(cmd, client, destination_container_name,
-                                           normalize_blob_file_path(destination_path, dst), src,
+            include, result = _upload_blob(cmd, client, destination_container_name, blob_name, src,
                                            blob_type=blob_type, content_settings=guessed_content_settings,
                                            metadata=metadata, validate_content=validate_content,
                                            maxsize_condition=maxsize_condition, max_connections=max_connections,
-                                           lease_id=lease_id, progress_callback=progress_callback,
+                                           lease_id=lease_id, progress_callback=progress.get_callback(src),
                                            if_modified_since=if_modified_since,
                                            if_unmodified_since=if_unmodified_since, if_match=if_match,
                                            if_none_match=if_none_match, timeout=timeout)
-            if include:
-                results.append(_create_return_result(dst, guessed_content_settings, result))
-
-        num_failures = len(source_files) - len(results)
+            progress.complete(src, size=fingerprint[0], failed=not include)
+            if not include:
+                return None
+            journal.record(blob_name, fingerprint)
+            return _create_return_result(dst, guessed_content_settings, result)
+
+        completed = False
+        try:
+            uploads = list(run_batch(_upload_file, source_files, max_parallel))
+            completed = True
+        finally:
+            summary = progress.end()
+            journal.close(completed)
+        results = [r for r in uploads if r]
+
+        if progress.skipped:
+            logger.warning('%s of %s files skipped as they were uploaded by the interrupted batch',
+                           progress.skipped, len(source_files))
+        num_failures = progress.failed
         if num_failures:
             logger.warning('%s of %s files not uploaded due to "Failed Precondition"', num_failures, len(source_files))
+        logger.warning('Uploaded %s.', summary)
     return results
 
 
@@ -344,9 +445,13 @@ def show_blob(cmd, client, container_name, blob_name, snapshot=None, lease_id=No
     return blob
 
 
-def storage_blob_delete_batch(client, source, source_container_name, pattern=None, lease_id=None,
+def storage_blob_delete_batch(cmd, client, source, source_container_name, pattern=None, lease_id=None,  # pylint: disable=too-many-locals
                               delete_snapshots=None, if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_parallel=None):
+    import sys
+    from azure.cli.command_modules.storage.batch_util import (BatchProgress, get_max_parallel, run_batch,
+                                                              size_connection_pool)
+
     @check_precondition_success
     def _delete_blob(blob_name):
         delete_blob_args = {
@@ -363,9 +468,9 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
         return client.delete_blob(**delete_blob_args)
 
     logger = get_logger(__name__)
-    source_blobs = list(collect_blobs(client, source_container_name, pattern))
 
     if dryrun:
+        source_blobs = list(collect_blobs(client, source_container_name, pattern))
         logger.warning('delete action: from %s', source)
         logger.warning('    pattern %s', pattern)
         logger.warning('  container %s', source_container_name)
@@ -375,10 +480,28 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
             logger.warning('  - %s', blob)
         return []
 
-    results = [result for include, result in (_delete_blob(blob) for blob in source_blobs) if include]
-    num_failures = len(source_blobs) - len(results)
-    if num_failures:
-        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, len(source_blobs))
+    max_parallel = get_max_parallel(cmd.cli_ctx, max_parallel)
+    size_connection_pool(client, max_parallel)
+    progress = BatchProgress(cmd.cli_ctx, None, enabled=sys.stderr.isatty(), unit='blobs')
+
+    def _list_blobs_to_delete():
+        # deletions start as soon as the first page of the listing arrives
+        for blob_name, _ in iterate_blobs(client, source_container_name, pattern):
+            progress.add_total()
+            yield blob_name
+
+    def _delete(blob_name):
+        include, _ = _delete_blob(blob_name)
+        progress.complete(skipped=not include)
+
+    try:
+        for _ in run_batch(_delete, _list_blobs_to_delete(), max_parallel):
+            pass
+    finally:
+        summary = progress.end()
+    if progress.skipped:
+        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', progress.skipped, progress.done)
+    logger.info('Deleted %s.', summary)
 
 
 def create_blob_url(client, container_name, blob_name, protocol=None, snapshot=None):
@@ -393,8 +516,7 @@ def _copy_blob_to_blob_container(blob_service, source_blob_service, destination_
                                                         sas_token=source_sas)
     destination_blob_name = normalize_blob_file_path(destination_path, source_blob_name)
     try:
-        blob_service.copy_blob(destination_container, destination_blob_name, source_blob_url)
-        return blob_service.make_blob_url(destination_container, destination_blob_name)
+        return _start_blob_copy(blob_service, destination_container, destination_blob_name, source_blob_url)
     except AzureException:
         error_template = 'Failed to copy blob {} to container {}.'
         raise CLIError(error_template.format(source_blob_name, destination_container))
@@ -411,8 +533,19 @@ def _copy_file_to_blob_container(blob_service, source_file_service, destination_
     destination_blob_name = normalize_blob_file_path(destination_path, source_path)
 
     try:
-        blob_service.copy_blob(destination_container, destination_blob_name, file_url)
-        return blob_service.make_blob_url(destination_container, destination_blob_name)
+        return _start_blob_copy(blob_service, destination_container, destination_blob_name, file_url)
     except AzureException as ex:
         error_template = 'Failed to copy file {} to container {}. {}'
         raise CLIError(error_template.format(source_file_name, destination_container, ex))
+
+
+def _start_blob_copy(blob_service, container_name, blob_name, source_url):
+    from azure.cli.command_modules.storage.batch_util import BatchCopy
+
+    def _start_copy():
+        return blob_service.copy_blob(container_name, blob_name, source_url)
+
+    def _get_copy():
+        return blob_service.get_blob_properties(container_name, blob_name).properties.copy
+
+    return BatchCopy(blob_service.make_blob_url(container_name, blob_name), _start_copy(), _get_copy, _start_copy)
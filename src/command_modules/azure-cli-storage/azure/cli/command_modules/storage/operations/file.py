@@ -10,7 +10,7 @@ Commands for storage file share operations
 import os
 from knack.log import get_logger
 
-from azure.cli.command_modules.storage.util import (filter_none, collect_blobs, collect_files,
+from azure.cli.command_modules.storage.util import (filter_none, collect_files, iterate_blobs,
                                                     create_blob_service_from_storage_client,
                                                     create_short_lived_container_sas, create_short_lived_share_sas,
                                                     guess_content_type)
@@ -135,10 +135,13 @@ def storage_file_download_batch(cmd, client, source, destination, pattern=None,
 
 def storage_file_copy_batch(cmd, client, source_client, destination_share=None, destination_path=None,
                             source_container=None, source_share=None, source_sas=None, pattern=None, dryrun=False,
-                            metadata=None, timeout=None):
+                            metadata=None, timeout=None, max_parallel=None, wait=False):
     """
     Copy a group of files asynchronously
     """
+    from azure.cli.command_modules.storage.batch_util import (finish_copy_batch, get_max_parallel, run_batch,
+                                                              size_connection_pool)
+
     logger = None
     if dryrun:
         logger = get_logger(__name__)
@@ -150,6 +153,9 @@ def storage_file_copy_batch(cmd, client, source_client, destination_share=None,
         logger.warning('source type %s', 'blob' if source_container else 'file')
         logger.warning('    pattern %s', pattern)
         logger.warning(' operations')
+    # the operations of a dry run are listed in order
+    max_parallel = 1 if dryrun else get_max_parallel(cmd.cli_ctx, max_parallel)
+    size_connection_pool(client, max_parallel)
 
     if source_container:
         # copy blobs to file share
@@ -175,8 +181,9 @@ def storage_file_copy_batch(cmd, client, source_client, destination_share=None,
                                                             metadata=metadata, timeout=timeout,
                                                             existing_dirs=existing_dirs)
 
-        return list(
-            filter_none(action_blob_copy(blob) for blob in collect_blobs(source_client, source_container, pattern)))
+        # copies are started while the source container is still being listed
+        source_blobs = (blob_name for blob_name, _ in iterate_blobs(source_client, source_container, pattern))
+        copies = list(filter_none(run_batch(action_blob_copy, source_blobs, max_parallel)))
 
     elif source_share:
         # copy files from share to share
@@ -204,29 +211,28 @@ def storage_file_copy_batch(cmd, client, source_client, destination_share=None,
                                                             destination_dir=destination_path, metadata=metadata,
                                                             timeout=timeout, existing_dirs=existing_dirs)
 
-        return list(filter_none(
-            action_file_copy(file) for file in collect_files(cmd, source_client, source_share, pattern)))
+        source_files = collect_files(cmd, source_client, source_share, pattern, max_parallel)
+        copies = list(filter_none(run_batch(action_file_copy, source_files, max_parallel)))
     else:
         # won't happen, the validator should ensure either source_container or source_share is set
         raise ValueError('Fail to find source. Neither blob container or file share is specified.')
 
+    return finish_copy_batch(cmd.cli_ctx, copies, wait, max_parallel)
+
 
-def storage_file_delete_batch(cmd, client, source, pattern=None, dryrun=False, timeout=None):
+def storage_file_delete_batch(cmd, client, source, pattern=None, dryrun=False, timeout=None, max_parallel=None):
     """
     Delete files from file share in batch
     """
-
-    def delete_action(file_pair):
-        delete_file_args = {'share_name': source, 'directory_name': file_pair[0], 'file_name': file_pair[1],
-                            'timeout': timeout}
-
-        return client.delete_file(**delete_file_args)
-
+    import sys
+    from azure.cli.command_modules.storage.batch_util import (BatchProgress, get_max_parallel, run_batch,
+                                                              size_connection_pool)
     from azure.cli.command_modules.storage.util import glob_files_remotely
-    source_files = list(glob_files_remotely(cmd, client, source, pattern))
+
+    logger = get_logger(__name__)
 
     if dryrun:
-        logger = get_logger(__name__)
+        source_files = list(glob_files_remotely(cmd, client, source, pattern))
         logger.warning('delete files from %s', source)
         logger.warning('    pattern %s', pattern)
         logger.warning('      share %s', source)
@@ -236,8 +242,31 @@ def storage_file_delete_batch(cmd, client, source, pattern=None, dryrun=False, t
             logger.warning('  - %s/%s', f[0], f[1])
         return []
 
-    for f in source_files:
-        delete_action(f)
+    max_parallel = get_max_parallel(cmd.cli_ctx, max_parallel)
+    # the directories are listed while the files are deleted
+    size_connection_pool(client, max_parallel * 2)
+    progress = BatchProgress(cmd.cli_ctx, None, enabled=sys.stderr.isatty())
+
+    def _list_files_to_delete():
+        # deletions start while the directories of the share are still being listed
+        for file_pair in glob_files_remotely(cmd, client, source, pattern, max_parallel):
+            progress.add_total()
+            yield file_pair
+
+    def delete_action(file_pair):
+        delete_file_args = {'share_name': source, 'directory_name': file_pair[0], 'file_name': file_pair[1],
+                            'timeout': timeout}
+
+        client.delete_file(**delete_file_args)
+        progress.complete()
+
+    try:
+        for _ in run_batch(delete_action, _list_files_to_delete(), max_parallel):
+            pass
+    finally:
+        summary = progress.end()
+    logger.info('Deleted %s.', summary)
+    return None
 
 
 def _create_file_and_directory_from_blob(file_service, blob_service, share, container, sas, blob_name,
@@ -255,8 +284,7 @@ def _create_file_and_directory_from_blob(file_service, blob_service, share, cont
     _make_directory_in_files_share(file_service, share, dir_name, existing_dirs)
 
     try:
-        file_service.copy_file(share, dir_name, file_name, blob_url, metadata, timeout)
-        return file_service.make_file_url(share, dir_name, file_name)
+        return _start_file_copy(file_service, share, dir_name, file_name, blob_url, metadata, timeout)
     except AzureException:
         error_template = 'Failed to copy blob {} to file share {}. Please check if you have permission to read ' \
                          'source or set a correct sas token.'
@@ -283,8 +311,7 @@ def _create_file_and_directory_from_file(file_service, source_file_service, shar
     _make_directory_in_files_share(file_service, share, dir_name, existing_dirs)
 
     try:
-        file_service.copy_file(share, dir_name, file_name, file_url, metadata, timeout)
-        return file_service.make_file_url(share, dir_name or None, file_name)
+        return _start_file_copy(file_service, share, dir_name or None, file_name, file_url, metadata, timeout)
     except AzureException:
         error_template = 'Failed to copy file {} from share {} to file share {}. Please check if ' \
                          'you have right permission to read source or set a correct sas token.'
@@ -292,6 +319,18 @@ def _create_file_and_directory_from_file(file_service, source_file_service, shar
         raise CLIError(error_template.format(file_name, source_share, share))
 
 
+def _start_file_copy(file_service, share, dir_name, file_name, source_url, metadata=None, timeout=None):
+    from azure.cli.command_modules.storage.batch_util import BatchCopy
+
+    def _start_copy():
+        return file_service.copy_file(share, dir_name, file_name, source_url, metadata, timeout)
+
+    def _get_copy():
+        return file_service.get_file_properties(share, dir_name, file_name).properties.copy
+
+    return BatchCopy(file_service.make_file_url(share, dir_name, file_name), _start_copy(), _get_copy, _start_copy)
+
+
 def _make_directory_in_files_share(file_service, file_share, directory_path, existing_dirs=None):
     """
     Create directories recursively.
@@ -312,7 +351,7 @@ def _make_directory_in_files_share(file_service, file_share, directory_path, exi
         p = os.path.dirname(p)
 
     for dir_name in reversed(parents):
-        if existing_dirs and (dir_name in existing_dirs):
+        if existing_dirs is not None and dir_name in existing_dirs:
             continue
 
         try:
@@ -321,5 +360,5 @@ def _make_directory_in_files_share(file_service, file_share, directory_path, exi
             from knack.util import CLIError
             raise CLIError('Failed to create directory {}'.format(dir_name))
 
-        if existing_dirs:
-            existing_dirs.add(directory_path)
+        if existing_dirs is not None:
+            existing_dirs.add(dir_name)
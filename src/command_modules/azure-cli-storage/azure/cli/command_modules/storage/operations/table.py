@@ -13,3 +13,130 @@ def insert_table_entity(client, table_name, entity, if_exists='fail', timeout=No
         return client.insert_or_replace_entity(table_name, entity, timeout)
     from knack.util import CLIError
     raise CLIError("Unrecognized value '{}' for --if-exists".format(if_exists))
+
+
+# entity-group transactions are limited to 100 entities of the same partition and a payload of 4 MiB
+_MAX_BATCH_ENTITIES = 100
+_MAX_BATCH_BYTES = 3 * 1024 * 1024
+# entities kept in memory at most while waiting for their partition to fill a batch
+_MAX_BUFFERED_ENTITIES = 10000
+
+
+def insert_table_entities(cmd, client, table_name, source, source_format=None, if_exists='fail', max_parallel=None,
+                          timeout=None):
+    """
+    Insert the entities of a CSV or JSON lines file into a table, in batches of entities of the same partition.
+    """
+    import sys
+    from knack.log import get_logger
+    from knack.util import CLIError
+    from azure.common import AzureHttpError
+    from azure.cli.command_modules.storage.batch_util import (BatchProgress, get_max_parallel, run_batch,
+                                                              size_connection_pool)
+
+    methods = {'fail': 'insert_entity', 'merge': 'insert_or_merge_entity', 'replace': 'insert_or_replace_entity'}
+    if if_exists not in methods:
+        raise CLIError("Unrecognized value '{}' for --if-exists".format(if_exists))
+
+    logger = get_logger(__name__)
+    max_parallel = get_max_parallel(cmd.cli_ctx, max_parallel)
+    size_connection_pool(client, max_parallel)
+    progress = BatchProgress(cmd.cli_ctx, None, enabled=sys.stderr.isatty(), unit='entities')
+
+    def _insert_batch(group):
+        first_line, entities = group
+        try:
+            with client.batch(table_name, timeout=timeout) as batch:
+                for entity in entities:
+                    getattr(batch, methods[if_exists])(entity)
+        except AzureHttpError as ex:
+            # the transaction is atomic, none of the entities of the batch was inserted
+            progress.complete(failed=True, count=len(entities))
+            return "Failed to insert the {} entities of partition '{}' starting at line {}: {}".format(
+                len(entities), entities[0]['PartitionKey'], first_line, ex)
+        progress.complete(count=len(entities))
+        return None
+
+    rows = _read_entity_rows(source, source_format or ('csv' if source.lower().endswith('.csv') else 'jsonl'))
+    try:
+        errors = [error for error in run_batch(_insert_batch, _group_entities(source, rows, progress), max_parallel)
+                  if error]
+    finally:
+        summary = progress.end()
+    for error in errors:
+        logger.warning(error)
+    if progress.failed:
+        logger.warning('%s of %s entities not inserted.', progress.failed, progress.done)
+    logger.warning('Inserted %s.', summary)
+
+
+def _read_entity_rows(source, source_format):
+    """ Yield the line number and the properties of every entity of the file. """
+    import io
+    import json
+    from knack.util import CLIError
+
+    with io.open(source, 'r', encoding='utf-8-sig', newline='' if source_format == 'csv' else None) as f:
+        if source_format == 'csv':
+            import csv
+            reader = csv.DictReader(f)
+            for row in reader:
+                # empty cells are properties the entity doesn't have
+                yield reader.line_num, {k: v for k, v in row.items() if k and v not in (None, '')}
+            return
+        for line_num, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                values = json.loads(line)
+            except ValueError as ex:
+                raise CLIError('{}: line {}: {}'.format(source, line_num, ex))
+            if not isinstance(values, dict):
+                raise CLIError('{}: line {}: an entity must be a JSON object'.format(source, line_num))
+            yield line_num, values
+
+
+def _group_entities(source, rows, progress):
+    """ Group the entities in batches of the same partition, yielding every batch with the line of its first entity
+    once it is full. """
+    import json
+    from knack.util import CLIError
+    from azure.cli.command_modules.storage.util import get_missing_entity_keys, normalize_entity
+
+    # partition key => [line of the first entity, entities, row keys, size]
+    groups = {}
+    buffered = [0]
+
+    def _pop(partition_key):
+        first_line, entities, _, _ = groups.pop(partition_key)
+        buffered[0] -= len(entities)
+        return first_line, entities
+
+    for line_num, values in rows:
+        entity = normalize_entity(values)
+        missing_keys = get_missing_entity_keys(entity)
+        if missing_keys:
+            raise CLIError('{}: line {}: entity requires: {}'.format(source, line_num, ' '.join(missing_keys)))
+        partition_key = entity['PartitionKey']
+        size = len(json.dumps(entity, default=str))
+        group = groups.get(partition_key)
+        # a batch can't contain the same entity twice
+        if group and (group[3] + size > _MAX_BATCH_BYTES or entity['RowKey'] in group[2]):
+            yield _pop(partition_key)
+            group = None
+        if group is None:
+            group = groups[partition_key] = [line_num, [], set(), 0]
+        group[1].append(entity)
+        group[2].add(entity['RowKey'])
+        group[3] += size
+        buffered[0] += 1
+        progress.add_total()
+
+        if len(group[1]) >= _MAX_BATCH_ENTITIES:
+            yield _pop(partition_key)
+        elif buffered[0] >= _MAX_BUFFERED_ENTITIES:
+            # too many partitions are filling up, send the largest one
+            yield _pop(max(groups, key=lambda k: len(groups[k][1])))
+
+    for partition_key in list(groups):
+        yield _pop(partition_key)
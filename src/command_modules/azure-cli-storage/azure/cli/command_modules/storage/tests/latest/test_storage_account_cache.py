@@ -0,0 +1,90 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core.mock import DummyCli
+from azure.cli.command_modules.storage.account_cache import StorageAccountCache
+from azure.cli.command_modules.storage._validators import _query_account_key
+
+
+def _create_account(name, resource_group):
+    account = mock.MagicMock(id='/subscriptions/sub/resourceGroups/{}/providers/Microsoft.Storage/'
+                                'storageAccounts/{}'.format(resource_group, name))
+    account.name = name
+    return account
+
+
+class TestStorageAccountCache(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.config_dir)
+        for patcher in [mock.patch('azure.cli.core.api.get_config_dir', return_value=self.config_dir),
+                        mock.patch('azure.cli.core.commands.client_factory.get_subscription_id', return_value='sub')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cli = DummyCli()
+
+    def test_account_cache(self):
+        cache = StorageAccountCache(self.cli)
+        self.assertIsNone(cache.get_key('account'))
+        cache.set('account', 'rg', 'secret')
+
+        cache = StorageAccountCache(self.cli)
+        self.assertEqual(cache.get_resource_group('account'), 'rg')
+        self.assertEqual(cache.get_key('account'), 'secret')
+        with open(os.path.join(self.config_dir, 'storageAccountCache.json')) as f:
+            self.assertNotIn('secret', f.read())
+
+        # the key expires, the resource group is kept
+        with mock.patch('time.time', return_value=cache.ttl + 1e10):
+            self.assertIsNone(cache.get_key('account'))
+        self.assertEqual(cache.get_resource_group('account'), 'rg')
+
+        cache.invalidate('account')
+        self.assertIsNone(cache.get_resource_group('account'))
+
+        with mock.patch.dict('os.environ', {'AZURE_STORAGE_ACCOUNT_CACHE_TTL': '0'}):
+            cache = StorageAccountCache(self.cli)
+            cache.set('account', 'rg', 'secret')
+            self.assertIsNone(cache.get_key('account'))
+        self.assertIsNone(StorageAccountCache(self.cli).get_resource_group('account'))
+
+    @mock.patch('azure.cli.command_modules.storage._validators.get_mgmt_service_client', autospec=True)
+    def test_query_account_key(self, get_client):
+        from msrestazure.azure_exceptions import CloudError
+        client = get_client.return_value
+        client.storage_accounts.list.return_value = [_create_account('other', 'rg0'), _create_account('account', 'rg1')]
+        client.storage_accounts.list_keys.return_value.keys[0].value = 'key1'
+
+        self.assertEqual(_query_account_key(self.cli, 'account'), 'key1')
+        self.assertEqual(_query_account_key(self.cli, 'account'), 'key1')
+        self.assertEqual(client.storage_accounts.list.call_count, 1)
+        self.assertEqual(client.storage_accounts.list_keys.call_count, 1)
+
+        # once the key expires, the cached resource group saves listing the accounts
+        with mock.patch('time.time', return_value=1e10):
+            self.assertEqual(_query_account_key(self.cli, 'account'), 'key1')
+        self.assertEqual(client.storage_accounts.list.call_count, 1)
+        client.storage_accounts.list_keys.assert_called_with('rg1', 'account')
+
+        # the account moved to another resource group
+        StorageAccountCache(self.cli).set('account', 'rg1')
+        client.storage_accounts.list.return_value = [_create_account('account', 'rg2')]
+        client.storage_accounts.list_keys.side_effect = [CloudError(mock.MagicMock(status_code=404), error='not found'),
+                                                         mock.DEFAULT]
+        self.assertEqual(_query_account_key(self.cli, 'account'), 'key1')
+        client.storage_accounts.list_keys.assert_called_with('rg2', 'account')
+        self.assertEqual(StorageAccountCache(self.cli).get_resource_group('account'), 'rg2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import mock
+
+from azure.cli.core.mock import DummyCli
+from azure.cli.command_modules.storage.batch_util import (BatchCopy, BatchJournal, BatchProgress, get_max_parallel,
+                                                          run_batch, wait_for_copies)
+
+
+class TestStorageBatchUtil(unittest.TestCase):
+
+    def test_run_batch_keeps_order(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def _square(value):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            # later items complete first
+            time.sleep(0.002 * (20 - value))
+            with lock:
+                running[0] -= 1
+            return value * value
+
+        self.assertEqual(list(run_batch(_square, iter(range(20)), 4)), [v * v for v in range(20)])
+        self.assertEqual(running[1], 4)
+        self.assertEqual(list(run_batch(_square, range(3), 1)), [0, 1, 4])
+
+    def test_run_batch_stops_on_error(self):
+        started = []
+
+        def _fail(value):
+            started.append(value)
+            if value == 0:
+                raise ValueError(value)
+            time.sleep(0.01)
+            return value
+
+        with self.assertRaises(ValueError):
+            list(run_batch(_fail, range(100), 2))
+        self.assertLess(len(started), 100)
+
+    def test_get_max_parallel(self):
+        from knack.util import CLIError
+        cli = DummyCli()
+        self.assertEqual(get_max_parallel(cli, 3), 3)
+        with mock.patch.dict('os.environ', {'AZURE_STORAGE_MAX_PARALLEL': '16'}):
+            self.assertEqual(get_max_parallel(cli), 16)
+        with self.assertRaises(CLIError):
+            get_max_parallel(cli, -1)
+
+    def test_batch_journal_resumes(self):
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        with mock.patch('azure.cli.core.api.get_config_dir', return_value=config_dir):
+            journal = BatchJournal('upload', 'account', 'container', '/data', None)
+            self.assertFalse(journal.is_completed('a.txt', [1, 2]))
+            journal.record('a.txt', [1, 2])
+            journal.record('b.txt', [3, 4])
+            journal.close()
+            self.assertTrue(os.path.exists(journal.path))
+
+            journal = BatchJournal('upload', 'account', 'container', '/data', None)
+            self.assertTrue(journal.is_completed('a.txt', [1, 2]))
+            # changed since it was uploaded
+            self.assertFalse(journal.is_completed('b.txt', [3, 5]))
+            self.assertFalse(BatchJournal('upload', 'account', 'other', '/data', None).is_completed('a.txt', [1, 2]))
+
+            journal.close(completed=True)
+            self.assertFalse(os.path.exists(journal.path))
+
+    def test_batch_progress(self):
+        progress = BatchProgress(DummyCli(), 4, total_bytes=400, enabled=False)
+        progress.complete(size=100)
+        progress.get_callback('b')(50, 100)
+        progress.complete(size=100, skipped=True)
+        progress.complete(size=0, failed=True)
+        self.assertEqual((progress.done, progress.skipped, progress.failed, progress.bytes_done), (3, 1, 1, 100))
+        self.assertEqual(progress.total_bytes, 300)
+        message = progress.get_message()
+        self.assertTrue(message.startswith('3/4 files, '))
+        self.assertIn('ETA', message)
+        self.assertTrue(progress.end().startswith('1 files in '))
+
+        # the rate of the items is reported when nothing is transferred
+        progress = BatchProgress(DummyCli(), 2, enabled=False, unit='blobs')
+        progress.complete()
+        self.assertIn(' blobs/s', progress.get_message())
+        self.assertTrue(progress.end().endswith(' blobs/s)'))
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_wait_for_copies(self, sleep):
+        def _create_copy(name, *statuses):
+            statuses = list(statuses)
+
+            def _next_status():
+                return mock.MagicMock(status=statuses.pop(0), progress='5/5', status_description='oops')
+
+            return BatchCopy(name, _next_status(), _next_status, _next_status)
+
+        copies = [_create_copy('done', 'success'),
+                  _create_copy('slow', 'pending', 'pending', 'success'),
+                  _create_copy('flaky', 'failed', 'pending', 'success'),
+                  _create_copy('broken', 'failed', 'failed', 'aborted')]
+        failed, summary = wait_for_copies(DummyCli(), copies, max_parallel=2, progress_enabled=False)
+
+        self.assertEqual([c.url for c in failed], ['broken'])
+        self.assertEqual([c.retries for c in copies], [0, 0, 1, 2])
+        self.assertTrue(summary.startswith('3 copies in '))
+        self.assertTrue(summary.endswith(', 3 restarted, 1 failed'))
+        # one sleep per round of polling, with a growing interval
+        self.assertEqual([c[0][0] for c in sleep.call_args_list], [2, 4])
+
+    def test_glob_files_remotely(self):
+        from azure.multiapi.storage.v2018_03_28.file.models import Directory, File
+        from azure.cli.command_modules.storage.util import glob_files_remotely
+
+        # a tree of 2 levels of 4 directories, with 2 files in every directory
+        def _list(_, directory):
+            time.sleep(0.001)
+            items = [File('a.txt'), File('b.py')]
+            if '/' not in directory:
+                items.extend(Directory('d{}'.format(i)) for i in range(4))
+            return iter(items)
+
+        client = mock.MagicMock()
+        client.list_directories_and_files.side_effect = _list
+        cmd = mock.MagicMock(cli_ctx=DummyCli())
+        cmd.get_models.return_value = (Directory, File)
+
+        files = list(glob_files_remotely(cmd, client, 'share', '*.py', max_parallel=4))
+        self.assertEqual(len(files), 1 + 4 + 16)
+        self.assertEqual(len(set(files)), len(files))
+        self.assertTrue(all(name == 'b.py' for _, name in files))
+        self.assertIn(('d3/d1', 'b.py'), files)
+        # with a single worker, the directories are listed breadth first
+        files = list(glob_files_remotely(cmd, client, 'share', None, max_parallel=1))
+        self.assertEqual(files[:4], [('', 'a.txt'), ('', 'b.py'), ('d0', 'a.txt'), ('d0', 'b.py')])
+
+    def test_insert_table_entities(self):
+        from azure.common import AzureHttpError
+        from knack.util import CLIError
+        from azure.cli.command_modules.storage.operations.table import insert_table_entities
+
+        source = os.path.join(tempfile.mkdtemp(), 'entities.csv')
+        self.addCleanup(shutil.rmtree, os.path.dirname(source))
+        with open(source, 'w') as f:
+            f.write('partitionkey,RowKey,count,ratio,name\n')
+            for i in range(250):
+                f.write('p{},{:04d},{},0.5,\n'.format(i % 2, i, i))
+            f.write('bad,0000,1,1,a\n')
+
+        batches = []
+        client = mock.MagicMock()
+
+        def _batch(table_name, timeout=None):
+            self.assertEqual(table_name, 'table')
+            batch = mock.MagicMock()
+            batches.append(batch)
+            if len(batches) == 1:
+                batch.__exit__.side_effect = AzureHttpError('conflict', 409)
+            return batch
+
+        client.batch.side_effect = _batch
+        insert_table_entities(mock.MagicMock(cli_ctx=DummyCli()), client, 'table', source, max_parallel=2)
+
+        entities = [[c[0][0] for c in b.__enter__.return_value.insert_entity.call_args_list] for b in batches]
+        # grouped by partition, at most 100 entities per batch
+        self.assertEqual(sorted(len(e) for e in entities), [1, 25, 25, 100, 100])
+        self.assertTrue(all(len(set(x['PartitionKey'] for x in e)) == 1 for e in entities))
+        self.assertIn({'PartitionKey': 'p1', 'RowKey': '0001', 'count': 1, 'ratio': 0.5}, sum(entities, []))
+
+        with open(source, 'a') as f:
+            f.write('p0,\n')
+        with self.assertRaisesRegexp(CLIError, 'line 253: entity requires: RowKey'):
+            insert_table_entities(mock.MagicMock(cli_ctx=DummyCli()), client, 'table', source, max_parallel=2)
+
+    def test_download_batch_pipelines_listing(self):
+        from azure.cli.command_modules.storage.operations.blob import storage_blob_download_batch
+
+        destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, destination)
+        client = mock.MagicMock()
+        client.get_blob_to_path.side_effect = lambda container, name, path, **_: mock.MagicMock()
+        downloads_before_last_page = []
+
+        def _iterate_blobs(*_):
+            yield 'a.txt', mock.MagicMock(content_length=1)
+            # the next page of the listing arrives after the first blob is being downloaded
+            deadline = time.time() + 5
+            while not client.get_blob_to_path.called and time.time() < deadline:
+                time.sleep(0.01)
+            downloads_before_last_page.append(client.get_blob_to_path.call_count)
+            yield 'dir/b.txt', mock.MagicMock(content_length=1)
+
+        with mock.patch('azure.cli.command_modules.storage.operations.blob.iterate_blobs', _iterate_blobs):
+            storage_blob_download_batch(mock.MagicMock(cli_ctx=DummyCli()), client, None, destination, 'container',
+                                        max_parallel=2)
+        self.assertEqual(downloads_before_last_page, [1])
+        self.assertEqual(client.get_blob_to_path.call_count, 2)
+
+    def test_download_batch_conflicting_paths(self):
+        from knack.util import CLIError
+        from azure.cli.command_modules.storage.operations.blob import storage_blob_download_batch
+
+        destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, destination)
+        client = mock.MagicMock()
+        blobs = [(name, mock.MagicMock(content_length=1)) for name in ['dir/a.txt', 'b.txt', '/dir/a.txt', 'c.txt']]
+        with mock.patch('azure.cli.command_modules.storage.operations.blob.iterate_blobs', return_value=iter(blobs)):
+            with self.assertRaisesRegexp(CLIError, 'Multiple blobs with download path: `dir/a.txt`'):
+                storage_blob_download_batch(mock.MagicMock(cli_ctx=DummyCli()), client, None, destination,
+                                            'container', max_parallel=2)
+        # the blobs listed after the conflict are not downloaded
+        self.assertNotIn('c.txt', [c[0][1] for c in client.get_blob_to_path.call_args_list])
+
+    def test_local_file_unchanged(self):
+        import base64
+        import datetime
+        import hashlib
+        from dateutil.tz import tzutc
+        from azure.cli.command_modules.storage.operations.blob import _is_local_file_unchanged, _set_file_mtime
+
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b'content')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        last_modified = datetime.datetime(2019, 1, 1, tzinfo=tzutc())
+        properties = mock.MagicMock(content_length=7, last_modified=last_modified)
+        properties.content_settings.content_md5 = None
+
+        self.assertFalse(_is_local_file_unchanged(path + '.missing', properties))
+        self.assertFalse(_is_local_file_unchanged(path, properties))
+        _set_file_mtime(path, last_modified)
+        self.assertTrue(_is_local_file_unchanged(path, properties))
+        properties.content_length = 8
+        self.assertFalse(_is_local_file_unchanged(path, properties))
+
+        # fall back to the MD5 hash when the modification time differs
+        os.utime(path, (0, 0))
+        properties.content_length = 7
+        properties.content_settings.content_md5 = base64.b64encode(hashlib.md5(b'content').digest()).decode()
+        self.assertTrue(_is_local_file_unchanged(path, properties))
+        self.assertEqual(int(os.stat(path).st_mtime), 1546300800)
+
+
+if __name__ == '__main__':
+    unittest.main()
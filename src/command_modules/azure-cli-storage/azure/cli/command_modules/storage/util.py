@@ -20,7 +20,33 @@ def collect_blobs(blob_service, container, pattern=None):
     if not _pattern_has_wildcards(pattern):
         return [pattern] if blob_service.exists(container, pattern) else []
 
-    results = []
+    return [blob_name for blob_name, _ in _list_blobs(blob_service, container, pattern)]
+
+
+def iterate_blobs(blob_service, container, pattern=None):
+    """
+    Like `collect_blobs`, but yields the name and the properties of each blob as the pages of the listing arrive, so
+    that the blobs can be processed while they are still being listed.
+    """
+    if not blob_service:
+        raise ValueError('missing parameter blob_service')
+
+    if not container:
+        raise ValueError('missing parameter container')
+
+    if not _pattern_has_wildcards(pattern):
+        from azure.common import AzureMissingResourceHttpError
+        try:
+            yield pattern, blob_service.get_blob_properties(container, pattern).properties
+        except AzureMissingResourceHttpError:
+            pass
+        return
+
+    for blob_name, blob in _list_blobs(blob_service, container, pattern):
+        yield blob_name, blob.properties
+
+
+def _list_blobs(blob_service, container, pattern):
     for blob in blob_service.list_blobs(container):
         try:
             blob_name = blob.name.encode('utf-8') if isinstance(blob.name, unicode) else blob.name
@@ -28,12 +54,10 @@ def collect_blobs(blob_service, container, pattern=None):
             blob_name = blob.name
 
         if not pattern or _match_path(blob_name, pattern):
-            results.append(blob_name)
-
-    return results
+            yield blob_name, blob
 
 
-def collect_files(cmd, file_service, share, pattern=None):
+def collect_files(cmd, file_service, share, pattern=None, max_parallel=None):
     """
     Search files in the the given file share recursively. Filter the files by matching their path to the given pattern.
     Returns a iterable of tuple (dir, name).
@@ -47,7 +71,7 @@ def collect_files(cmd, file_service, share, pattern=None):
     if not _pattern_has_wildcards(pattern):
         return [pattern]
 
-    return glob_files_remotely(cmd, file_service, share, pattern)
+    return glob_files_remotely(cmd, file_service, share, pattern, max_parallel)
 
 
 def create_blob_service_from_storage_client(cmd, client):
@@ -81,20 +105,49 @@ def glob_files_locally(folder_path, pattern):
                 yield (full_path, full_path[len_folder_path:])
 
 
-def glob_files_remotely(cmd, client, share_name, pattern):
-    """glob the files in remote file share based on the given pattern"""
+def glob_files_remotely(cmd, client, share_name, pattern, max_parallel=None):
+    """
+    glob the files in remote file share based on the given pattern
+
+    The directories are listed by a pool of worker threads, and the files are yielded as soon as the listing of their
+    directory completes, so they can be processed while the rest of the share is still being listed.
+
+    :param max_parallel: The maximum number of directories listed at the same time. Default: `max_parallel` in the
+                         [storage] section of the configuration, or 8.
+    """
     from collections import deque
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from azure.cli.command_modules.storage.batch_util import get_max_parallel
     t_dir, t_file = cmd.get_models('file.models#Directory', 'file.models#File')
 
-    queue = deque([""])
-    while queue:
-        current_dir = queue.pop()
-        for f in client.list_directories_and_files(share_name, current_dir):
+    def _list_directory(directory):
+        # read every page of the listing in the worker
+        files, directories = [], []
+        for f in client.list_directories_and_files(share_name, directory):
             if isinstance(f, t_file):
-                if not pattern or _match_path(os.path.join(current_dir, f.name), pattern):
-                    yield current_dir, f.name
+                if not pattern or _match_path(os.path.join(directory, f.name), pattern):
+                    files.append((directory, f.name))
             elif isinstance(f, t_dir):
-                queue.appendleft(os.path.join(current_dir, f.name))
+                directories.append(os.path.join(directory, f.name))
+        return files, directories
+
+    queue = deque([""])
+    running = set()
+    max_parallel = get_max_parallel(cmd.cli_ctx, max_parallel)
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        try:
+            while queue or running:
+                while queue and len(running) < max_parallel:
+                    running.add(executor.submit(_list_directory, queue.popleft()))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, directories = future.result()
+                    queue.extend(directories)
+                    for f in files:
+                        yield f
+        finally:
+            for future in running:
+                future.cancel()
 
 
 def create_short_lived_blob_sas(cmd, account_name, account_key, container, blob):
@@ -225,3 +278,34 @@ def check_precondition_success(func):
                 raise
             return False, None
     return wrapper
+
+
+def normalize_entity(values):
+    """ Ensures that the RowKey and PartitionKey of a table entity are correctly cased, and casts the numeric values of
+    its other properties to numbers so they can be queried correctly. """
+    from six import string_types
+
+    def cast_val(key, val):
+        if key in ['PartitionKey', 'RowKey'] or not isinstance(val, string_types):
+            return val
+
+        def try_cast(to_type):
+            try:
+                return to_type(val)
+            except ValueError:
+                return None
+
+        return try_cast(int) or try_cast(float) or val
+
+    entity = {}
+    for key, val in values.items():
+        if key.lower() == 'rowkey':
+            key = 'RowKey'
+        elif key.lower() == 'partitionkey':
+            key = 'PartitionKey'
+        entity[key] = cast_val(key, val)
+    return entity
+
+
+def get_missing_entity_keys(entity):
+    return [key for key in ['RowKey', 'PartitionKey'] if key not in entity]
@@ -29,42 +29,61 @@ def _get_thread_count():
     return 5  # don't increase too much till https://github.com/Azure/msrestazure-for-python/issues/6 is fixed
 
 
+def _list_image_names(catalog, client, location, publisher=None, offer=None, sku=None):
+    # the names of the publishers, or of the offers of a publisher, the SKUs of an offer, or the versions of a SKU
+    images = client.virtual_machine_images
+    if sku:
+        return catalog.get('versions/{}/{}/{}'.format(publisher, offer, sku),
+                           lambda: [i.name for i in images.list(location, publisher, offer, sku)])
+    if offer:
+        return catalog.get('skus/{}/{}'.format(publisher, offer),
+                           lambda: [s.name for s in images.list_skus(location, publisher, offer)])
+    if publisher:
+        return catalog.get('offers/{}'.format(publisher),
+                           lambda: [o.name for o in images.list_offers(location, publisher)])
+    return catalog.get('publishers', lambda: [p.name for p in images.list_publishers(location)])
+
+
 def load_images_thru_services(cli_ctx, publisher, offer, sku, location):
     from concurrent.futures import ThreadPoolExecutor, as_completed
+    from ._image_catalog import ImageCatalog
     all_images = []
     client = _compute_client_factory(cli_ctx)
     if location is None:
         location = get_one_of_subscription_locations(cli_ctx)
+    catalog = ImageCatalog(cli_ctx, location)
 
     def _load_images_from_publisher(publisher):
-        offers = client.virtual_machine_images.list_offers(location, publisher)
+        offers = _list_image_names(catalog, client, location, publisher)
         if offer:
-            offers = [o for o in offers if _matched(offer, o.name)]
+            offers = [o for o in offers if _matched(offer, o)]
         for o in offers:
-            skus = client.virtual_machine_images.list_skus(location, publisher, o.name)
+            skus = _list_image_names(catalog, client, location, publisher, o)
             if sku:
-                skus = [s for s in skus if _matched(sku, s.name)]
+                skus = [s for s in skus if _matched(sku, s)]
             for s in skus:
-                images = client.virtual_machine_images.list(location, publisher, o.name, s.name)
-                for i in images:
+                for i in _list_image_names(catalog, client, location, publisher, o, s):
                     all_images.append({
                         'publisher': publisher,
-                        'offer': o.name,
-                        'sku': s.name,
-                        'version': i.name})
+                        'offer': o,
+                        'sku': s,
+                        'version': i})
 
-    publishers = client.virtual_machine_images.list_publishers(location)
-    if publisher:
-        publishers = [p for p in publishers if _matched(publisher, p.name)]
-
-    publisher_num = len(publishers)
-    if publisher_num > 1:
-        with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
-            tasks = [executor.submit(_load_images_from_publisher, p.name) for p in publishers]
-            for t in as_completed(tasks):
-                t.result()  # don't use the result but expose exceptions from the threads
-    elif publisher_num == 1:
-        _load_images_from_publisher(publishers[0].name)
+    try:
+        publishers = _list_image_names(catalog, client, location)
+        if publisher:
+            publishers = [p for p in publishers if _matched(publisher, p)]
+
+        publisher_num = len(publishers)
+        if publisher_num > 1:
+            with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+                tasks = [executor.submit(_load_images_from_publisher, p) for p in publishers]
+                for t in as_completed(tasks):
+                    t.result()  # don't use the result but expose exceptions from the threads
+        elif publisher_num == 1:
+            _load_images_from_publisher(publishers[0])
+    finally:
+        catalog.save()
 
     return all_images
 
@@ -108,59 +127,71 @@ def load_extension_images_thru_services(cli_ctx, publisher, name, version, locat
                                         show_latest=False, partial_match=True):
     from concurrent.futures import ThreadPoolExecutor, as_completed
     from distutils.version import LooseVersion  # pylint: disable=no-name-in-module,import-error
+    import functools
+    from ._image_catalog import ImageCatalog
     all_images = []
     client = _compute_client_factory(cli_ctx)
     if location is None:
         location = get_one_of_subscription_locations(cli_ctx)
+    catalog = ImageCatalog(cli_ctx, location)
 
-    def _load_extension_images_from_publisher(publisher):
+    def _list_types(publisher):
         from msrestazure.azure_exceptions import CloudError
         try:
-            types = client.virtual_machine_extension_images.list_types(location, publisher)
+            return [t.name for t in client.virtual_machine_extension_images.list_types(location, publisher)]
         except CloudError:  # PIR image publishers might not have any extension images, exception could raise
-            types = []
+            return []
+
+    def _list_versions(publisher, extension_type):
+        versions = client.virtual_machine_extension_images.list_versions(location, publisher, extension_type)
+        return [v.name for v in versions]
+
+    def _load_extension_images_from_publisher(publisher):
+        types = catalog.get('extension-types/{}'.format(publisher), lambda: _list_types(publisher))
         if name:
-            types = [t for t in types if _matched(name, t.name, partial_match)]
+            types = [t for t in types if _matched(name, t, partial_match)]
         for t in types:
-            versions = client.virtual_machine_extension_images.list_versions(location,
-                                                                             publisher,
-                                                                             t.name)
+            versions = catalog.get('extension-versions/{}/{}'.format(publisher, t),
+                                   functools.partial(_list_versions, publisher, t))
             if version:
-                versions = [v for v in versions if _matched(version, v.name, partial_match)]
+                versions = [v for v in versions if _matched(version, v, partial_match)]
 
             if show_latest:
                 # pylint: disable=no-member
-                versions.sort(key=lambda v: LooseVersion(v.name), reverse=True)
+                versions = sorted(versions, key=LooseVersion, reverse=True)
                 all_images.append({
                     'publisher': publisher,
-                    'name': t.name,
-                    'version': versions[0].name})
+                    'name': t,
+                    'version': versions[0]})
             else:
                 for v in versions:
                     all_images.append({
                         'publisher': publisher,
-                        'name': t.name,
-                        'version': v.name})
+                        'name': t,
+                        'version': v})
 
-    publishers = client.virtual_machine_images.list_publishers(location)
-    if publisher:
-        publishers = [p for p in publishers if _matched(publisher, p.name, partial_match)]
-
-    publisher_num = len(publishers)
-    if publisher_num > 1:
-        with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
-            tasks = [executor.submit(_load_extension_images_from_publisher,
-                                     p.name) for p in publishers]
-            for t in as_completed(tasks):
-                t.result()  # don't use the result but expose exceptions from the threads
-    elif publisher_num == 1:
-        _load_extension_images_from_publisher(publishers[0].name)
+    try:
+        publishers = _list_image_names(catalog, client, location)
+        if publisher:
+            publishers = [p for p in publishers if _matched(publisher, p, partial_match)]
+
+        publisher_num = len(publishers)
+        if publisher_num > 1:
+            with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+                tasks = [executor.submit(_load_extension_images_from_publisher, p) for p in publishers]
+                for t in as_completed(tasks):
+                    t.result()  # don't use the result but expose exceptions from the threads
+        elif publisher_num == 1:
+            _load_extension_images_from_publisher(publishers[0])
+    finally:
+        catalog.save()
 
     return all_images
 
 
 def get_vm_sizes(cli_ctx, location):
-    return list(_compute_client_factory(cli_ctx).virtual_machine_sizes.list(location))
+    from ._sku_index import SkuIndex
+    return SkuIndex(cli_ctx).get_vm_sizes(location)
 
 
 def _matched(pattern, string, partial_match=True):
@@ -180,12 +211,24 @@ def _create_image_instance(publisher, offer, sku, version):
 
 
 def _get_latest_image_version(cli_ctx, location, publisher, offer, sku):
-    top_one = _compute_client_factory(cli_ctx).virtual_machine_images.list(location,
-                                                                           publisher,
-                                                                           offer,
-                                                                           sku,
-                                                                           top=1,
-                                                                           orderby='name desc')
-    if not top_one:
+    from distutils.version import LooseVersion  # pylint: disable=no-name-in-module,import-error
+    from ._image_catalog import ImageCatalog
+    catalog = ImageCatalog(cli_ctx, location)
+    versions = _list_image_names(catalog, _compute_client_factory(cli_ctx), location, publisher, offer, sku)
+    catalog.save()
+    if not versions:
         raise CLIError("Can't resolve the vesion of '{}:{}:{}'".format(publisher, offer, sku))
-    return top_one[0].name
+    return max(versions, key=LooseVersion)
+
+
+def get_vm_image(cli_ctx, location, publisher, offer, sku, version):
+    from azure.cli.core.profiles import ResourceType, get_sdk
+    from ._image_catalog import ImageCatalog
+    VirtualMachineImage = get_sdk(cli_ctx, ResourceType.MGMT_COMPUTE, 'VirtualMachineImage', mod='models',
+                                  operation_group='virtual_machine_images')
+    catalog = ImageCatalog(cli_ctx, location)
+    image = catalog.get('image/{}/{}/{}/{}'.format(publisher, offer, sku, version),
+                        lambda: _compute_client_factory(cli_ctx).virtual_machine_images.get(
+                            location, publisher, offer, sku, version).serialize(keep_readonly=True))
+    catalog.save()
+    return VirtualMachineImage.deserialize(image)
@@ -827,6 +827,11 @@ helps['vm image'] = """
 helps['vm image list'] = """
     type: command
     short-summary: List the VM/VMSS images available in the Azure Marketplace.
+    long-summary: >
+        With `--all`, the images are looked up in a local catalog of the images of the location, which is refreshed
+        from the live Azure service for the publishers, offers and SKUs which aren't cached or have expired. The
+        time they are cached for can be configured with `image_catalog_ttl` in the [vm] section of the config file,
+        in seconds. Default: 86400. Set it to 0 to disable the catalog.
     parameters:
         - name: --all
           short-summary: Retrieve image list from live Azure service rather using an offline image list
@@ -1133,7 +1138,11 @@ helps['vm get-instance-view'] = """
 helps['vm list'] = """
     type: command
     short-summary: List details of Virtual Machines.
-    long-summary: 'For more information on querying information about Virtual Machines, see https://docs.microsoft.com/en-us/cli/azure/query-az-cli2'
+    long-summary: >
+        For more information on querying information about Virtual Machines, see https://docs.microsoft.com/en-us/cli/azure/query-az-cli2
+
+        With `--show-details`, the instance views of the VMs are fetched concurrently. The number of concurrent
+        requests can be configured with `max_concurrency` in the [core] section of the config file. Default: 10.
     examples:
         - name: List all VMs.
           text: az vm list
@@ -1155,6 +1164,10 @@ helps['vm list-ip-addresses'] = """
 helps['vm list-sizes'] = """
     type: command
     short-summary: List available sizes for VMs.
+    long-summary: >
+        The sizes of a location are cached in a local index of the current subscription. The time they are
+        cached for can be configured with `sku_index_ttl` in the [vm] section of the config file, in seconds.
+        Default: 86400. Set it to 0 to disable the index.
     examples:
         - name: List the available VM sizes in the West US region.
           text: az vm list-sizes -l westus
@@ -1180,7 +1193,12 @@ helps['vm list-vm-resize-options'] = """
 helps['vm list-skus'] = """
     type: command
     short-summary: Get details for compute-related resource SKUs.
-    long-summary: This command incorporates subscription level restriction, offering the most accurate information.
+    long-summary: >
+        This command incorporates subscription level restriction, offering the most accurate information.
+
+        The SKUs of all the locations are cached in a local index of the current subscription. The time they are
+        cached for can be configured with `sku_index_ttl` in the [vm] section of the config file, in seconds.
+        Default: 86400. Set it to 0 to disable the index.
     examples:
         - name: List all SKUs in the West US region.
           text: az vm list-skus -l westus
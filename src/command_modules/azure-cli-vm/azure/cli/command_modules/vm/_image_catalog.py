@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 86400
+_CATALOG_DIR_NAME = 'vmImageCatalog'
+
+
+class ImageCatalog(object):
+    """
+    On-disk catalog of the VM and extension images of a location.
+
+    Each listing (the publishers, the offers of a publisher, the SKUs of an offer, ...) is cached on its own and
+    expires on its own, so a catalog is refreshed incrementally by the lookups which need it. The time the listings
+    are cached for is `image_catalog_ttl` in the [vm] section of the configuration, in seconds. Setting it to 0
+    disables the catalog.
+    """
+
+    def __init__(self, cli_ctx, location):
+        from azure.cli.core.api import get_config_dir
+        self.ttl = cli_ctx.config.getint('vm', 'image_catalog_ttl', fallback=DEFAULT_TTL)
+        self.enabled = self.ttl > 0
+        file_name = '{}_{}.json'.format(cli_ctx.cloud.name, location.replace(' ', '').lower())
+        self._path = os.path.join(get_config_dir(), _CATALOG_DIR_NAME, file_name)
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if self.enabled:
+                try:
+                    with open(self._path, 'r') as f:
+                        entries = json.load(f)
+                    if isinstance(entries, dict):
+                        self._entries = entries
+                except (IOError, OSError, ValueError):
+                    pass
+        return self._entries
+
+    def get(self, key, loader):
+        """
+        The cached value of a listing, loaded again once it expires.
+
+        :param key: The path of the listing, e.g. 'offers/<publisher>'. It's case insensitive.
+        :param loader: Called without arguments for the value when it isn't cached. It must return a JSON value.
+        """
+        key = key.lower()
+        with self._lock:
+            entry = self._load().get(key)
+        if isinstance(entry, dict) and entry.get('expires_on', 0) >= time.time():
+            return entry['value']
+        value = loader()
+        if self.enabled:
+            with self._lock:
+                self._entries[key] = {'value': value, 'expires_on': time.time() + self.ttl}
+                self._dirty = True
+        return value
+
+    def save(self):
+        """ Write the listings loaded since the catalog was read, dropping those which have expired. """
+        if not self._dirty:
+            return
+        now = time.time()
+        with self._lock:
+            entries = {k: v for k, v in self._entries.items()
+                       if isinstance(v, dict) and v.get('expires_on', 0) >= now}
+            self._dirty = False
+        # write a temporary file and replace the catalog with it, so that a partial write never corrupts the catalog
+        temp_path = None
+        try:
+            if not os.path.isdir(os.path.dirname(self._path)):
+                os.makedirs(os.path.dirname(self._path))
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self._path) + '.',
+                                             dir=os.path.dirname(self._path))
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            getattr(os, 'replace', os.rename)(temp_path, self._path)
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to save the image catalog '%s': %s", self._path, ex)
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,124 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import time
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL = 86400
+_INDEX_DIR_NAME = 'vmSkuIndex'
+_LOCATIONS_FILE_NAME = 'locations.json'
+_NO_LOCATION = '_'
+
+
+def _normalize_location(location):
+    return location.replace(' ', '').lower() if location else _NO_LOCATION
+
+
+class SkuIndex(object):
+    """
+    On-disk index of the resource SKUs and the VM sizes of the current subscription.
+
+    The SKUs of all the locations are downloaded at once and split into a file per location, so the commands which
+    need the SKUs of a location only read those. The time the index is kept for is `sku_index_ttl` in the [vm]
+    section of the configuration, in seconds. Setting it to 0 disables the index.
+    """
+
+    def __init__(self, cli_ctx):
+        from azure.cli.core.api import get_config_dir
+        from azure.cli.core.commands.client_factory import get_subscription_id
+        self.cli_ctx = cli_ctx
+        self.ttl = cli_ctx.config.getint('vm', 'sku_index_ttl', fallback=DEFAULT_TTL)
+        self.enabled = self.ttl > 0
+        self._dir = os.path.join(get_config_dir(), _INDEX_DIR_NAME, '{}_{}'.format(
+            cli_ctx.cloud.name, get_subscription_id(cli_ctx))) if self.enabled else None
+
+    def _read(self, file_name):
+        if not self.enabled:
+            return None
+        try:
+            with open(os.path.join(self._dir, file_name), 'r') as f:
+                content = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(content, dict) or content.get('expires_on', 0) < time.time():
+            return None
+        return content.get('value')
+
+    def _write(self, file_name, value, expires_on):
+        if not self.enabled:
+            return
+        try:
+            if not os.path.isdir(self._dir):
+                os.makedirs(self._dir)
+            with open(os.path.join(self._dir, file_name), 'w') as f:
+                json.dump({'value': value, 'expires_on': expires_on}, f)
+        except (IOError, OSError) as ex:
+            logger.debug("Failed to save the SKU index '%s': %s", self._dir, ex)
+
+    def _get_model(self, name, operation_group):
+        from azure.cli.core.profiles import ResourceType, get_sdk
+        return get_sdk(self.cli_ctx, ResourceType.MGMT_COMPUTE, name, mod='models', operation_group=operation_group)
+
+    def _refresh_skus(self, location):
+        from ._client_factory import _compute_client_factory
+        skus = [s.serialize(keep_readonly=True) for s in _compute_client_factory(self.cli_ctx).resource_skus.list()]
+        by_location = {}
+        for position, sku in enumerate(skus):
+            # the position keeps the order of the SKUs listed from several locations
+            for name in set(_normalize_location(x) for x in sku.get('locations') or [None]):
+                by_location.setdefault(name, []).append([position, sku])
+        expires_on = time.time() + self.ttl
+        for name, location_skus in by_location.items():
+            self._write(name + '.json', location_skus, expires_on)
+        # written last, so that the index of each location is complete once this is
+        self._write(_LOCATIONS_FILE_NAME, sorted(by_location), expires_on)
+        if location:
+            return by_location.get(_normalize_location(location), [])
+        return list(enumerate(skus))
+
+    def _read_skus(self, location):
+        locations = self._read(_LOCATIONS_FILE_NAME)
+        if locations is None:
+            return None
+        if location:
+            location = _normalize_location(location)
+            return self._read(location + '.json') if location in locations else []
+        skus = {}
+        for name in locations:
+            location_skus = self._read(name + '.json')
+            if location_skus is None:
+                return None
+            # a SKU available in several locations is in the index of each
+            skus.update(location_skus)
+        return sorted(skus.items())
+
+    def get_skus(self, location=None):
+        """
+        The resource SKUs available to the subscription.
+
+        :param location: The location to list the SKUs of. All the SKUs are listed if omitted.
+        """
+        ResourceSku = self._get_model('ResourceSku', 'resource_skus')
+        skus = self._read_skus(location)
+        if skus is None:
+            skus = self._refresh_skus(location)
+        return [ResourceSku.deserialize(s) for _, s in skus]
+
+    def get_vm_sizes(self, location):
+        """ The VM sizes available in a location. """
+        from ._client_factory import _compute_client_factory
+        VirtualMachineSize = self._get_model('VirtualMachineSize', 'virtual_machine_sizes')
+        file_name = 'sizes_{}.json'.format(_normalize_location(location))
+        sizes = self._read(file_name)
+        if sizes is None:
+            sizes = [s.serialize(keep_readonly=True)
+                     for s in _compute_client_factory(self.cli_ctx).virtual_machine_sizes.list(location)]
+            self._write(file_name, sizes, time.time() + self.ttl)
+        return [VirtualMachineSize.deserialize(s) for s in sizes]
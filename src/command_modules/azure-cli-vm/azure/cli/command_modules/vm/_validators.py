@@ -22,7 +22,7 @@ from azure.cli.command_modules.vm._template_builder import StorageProfile
 import azure.cli.core.keys as keys
 
 from ._client_factory import _compute_client_factory
-from ._actions import _get_latest_image_version
+from ._actions import _get_latest_image_version, get_vm_image, get_vm_sizes
 logger = get_logger(__name__)
 
 
@@ -264,18 +264,14 @@ def _parse_image_argument(cmd, namespace):
 def _get_image_plan_info_if_exists(cmd, namespace):
     from msrestazure.azure_exceptions import CloudError
     try:
-        compute_client = _compute_client_factory(cmd.cli_ctx)
         if namespace.os_version.lower() == 'latest':
             image_version = _get_latest_image_version(cmd.cli_ctx, namespace.location, namespace.os_publisher,
                                                       namespace.os_offer, namespace.os_sku)
         else:
             image_version = namespace.os_version
 
-        image = compute_client.virtual_machine_images.get(namespace.location,
-                                                          namespace.os_publisher,
-                                                          namespace.os_offer,
-                                                          namespace.os_sku,
-                                                          image_version)
+        image = get_vm_image(cmd.cli_ctx, namespace.location, namespace.os_publisher, namespace.os_offer,
+                             namespace.os_sku, image_version)
 
         # pylint: disable=no-member
         return image.plan
@@ -654,8 +650,7 @@ def _validate_vm_vmss_accelerated_networking(cli_ctx, namespace):
                            'Standard_D8s_v3']
         new_4core_sizes = [x.lower() for x in new_4core_sizes]
         if size not in new_4core_sizes:
-            compute_client = _compute_client_factory(cli_ctx)
-            sizes = compute_client.virtual_machine_sizes.list(namespace.location)
+            sizes = get_vm_sizes(cli_ctx, namespace.location)
             size_info = next((s for s in sizes if s.name.lower() == size), None)
             if size_info is None or size_info.number_of_cores < 8:
                 return
@@ -7,7 +7,7 @@ from azure.cli.command_modules.vm._client_factory import (cf_vm, cf_avail_set, c
                                                           cf_vm_ext,
                                                           cf_vm_ext_image, cf_vm_image, cf_usage,
                                                           cf_vmss, cf_vmss_vm,
-                                                          cf_vm_sizes, cf_disks, cf_snapshots,
+                                                          cf_disks, cf_snapshots,
                                                           cf_images, cf_run_commands,
                                                           cf_rolling_upgrade_commands,
                                                           cf_msi_user_identities_operations,
@@ -95,11 +95,6 @@ def load_command_table(self, _):
         client_factory=cf_run_commands
     )
 
-    compute_vm_size_sdk = CliCommandType(
-        operations_tmpl='azure.mgmt.compute.operations.virtual_machine_sizes_operations#VirtualMachineSizesOperations.{}',
-        client_factory=cf_vm_sizes
-    )
-
     compute_vmss_sdk = CliCommandType(
         operations_tmpl='azure.mgmt.compute.operations.virtual_machine_scale_sets_operations#VirtualMachineScaleSetsOperations.{}',
         client_factory=cf_vmss,
@@ -186,7 +181,7 @@ def load_command_table(self, _):
         g.custom_command('get-instance-view', 'get_instance_view', table_transformer='{Name:name, ResourceGroup:resourceGroup, Location:location, ProvisioningState:provisioningState, PowerState:instanceView.statuses[1].displayStatus}')
         g.custom_command('list', 'list_vm', table_transformer=transform_vm_list)
         g.custom_command('list-ip-addresses', 'list_vm_ip_addresses', table_transformer=transform_ip_addresses)
-        g.command('list-sizes', 'list', command_type=compute_vm_size_sdk)
+        g.custom_command('list-sizes', 'list_vm_sizes')
         g.custom_command('list-skus', 'list_skus', table_transformer=transform_sku_for_table_output, min_api='2017-03-30')
         g.command('list-usage', 'list', command_type=compute_vm_usage_sdk, transform=transform_vm_usage_list, table_transformer='[].{Name:localName, CurrentValue:currentValue, Limit:limit}')
         g.command('list-vm-resize-options', 'list_available_sizes')
@@ -31,7 +31,7 @@ from ._vm_utils import read_content_if_is_file
 from ._vm_diagnostics_templates import get_default_diag_config
 
 from ._actions import (load_images_from_aliases_doc, load_extension_images_thru_services,
-                       load_images_thru_services, _get_latest_image_version)
+                       load_images_thru_services, _get_latest_image_version, get_vm_image)
 from ._client_factory import _compute_client_factory, cf_public_ip_addresses
 
 logger = get_logger(__name__)
@@ -687,41 +687,94 @@ def get_vm(cmd, resource_group_name, vm_name, expand=None):
 
 
 def get_vm_details(cmd, resource_group_name, vm_name):
-    from msrestazure.tools import parse_resource_id
     from azure.cli.command_modules.vm._vm_utils import get_target_network_api
     result = get_instance_view(cmd, resource_group_name, vm_name)
     network_client = get_mgmt_service_client(
         cmd.cli_ctx, ResourceType.MGMT_NETWORK, api_version=get_target_network_api(cmd.cli_ctx))
+    return _set_vm_details(result, network_client)
+
+
+def _set_vm_details(vm, network_client, nic_lookup=None, public_ip_lookup=None):
+    """
+    Set the power state and the addresses of a VM got with its instance view.
+
+    :param nic_lookup: The NICs by lower-cased id. The NICs missing from it are fetched one by one.
+    :param public_ip_lookup: The public IPs by lower-cased id. The public IPs missing from it are fetched one by one.
+    """
+    from msrestazure.tools import parse_resource_id
+    nic_lookup = nic_lookup or {}
+    public_ip_lookup = public_ip_lookup or {}
     public_ips = []
     fqdns = []
     private_ips = []
     mac_addresses = []
     # pylint: disable=line-too-long,no-member
-    for nic_ref in result.network_profile.network_interfaces:
-        nic_parts = parse_resource_id(nic_ref.id)
-        nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+    for nic_ref in vm.network_profile.network_interfaces:
+        nic = nic_lookup.get(nic_ref.id.lower())
+        if nic is None:
+            nic_parts = parse_resource_id(nic_ref.id)
+            nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
         if nic.mac_address:
             mac_addresses.append(nic.mac_address)
         for ip_configuration in nic.ip_configurations:
             if ip_configuration.private_ip_address:
                 private_ips.append(ip_configuration.private_ip_address)
             if ip_configuration.public_ip_address:
-                res = parse_resource_id(ip_configuration.public_ip_address.id)
-                public_ip_info = network_client.public_ip_addresses.get(res['resource_group'],
-                                                                        res['name'])
+                public_ip_info = public_ip_lookup.get(ip_configuration.public_ip_address.id.lower())
+                if public_ip_info is None:
+                    res = parse_resource_id(ip_configuration.public_ip_address.id)
+                    public_ip_info = network_client.public_ip_addresses.get(res['resource_group'],
+                                                                            res['name'])
                 if public_ip_info.ip_address:
                     public_ips.append(public_ip_info.ip_address)
                 if public_ip_info.dns_settings:
                     fqdns.append(public_ip_info.dns_settings.fqdn)
 
-    setattr(result, 'power_state',
-            ','.join([s.display_status for s in result.instance_view.statuses if s.code.startswith('PowerState/')]))
-    setattr(result, 'public_ips', ','.join(public_ips))
-    setattr(result, 'fqdns', ','.join(fqdns))
-    setattr(result, 'private_ips', ','.join(private_ips))
-    setattr(result, 'mac_addresses', ','.join(mac_addresses))
-    del result.instance_view  # we don't need other instance_view info as people won't care
-    return result
+    setattr(vm, 'power_state',
+            ','.join([s.display_status for s in vm.instance_view.statuses if s.code.startswith('PowerState/')]))
+    setattr(vm, 'public_ips', ','.join(public_ips))
+    setattr(vm, 'fqdns', ','.join(fqdns))
+    setattr(vm, 'private_ips', ','.join(private_ips))
+    setattr(vm, 'mac_addresses', ','.join(mac_addresses))
+    del vm.instance_view  # we don't need other instance_view info as people won't care
+    return vm
+
+
+def _list_vm_details(cmd, compute_client, vm_list, resource_group_name=None):
+    """
+    Get the details of many VMs at once. The NICs and the public IPs of the resource group, or of the subscription,
+    are listed once, while the instance views of the VMs are fetched concurrently, at most `max_concurrency` in the
+    [core] section of the configuration at a time. NICs and public IPs of other resource groups are fetched one by one.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from msrestazure.azure_exceptions import CloudError
+    from azure.cli.core.commands import DEFAULT_MAX_CONCURRENCY
+    from azure.cli.command_modules.vm._vm_utils import get_target_network_api
+    network_client = get_mgmt_service_client(
+        cmd.cli_ctx, ResourceType.MGMT_NETWORK, api_version=get_target_network_api(cmd.cli_ctx))
+    max_workers = max(1, cmd.cli_ctx.config.getint('core', 'max_concurrency', fallback=DEFAULT_MAX_CONCURRENCY))
+
+    def _get_instance_view(vm):
+        try:
+            return compute_client.virtual_machines.get(_parse_rg_name(vm.id)[0], vm.name, expand='instanceView')
+        except CloudError as ex:
+            if ex.status_code != 404:
+                raise
+            logger.debug("VM '%s' was deleted while listing: %s", vm.id, ex)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if resource_group_name:
+            nics = executor.submit(lambda: list(network_client.network_interfaces.list(resource_group_name)))
+            public_ips = executor.submit(lambda: list(network_client.public_ip_addresses.list(resource_group_name)))
+        else:
+            nics = executor.submit(lambda: list(network_client.network_interfaces.list_all()))
+            public_ips = executor.submit(lambda: list(network_client.public_ip_addresses.list_all()))
+        instance_views = [executor.submit(_get_instance_view, vm) for vm in vm_list]
+        nic_lookup = {nic.id.lower(): nic for nic in nics.result()}
+        public_ip_lookup = {pip.id.lower(): pip for pip in public_ips.result()}
+        results = [f.result() for f in instance_views]
+    return [_set_vm_details(vm, network_client, nic_lookup, public_ip_lookup) for vm in results if vm is not None]
 
 
 def list_skus(cmd, location=None, size=None, zone=None, show_all=None, resource_type=None):
@@ -740,12 +793,17 @@ def list_skus(cmd, location=None, size=None, zone=None, show_all=None, resource_
     return result
 
 
+def list_vm_sizes(cmd, location):
+    from ._actions import get_vm_sizes
+    return get_vm_sizes(cmd.cli_ctx, location)
+
+
 def list_vm(cmd, resource_group_name=None, show_details=False):
     ccf = _compute_client_factory(cmd.cli_ctx)
     vm_list = ccf.virtual_machines.list(resource_group_name=resource_group_name) \
         if resource_group_name else ccf.virtual_machines.list_all()
     if show_details:
-        return [get_vm_details(cmd, _parse_rg_name(v.id)[0], v.name) for v in vm_list]
+        return _list_vm_details(cmd, ccf, vm_list, resource_group_name)
 
     return list(vm_list)
 
@@ -1319,7 +1377,8 @@ def list_vm_images(cmd, image_location=None, publisher_name=None, offer=None, sk
 
     if load_thru_services:
         if not publisher_name and not offer and not sku:
-            logger.warning("You are retrieving all the images from server which could take more than a minute. "
+            logger.warning("You are retrieving all the images from server which could take more than a minute "
+                           "unless they are in the local image catalog. "
                            "To shorten the wait, provide '--publisher', '--offer' or '--sku'. Partial name search "
                            "is supported.")
         all_images = load_images_thru_services(cmd.cli_ctx, publisher_name, offer, sku, image_location)
@@ -1345,8 +1404,7 @@ def show_vm_image(cmd, urn=None, publisher=None, offer=None, sku=None, version=N
             version = _get_latest_image_version(cmd.cli_ctx, location, publisher, offer, sku)
     elif not publisher or not offer or not sku or not version:
         raise CLIError(usage_err)
-    client = _compute_client_factory(cmd.cli_ctx)
-    return client.virtual_machine_images.get(location, publisher, offer, sku, version)
+    return get_vm_image(cmd.cli_ctx, location, publisher, offer, sku, version)
 
 
 def accept_market_ordering_terms(cmd, urn=None, publisher=None, offer=None, plan=None):
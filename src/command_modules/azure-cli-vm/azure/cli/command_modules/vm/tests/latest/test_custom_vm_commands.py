@@ -16,7 +16,7 @@ from azure.cli.command_modules.vm.custom import (enable_boot_diagnostics, disabl
                                                  _get_extension_instance_name,
                                                  get_boot_log)
 from azure.cli.command_modules.vm.custom import \
-    (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view)
+    (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view, list_vm, list_skus, list_vm_sizes)
 
 from azure.cli.core import AzCommandsLoader
 from azure.cli.core.commands import AzCliCommand
@@ -238,6 +238,119 @@ class TestVmCustom(unittest.TestCase):
         vm_client.virtual_machine_scale_set_vms.list.assert_called_once_with('rg1', 'vmss1', expand='instanceView',
                                                                              select='instanceView')
 
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_vm_details(self, factory_mock, network_client_factory_mock):
+        from msrestazure.azure_exceptions import CloudError
+        vm_client = factory_mock.return_value
+        network_client = network_client_factory_mock.return_value
+        cmd = _get_test_cmd()
+
+        def _vm(name, nic_ids):
+            vm = mock.MagicMock(id='/subscriptions/sub/resourceGroups/RG1/providers/Microsoft.Compute/'
+                                   'virtualMachines/' + name)
+            vm.name = name
+            vm.network_profile.network_interfaces = [mock.MagicMock(id=x) for x in nic_ids]
+            vm.instance_view.statuses = [InstanceViewStatus(code='PowerState/running', display_status='VM running')]
+            return vm
+
+        def _nic(nic_id, ip, public_ip_id=None):
+            ip_configuration = mock.MagicMock(private_ip_address=ip)
+            ip_configuration.public_ip_address = mock.MagicMock(id=public_ip_id) if public_ip_id else None
+            return mock.MagicMock(id=nic_id, mac_address='mac-' + ip, ip_configurations=[ip_configuration])
+
+        nic_prefix = '/subscriptions/sub/resourceGroups/rg2/providers/Microsoft.Network/networkInterfaces/'
+        pip_id = '/subscriptions/sub/resourceGroups/rg2/providers/Microsoft.Network/publicIPAddresses/pip1'
+        vms = [_vm('vm1', [nic_prefix + 'NIC1']), _vm('vm2', [nic_prefix + 'nic2']), _vm('gone', [])]
+        vm_client.virtual_machines.list.return_value = vms
+        vm_client.virtual_machines.get.side_effect = lambda rg, name, expand: \
+            next(v for v in vms if v.name == name) if name != 'gone' else \
+            self._raise(CloudError(mock.MagicMock(status_code=404), error='not found'))
+        network_client.network_interfaces.list.return_value = [_nic(nic_prefix + 'nic1', '10.0.0.4', pip_id)]
+        network_client.network_interfaces.get.return_value = _nic(nic_prefix + 'nic2', '10.0.0.5')
+        network_client.public_ip_addresses.list.return_value = [
+            mock.MagicMock(id=pip_id.upper(), ip_address='1.2.3.4', dns_settings=mock.MagicMock(fqdn='vm1.test'))]
+
+        result = list_vm(cmd, 'rg1', show_details=True)
+
+        # the VMs are in the order they were listed, without those deleted meanwhile
+        self.assertEqual([v.name for v in result], ['vm1', 'vm2'])
+        self.assertEqual([v.power_state for v in result], ['VM running', 'VM running'])
+        self.assertEqual((result[0].private_ips, result[0].mac_addresses, result[0].public_ips, result[0].fqdns),
+                         ('10.0.0.4', 'mac-10.0.0.4', '1.2.3.4', 'vm1.test'))
+        self.assertEqual((result[1].private_ips, result[1].public_ips), ('10.0.0.5', ''))
+        vm_client.virtual_machines.get.assert_any_call('RG1', 'vm1', expand='instanceView')
+        # the network resources of the group are listed once, only those missing from the lists are fetched one by one
+        network_client.network_interfaces.list.assert_called_once_with('rg1')
+        network_client.public_ip_addresses.list.assert_called_once_with('rg1')
+        network_client.network_interfaces.list_all.assert_not_called()
+        network_client.public_ip_addresses.list_all.assert_not_called()
+        network_client.network_interfaces.get.assert_called_once_with('rg2', 'nic2')
+        network_client.public_ip_addresses.get.assert_not_called()
+
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_vm_details_of_subscription(self, factory_mock, network_client_factory_mock):
+        vm_client = factory_mock.return_value
+        network_client = network_client_factory_mock.return_value
+        cmd = _get_test_cmd()
+        vm = mock.MagicMock(id='/subscriptions/sub/resourceGroups/rg1/providers/Microsoft.Compute/virtualMachines/vm1')
+        vm.network_profile.network_interfaces = []
+        vm.instance_view.statuses = []
+        vm_client.virtual_machines.list_all.return_value = [vm]
+        vm_client.virtual_machines.get.return_value = vm
+        network_client.network_interfaces.list_all.return_value = []
+        network_client.public_ip_addresses.list_all.return_value = []
+
+        result = list_vm(cmd, show_details=True)
+
+        self.assertEqual(len(result), 1)
+        network_client.network_interfaces.list_all.assert_called_once_with()
+        network_client.public_ip_addresses.list_all.assert_called_once_with()
+        network_client.network_interfaces.list.assert_not_called()
+        network_client.public_ip_addresses.list.assert_not_called()
+
+    @mock.patch('azure.cli.core.commands.client_factory.get_subscription_id', return_value='sub', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm._client_factory._compute_client_factory', autospec=True)
+    def test_sku_index(self, factory_mock, _):
+        import shutil
+        import tempfile
+        from azure.mgmt.compute.models import ResourceSku, VirtualMachineSize
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        client = factory_mock.return_value
+        client.resource_skus.list.return_value = [ResourceSku.deserialize({
+            'resourceType': 'virtualMachines', 'name': name, 'locations': locations,
+            'locationInfo': [{'location': locations[0], 'zones': zones}]
+        }) for name, locations, zones in [('Standard_A1', ['westus'], None), ('Standard_D2', ['eastus2'], ['1']),
+                                          ('Standard_D4', ['eastus2', 'westus'], None)]]
+        client.virtual_machine_sizes.list.return_value = [VirtualMachineSize(name='Standard_A1', number_of_cores=1)]
+        cmd = _get_test_cmd()
+
+        with mock.patch('azure.cli.core.api.get_config_dir', return_value=config_dir):
+            self.assertEqual([x.name for x in list_skus(cmd, 'westus')], ['Standard_A1', 'Standard_D4'])
+            # the index is downloaded once, then read by location
+            self.assertEqual([x.name for x in list_skus(cmd, 'EastUS2', zone=True)], ['Standard_D2'])
+            self.assertEqual([x.name for x in list_skus(cmd)], ['Standard_A1', 'Standard_D2', 'Standard_D4'])
+            self.assertEqual(list_skus(cmd, 'centralus'), [])
+            self.assertEqual(client.resource_skus.list.call_count, 1)
+            self.assertEqual(list_skus(cmd, 'westus')[0].location_info[0].location, 'westus')
+
+            self.assertEqual(list_vm_sizes(cmd, 'westus')[0].number_of_cores, 1)
+            self.assertEqual(list_vm_sizes(cmd, 'westus')[0].name, 'Standard_A1')
+            client.virtual_machine_sizes.list.assert_called_once_with('westus')
+
+            with mock.patch('time.time', return_value=1e10):
+                list_skus(cmd, 'westus')
+            self.assertEqual(client.resource_skus.list.call_count, 2)
+            with mock.patch.dict('os.environ', {'AZURE_VM_SKU_INDEX_TTL': '0'}):
+                list_skus(cmd, 'westus')
+            self.assertEqual(client.resource_skus.list.call_count, 3)
+
+    @staticmethod
+    def _raise(ex):
+        raise ex
+
     # pylint: disable=line-too-long
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._compute_client_factory', autospec=True)
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._get_keyvault_key_url', autospec=True)
@@ -175,15 +175,16 @@ class TestActions(unittest.TestCase):
             _validate_admin_password(admin_password, is_linux)
         self.assertTrue(expected_err in str(context.exception))
 
-    @mock.patch('azure.cli.command_modules.vm._validators._compute_client_factory', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm._actions._compute_client_factory', autospec=True)
     def test_parse_image_argument(self, client_factory_mock):
+        from azure.mgmt.compute.models import VirtualMachineImage, PurchasePlan
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
         compute_client = mock.MagicMock()
-        image = mock.MagicMock()
+        image = VirtualMachineImage(name='1.0.0', location='westus', plan=PurchasePlan(
+            name='plan1', product='product1', publisher='publisher1'))
         cmd = mock.MagicMock()
         cmd.cli_ctx = DummyCli()
-        image.plan.name = 'plan1'
-        image.plan.product = 'product1'
-        image.plan.publisher = 'publisher1'
         compute_client.virtual_machine_images.get.return_value = image
         client_factory_mock.return_value = compute_client
 
@@ -193,14 +194,23 @@ class TestActions(unittest.TestCase):
         np.image = 'publisher1:offer1:sku1:1.0.0'
 
         # action
-        _parse_image_argument(cmd, np)
+        with mock.patch('azure.cli.core.api.get_config_dir', return_value=config_dir):
+            _parse_image_argument(cmd, np)
 
         # assert
         self.assertEqual('plan1', np.plan_name)
         self.assertEqual('product1', np.plan_product)
         self.assertEqual('publisher1', np.plan_publisher)
 
-    @mock.patch('azure.cli.command_modules.vm._validators._compute_client_factory', autospec=True)
+        # the image is looked up in the image catalog then
+        np.plan_name, np.plan_publisher, np.plan_product = '', '', ''
+        with mock.patch('azure.cli.core.api.get_config_dir', return_value=config_dir):
+            _parse_image_argument(cmd, np)
+        self.assertEqual('plan1', np.plan_name)
+        compute_client.virtual_machine_images.get.assert_called_once_with('some region', 'publisher1', 'offer1',
+                                                                          'sku1', '1.0.0')
+
+    @mock.patch('azure.cli.command_modules.vm._actions._compute_client_factory', autospec=True)
     @mock.patch('azure.cli.command_modules.vm._validators.logger.warning', autospec=True)
     def test_parse_staging_image_argument(self, logger_mock, client_factory_mock):
         from msrestazure.azure_exceptions import CloudError
@@ -392,11 +402,10 @@ class TestActions(unittest.TestCase):
             normalize_disk_info(data_disk_cachings=['ReadWrite'], data_disk_sizes_gb=[1, 2], size='standard_L16s_v2')
         self.assertTrue('for Lv series of machines, "None" is the only supported caching mode' in str(err.exception))
 
-    @mock.patch('azure.cli.command_modules.vm._validators._compute_client_factory', autospec=True)
-    def test_validate_vm_vmss_accelerated_networking(self, client_factory_mock):
-        client_mock, size_mock = mock.MagicMock(), mock.MagicMock()
-        client_mock.virtual_machine_sizes.list.return_value = [size_mock]
-        client_factory_mock.return_value = client_mock
+    @mock.patch('azure.cli.command_modules.vm._validators.get_vm_sizes', autospec=True)
+    def test_validate_vm_vmss_accelerated_networking(self, get_vm_sizes_mock):
+        size_mock = mock.MagicMock()
+        get_vm_sizes_mock.return_value = [size_mock]
         # not a qualified size
         np = mock.MagicMock()
         np.size = 'Standard_Ds1_v2'
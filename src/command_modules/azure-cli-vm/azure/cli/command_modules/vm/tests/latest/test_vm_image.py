@@ -69,6 +69,68 @@ class TestVMImage(unittest.TestCase):
         with self.assertRaises(CLIError):
             load_images_from_aliases_doc(cli_ctx)
 
+    @mock.patch('azure.cli.command_modules.vm._actions._compute_client_factory', autospec=True)
+    def test_image_catalog(self, client_factory_mock):
+        import shutil
+        import tempfile
+        from azure.cli.command_modules.vm._actions import (load_images_thru_services, _get_latest_image_version,
+                                                           load_extension_images_thru_services)
+
+        def _named(*names):
+            result = []
+            for n in names:
+                item = mock.MagicMock()
+                item.name = n
+                result.append(item)
+            return result
+
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        patcher = mock.patch('azure.cli.core.api.get_config_dir', return_value=config_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        images = client_factory_mock.return_value.virtual_machine_images
+        images.list_publishers.return_value = _named('Canonical', 'OpenLogic')
+        images.list_offers.side_effect = lambda location, publisher: _named(publisher + 'Server')
+        images.list_skus.return_value = _named('sku1', 'sku2')
+        images.list.return_value = _named('1.9.0', '1.10.0')
+        extension_images = client_factory_mock.return_value.virtual_machine_extension_images
+        extension_images.list_types.return_value = _named('ext')
+        extension_images.list_versions.return_value = _named('2.0', '10.1')
+        cli_ctx = DummyCli()
+
+        expected = [{'publisher': 'Canonical', 'offer': 'CanonicalServer', 'sku': 'sku2', 'version': v}
+                    for v in ['1.9.0', '1.10.0']]
+        self.assertEqual(load_images_thru_services(cli_ctx, 'canonical', None, '2', 'westus'), expected)
+        self.assertEqual(images.list.call_count, 1)
+
+        # the listings are cached on disk, the uncached ones are loaded incrementally
+        self.assertEqual(load_images_thru_services(cli_ctx, 'canonical', None, '2', 'westus'), expected)
+        self.assertEqual(_get_latest_image_version(cli_ctx, 'westus', 'Canonical', 'CanonicalServer', 'sku2'),
+                         '1.10.0')
+        self.assertEqual(len(load_images_thru_services(cli_ctx, None, None, None, 'westus')), 8)
+        self.assertEqual(images.list_publishers.call_count, 1)
+        self.assertEqual(images.list_offers.call_count, 2)
+        self.assertEqual(images.list.call_count, 4)
+        self.assertEqual(load_extension_images_thru_services(cli_ctx, 'OpenLogic', 'ext', None, 'westus',
+                                                             show_latest=True),
+                         [{'publisher': 'OpenLogic', 'name': 'ext', 'version': '10.1'}])
+        load_extension_images_thru_services(cli_ctx, 'OpenLogic', 'ext', None, 'westus')
+        self.assertEqual(extension_images.list_versions.call_count, 1)
+        # the catalog file is replaced as a whole, without leaving temporary files behind
+        catalog_dir = os.path.join(config_dir, 'vmImageCatalog')
+        self.assertEqual(os.listdir(catalog_dir), ['{}_westus.json'.format(cli_ctx.cloud.name)])
+
+        # the listings are loaded again once expired, and not cached at all with a TTL of 0
+        with mock.patch('time.time', return_value=1e10):
+            load_images_thru_services(cli_ctx, 'canonical', None, '2', 'westus')
+        self.assertEqual(images.list.call_count, 5)
+        with mock.patch.dict('os.environ', {'AZURE_VM_IMAGE_CATALOG_TTL': '0'}):
+            load_images_thru_services(cli_ctx, 'canonical', None, '2', 'eastus')
+            load_images_thru_services(cli_ctx, 'canonical', None, '2', 'eastus')
+        self.assertEqual(images.list.call_count, 7)
+
 
 if __name__ == '__main__':
     unittest.main()
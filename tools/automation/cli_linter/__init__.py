@@ -42,9 +42,13 @@ def main(args):
     # format loaded help
     loaded_help = {data.command: data for data in loaded_help if data.command}
 
-    # load yaml help
+    # load yaml help, the help of the command modules is read from the help index, extensions register theirs when
+    # loaded
+    from azure.cli.core._help_index import HelpIndex
+    help_texts = HelpIndex(az_cli).get_all()
+    help_texts.update(helps)
     help_file_entries = {}
-    for entry_name, help_yaml in helps.items():
+    for entry_name, help_yaml in help_texts.items():
         help_entry = yaml.load(help_yaml)
         help_file_entries[entry_name] = help_entry
 